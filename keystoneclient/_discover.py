@@ -24,6 +24,7 @@ raw data specified in version discovery responses.
 import logging
 import re
 
+from keystoneclient import discovery_cache
 from keystoneclient import exceptions
 from keystoneclient.i18n import _
 
@@ -139,8 +140,8 @@ class Discover(object):
     EXPERIMENTAL_STATUSES = ('experimental',)
 
     def __init__(self, session, url, authenticated=None):
-        self._data = get_version_data(session, url,
-                                      authenticated=authenticated)
+        self._data = discovery_cache.get_version_data(
+            session, url, get_version_data, authenticated=authenticated)
 
     def raw_version_data(self, allow_experimental=False,
                          allow_deprecated=True, allow_unknown=False):
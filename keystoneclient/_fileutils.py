@@ -0,0 +1,106 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Helpers for the caches that keep their entries in per-user files."""
+
+import contextlib
+import hashlib
+import logging
+import os
+import tempfile
+
+from oslo_utils import importutils
+
+
+fcntl = importutils.try_import('fcntl')
+
+_logger = logging.getLogger(__name__)
+
+# NOTE: os.replace overwrites an existing file on every platform but is only
+# available on python 3. os.rename does the same on POSIX.
+_replace = getattr(os, 'replace', os.rename)
+
+
+def default_directory(*parts):
+    """Return a directory in the user's cache directory.
+
+    This is ``$XDG_CACHE_HOME/keystoneclient/<parts>``, or
+    ``~/.cache/keystoneclient/<parts>`` if the variable is not set.
+    """
+    base = (os.environ.get('XDG_CACHE_HOME') or
+            os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'keystoneclient', *parts)
+
+
+def key_path(directory, key, suffix):
+    """Return the path of the file for key, which may be any string."""
+    name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+    return os.path.join(directory, name + suffix)
+
+
+def ensure_directory(directory):
+    """Create directory, readable only by the user, if it doesn't exist."""
+    if not os.path.isdir(directory):
+        os.makedirs(directory, 0o700)
+
+
+def write_atomic(path, text):
+    """Replace the contents of path so that readers never see a partial write.
+
+    The file is only readable by the user.
+
+    :raises OSError: if the file can't be written.
+    """
+    directory = os.path.dirname(path)
+    ensure_directory(directory)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+        _replace(tmp_path, path)
+    except Exception:
+        try:
+            os.unlink(tmp_path)
+        except OSError:  # nosec: the temporary file may be gone
+            pass
+        raise
+
+
+@contextlib.contextmanager
+def locked(path, shared=False):
+    """Hold an flock on path for the duration of the block.
+
+    Where the platform or file system doesn't support flock, or the lock file
+    can't be opened, the block runs without a lock.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    try:
+        ensure_directory(os.path.dirname(path))
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    except (IOError, OSError) as e:
+        _logger.debug('Failed to open lock file %s: %s', path, e)
+        yield
+        return
+
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        except (IOError, OSError) as e:
+            # e.g. ENOLCK or EOPNOTSUPP on some network file systems
+            _logger.debug('Failed to lock %s: %s', path, e)
+        yield
+    finally:
+        os.close(fd)
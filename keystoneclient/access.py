@@ -15,7 +15,7 @@
 # limitations under the License.
 
 
-import datetime
+import calendar
 import warnings
 
 from oslo_utils import timeutils
@@ -86,8 +86,43 @@ class AccessInfo(dict):
 
     def __init__(self, *args, **kwargs):
         super(AccessInfo, self).__init__(*args, **kwargs)
-        self.service_catalog = service_catalog.ServiceCatalog.factory(
-            resource_dict=self, region_name=self._region_name)
+        self._init_service_catalog(None)
+
+    def _init_service_catalog(self, token):
+        self._catalog_token = token
+
+        # NOTE: the catalog is only built when it is first used, many users
+        # only need the token and identity values. Setting a region name on
+        # the catalog is deprecated though and the deprecation warning should
+        # still be emitted when the AccessInfo is created.
+        if self._region_name:
+            self._service_catalog = self._create_service_catalog()
+
+    def _create_service_catalog(self):
+        return service_catalog.ServiceCatalog.factory(
+            resource_dict=self,
+            token=getattr(self, '_catalog_token', None),
+            region_name=self._region_name)
+
+    @property
+    def service_catalog(self):
+        """The service catalog of the token.
+
+        This is created from the token data the first time it is accessed.
+
+        :returns: :py:class:`keystoneclient.service_catalog.ServiceCatalog`
+        """
+        try:
+            return self._service_catalog
+        except AttributeError:
+            pass
+
+        self._service_catalog = self._create_service_catalog()
+        return self._service_catalog
+
+    @service_catalog.setter
+    def service_catalog(self, value):
+        self._service_catalog = value
 
     @property
     def _region_name(self):
@@ -102,12 +137,47 @@ class AccessInfo(dict):
         """
         stale_duration = (STALE_TOKEN_DURATION if stale_duration is None
                           else stale_duration)
-        norm_expires = timeutils.normalize_time(self.expires)
-        # (gyee) should we move auth_token.will_expire_soon() to timeutils
-        # instead of duplicating code here?
-        soon = (timeutils.utcnow() + datetime.timedelta(
-                seconds=stale_duration))
-        return norm_expires < soon
+        # NOTE: compare UNIX timestamps rather than datetimes. The expiry is
+        # only parsed once and this is called on every get_access.
+        soon = timeutils.utcnow_ts(microsecond=True) + stale_duration
+        return self.expires_timestamp < soon
+
+    def _parse_time(self, value):
+        """Parse an ISO 8601 time from the token.
+
+        Results are remembered per string value so that the token data is
+        only parsed again if it changes.
+
+        :returns: a tuple of the time as a datetime and a UNIX timestamp.
+        """
+        try:
+            cache = self._parsed_times
+        except AttributeError:
+            cache = self._parsed_times = {}
+
+        try:
+            return cache[value]
+        except KeyError:
+            pass
+
+        dt = timeutils.parse_isotime(value)
+        norm = timeutils.normalize_time(dt)
+        ts = calendar.timegm(norm.timetuple()) + norm.microsecond / 1000000.0
+
+        if len(cache) > 4:
+            # the token data was modified, forget about the old values.
+            cache.clear()
+
+        cache[value] = (dt, ts)
+        return dt, ts
+
+    @property
+    def _expires_str(self):
+        raise NotImplementedError()
+
+    @property
+    def _issued_str(self):
+        raise NotImplementedError()
 
     @classmethod
     def is_valid(cls, body, **kwargs):
@@ -154,7 +224,15 @@ class AccessInfo(dict):
 
         :returns: datetime
         """
-        raise NotImplementedError()
+        return self._parse_time(self._expires_str)[0]
+
+    @property
+    def expires_timestamp(self):
+        """Return the token expiration as a UNIX timestamp.
+
+        :returns: float
+        """
+        return self._parse_time(self._expires_str)[1]
 
     @property
     def issued(self):
@@ -162,7 +240,7 @@ class AccessInfo(dict):
 
         :returns: datetime
         """
-        raise NotImplementedError()
+        return self._parse_time(self._issued_str)[0]
 
     @property
     def username(self):
@@ -455,10 +533,7 @@ class AccessInfoV2(AccessInfo):
     def __init__(self, *args, **kwargs):
         super(AccessInfo, self).__init__(*args, **kwargs)
         self.update(version='v2.0')
-        self.service_catalog = service_catalog.ServiceCatalog.factory(
-            resource_dict=self,
-            token=self['token']['id'],
-            region_name=self._region_name)
+        self._init_service_catalog(self['token']['id'])
 
     @classmethod
     def is_valid(cls, body, **kwargs):
@@ -480,12 +555,12 @@ class AccessInfoV2(AccessInfo):
             return self['token']['id']
 
     @property
-    def expires(self):
-        return timeutils.parse_isotime(self['token']['expires'])
+    def _expires_str(self):
+        return self['token']['expires']
 
     @property
-    def issued(self):
-        return timeutils.parse_isotime(self['token']['issued_at'])
+    def _issued_str(self):
+        return self['token']['issued_at']
 
     @property
     def username(self):
@@ -688,10 +763,7 @@ class AccessInfoV3(AccessInfo):
     def __init__(self, token, *args, **kwargs):
         super(AccessInfo, self).__init__(*args, **kwargs)
         self.update(version='v3')
-        self.service_catalog = service_catalog.ServiceCatalog.factory(
-            resource_dict=self,
-            token=token,
-            region_name=self._region_name)
+        self._init_service_catalog(token)
         if token:
             self.auth_token = token
 
@@ -712,12 +784,12 @@ class AccessInfoV3(AccessInfo):
         return 'OS-FEDERATION' in self['user']
 
     @property
-    def expires(self):
-        return timeutils.parse_isotime(self['expires_at'])
+    def _expires_str(self):
+        return self['expires_at']
 
     @property
-    def issued(self):
-        return timeutils.parse_isotime(self['issued_at'])
+    def _issued_str(self):
+        return self['issued_at']
 
     @property
     def user_id(self):
@@ -43,12 +43,15 @@ class Adapter(object):
     :param logger: A logging object to use for requests that pass through this
                    adapter.
     :type logger: logging.Logger
+    :param retry_policy: The policy for retrying error responses. Default
+                         None - use the session's policy.
+    :type retry_policy: keystoneclient.session.RetryPolicy
     """
 
     def __init__(self, session, service_type=None, service_name=None,
                  interface=None, region_name=None, endpoint_override=None,
                  version=None, auth=None, user_agent=None,
-                 connect_retries=None, logger=None):
+                 connect_retries=None, logger=None, retry_policy=None):
         warnings.warn(
             'keystoneclient.adapter.Adapter is deprecated as of the 2.1.0 '
             'release in favor of keystoneauth1.adapter.Adapter. It will be '
@@ -67,6 +70,7 @@ class Adapter(object):
         self.auth = auth
         self.connect_retries = connect_retries
         self.logger = logger
+        self.retry_policy = retry_policy
 
     def _set_endpoint_filter_kwargs(self, kwargs):
         if self.service_type:
@@ -95,6 +99,8 @@ class Adapter(object):
             kwargs.setdefault('connect_retries', self.connect_retries)
         if self.logger:
             kwargs.setdefault('logger', self.logger)
+        if self.retry_policy is not None:
+            kwargs.setdefault('retry_policy', self.retry_policy)
 
         return self.session.request(url, method, **kwargs)
 
@@ -0,0 +1,608 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Issue requests from asyncio code.
+
+An :py:class:`AsyncSession` wraps a :py:class:`keystoneclient.session.Session`
+and sends requests with the same semantics as
+:py:meth:`keystoneclient.session.Session.request` using the aiohttp library::
+
+    from keystoneclient import async_session
+
+    sess = async_session.AsyncSession(session)
+    adap = async_session.AsyncLegacyJsonAdapter(sess, service_type='identity',
+                                                interface='admin')
+    projects = async_session.AsyncManager(client.projects, adap)
+
+    async def handler():
+        return await projects.list(domain='default')
+
+Auth plugins perform blocking I/O so they are called in the event loop's
+default executor, the requests themselves don't block the event loop.
+
+This module requires Python 3.7 or later and the optional aiohttp package.
+"""
+
+import asyncio
+import functools
+import logging
+import ssl
+
+from keystoneauth1 import exceptions as ksa_exceptions
+from keystoneauth1 import plugin
+from oslo_serialization import jsonutils
+from oslo_utils import importutils
+import requests
+from six.moves import urllib
+
+from keystoneclient import base
+from keystoneclient import exceptions
+from keystoneclient.i18n import _
+from keystoneclient import session as client_session
+
+aiohttp = importutils.try_import('aiohttp')
+
+_logger = logging.getLogger(__name__)
+
+
+class AsyncResponse(object):
+    """A completed response with the interface of a requests response.
+
+    The body has been read when the response is returned so it can be used
+    synchronously, e.g. by :py:func:`keystoneclient.exceptions.from_response`.
+    """
+
+    def __init__(self, status_code, headers, url, content, reason=None,
+                 encoding=None, history=None):
+        self.status_code = status_code
+        self.headers = requests.structures.CaseInsensitiveDict(headers)
+        self.url = url
+        self.content = content
+        self.reason = reason
+        self.encoding = encoding or 'utf-8'
+        self.history = history or []
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, 'replace')
+
+    def json(self, **kwargs):
+        return jsonutils.loads(self.text, **kwargs)
+
+
+class AsyncSession(object):
+    """Send requests from asyncio code.
+
+    :param session: The session that provides authentication and the
+                    connection settings (verify, cert, timeout, user agent,
+                    original IP and redirect limit) for requests.
+    :type session: :py:class:`keystoneclient.session.Session`
+
+    Only connection failures are retried, as requested with
+    ``connect_retries``. The ``retry_policy``, ``circuit_breaker``,
+    ``failover_policy``, ``endpoint_selector``, ``timing_sinks`` and
+    ``metrics`` of the session are not used: requests aren't retried on
+    status codes, failed endpoints aren't skipped or ordered and no timings
+    or metrics are recorded.
+
+    :param http_session: An aiohttp client session to issue requests with.
+                         If not provided one is created when it is first
+                         needed and closed by :py:meth:`close`. (optional)
+    :type http_session: aiohttp.ClientSession
+    """
+
+    def __init__(self, session, http_session=None):
+        if aiohttp is None:
+            raise ImportError(_('AsyncSession requires the aiohttp package'))
+
+        self.session = session
+        self._http_session = http_session
+        self._owns_http_session = http_session is None
+        self._ssl = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the aiohttp session if it was created by this object."""
+        if self._http_session is not None and self._owns_http_session:
+            await self._http_session.close()
+            self._http_session = None
+
+    def _get_http_session(self):
+        if self._http_session is None:
+            self._http_session = aiohttp.ClientSession()
+        return self._http_session
+
+    def _get_ssl(self):
+        verify = self.session.verify
+        cert = self.session.cert
+
+        if verify is False:
+            return False
+        if verify is True and not cert:
+            return None
+
+        if self._ssl is None:
+            cafile = verify if isinstance(verify, str) else None
+            context = ssl.create_default_context(cafile=cafile)
+            if cert:
+                if isinstance(cert, (tuple, list)):
+                    context.load_cert_chain(*cert)
+                else:
+                    context.load_cert_chain(cert)
+            self._ssl = context
+
+        return self._ssl
+
+    async def _run(self, func, *args, **kwargs):
+        # auth plugins perform blocking I/O, keep them off the event loop.
+        loop = asyncio.get_running_loop()
+        return (await loop.run_in_executor(
+            None, functools.partial(func, *args, **kwargs)))
+
+    async def request(self, url, method, json=None, original_ip=None,
+                      user_agent=None, redirect=None, authenticated=None,
+                      endpoint_filter=None, auth=None, raise_exc=True,
+                      allow_reauth=True, log=True, endpoint_override=None,
+                      connect_retries=0, logger=_logger, **kwargs):
+        """Send an HTTP request with the specified characteristics.
+
+        Takes the same arguments as
+        :py:meth:`keystoneclient.session.Session.request` except for
+        ``requests_auth``. Other arguments (such as ``headers``, ``data`` or
+        ``params``) are passed to :py:meth:`aiohttp.ClientSession.request`.
+
+        :raises keystoneclient.exceptions.ClientException: For connection
+            failure, or to indicate an error response code.
+
+        :returns: The response to the request.
+        :rtype: :py:class:`AsyncResponse`
+        """
+        session = self.session
+        headers = kwargs.setdefault('headers', dict())
+
+        if authenticated is None:
+            authenticated = bool(auth or session.auth)
+
+        if authenticated:
+            auth_headers = await self._run(session.get_auth_headers, auth)
+
+            if auth_headers is None:
+                msg = _('No valid authentication is available')
+                raise exceptions.AuthorizationFailure(msg)
+
+            headers.update(auth_headers)
+
+        if client_session.osprofiler_web:
+            headers.update(client_session.osprofiler_web.
+                           get_trace_id_headers())
+
+        if not urllib.parse.urlparse(url).netloc:
+            base_url = None
+
+            if endpoint_override:
+                base_url = endpoint_override
+            elif endpoint_filter:
+                base_url = await self._run(session.get_endpoint, auth,
+                                           **endpoint_filter)
+
+            if not base_url:
+                service_type = (endpoint_filter or {}).get('service_type',
+                                                           'unknown')
+                msg = _('Endpoint for %s service') % service_type
+                raise exceptions.EndpointNotFound(msg)
+
+            url = '%s/%s' % (base_url.rstrip('/'), url.lstrip('/'))
+
+        if session.timeout is not None:
+            kwargs.setdefault('timeout',
+                              aiohttp.ClientTimeout(total=session.timeout))
+
+        if user_agent:
+            headers['User-Agent'] = user_agent
+        elif session.user_agent:
+            user_agent = headers.setdefault('User-Agent', session.user_agent)
+        else:
+            user_agent = headers.setdefault('User-Agent',
+                                            client_session.USER_AGENT)
+
+        if session.original_ip:
+            headers.setdefault('Forwarded',
+                               'for=%s;by=%s' % (session.original_ip,
+                                                 user_agent))
+
+        if json is not None:
+            headers['Content-Type'] = 'application/json'
+            kwargs['data'] = jsonutils.dumps(json)
+
+        kwargs.setdefault('ssl', self._get_ssl())
+
+        if log:
+            session._http_log_request(url, method=method,
+                                      data=kwargs.get('data'),
+                                      headers=headers,
+                                      logger=logger)
+
+        # Redirects are handled in _send_request as for Session.
+        kwargs['allow_redirects'] = False
+
+        if redirect is None:
+            redirect = session.redirect
+
+        send = functools.partial(self._send_request,
+                                 url, method, redirect, log, logger,
+                                 connect_retries)
+
+        resp = await send(**kwargs)
+
+        # handle getting a 401 Unauthorized response by invalidating the plugin
+        # and then retrying the request. This is only tried once.
+        if resp.status_code == 401 and authenticated and allow_reauth:
+            invalidated = await self._run(session.invalidate, auth)
+            if invalidated:
+                auth_headers = await self._run(session.get_auth_headers,
+                                               auth)
+
+                if auth_headers is not None:
+                    headers.update(auth_headers)
+                    resp = await send(**kwargs)
+
+        if raise_exc and resp.status_code >= 400:
+            logger.debug('Request returned failure status: %s',
+                         resp.status_code)
+            raise exceptions.from_response(resp, method, url)
+
+        return resp
+
+    async def _send_request(self, url, method, redirect, log, logger,
+                            connect_retries, connect_retry_delay=0.5,
+                            **kwargs):
+        http_session = self._get_http_session()
+
+        try:
+            try:
+                raw = await http_session.request(method, url, **kwargs)
+                try:
+                    content = await raw.read()
+                finally:
+                    raw.release()
+            except aiohttp.ClientSSLError as e:
+                msg = _('SSL exception connecting to %(url)s: '
+                        '%(error)s') % {'url': url, 'error': e}
+                raise exceptions.SSLError(msg)
+            except asyncio.TimeoutError:
+                msg = _('Request to %s timed out') % url
+                raise exceptions.RequestTimeout(msg)
+            except aiohttp.ClientConnectionError:
+                msg = _('Unable to establish connection to %s') % url
+                raise exceptions.ConnectionRefused(msg)
+            except aiohttp.ClientError as e:
+                # e.g. the connection was closed before the whole body was
+                # received. The request may have been processed so it is not
+                # retried.
+                msg = _('Error receiving response from %(url)s: '
+                        '%(error)s') % {'url': url, 'error': e}
+                raise exceptions.ConnectionError(msg)
+        except (exceptions.RequestTimeout, exceptions.ConnectionRefused) as e:
+            if connect_retries <= 0:
+                raise
+
+            logger.info('Failure: %(e)s. Retrying in %(delay).1fs.',
+                        {'e': e, 'delay': connect_retry_delay})
+            await asyncio.sleep(connect_retry_delay)
+
+            return await self._send_request(
+                url, method, redirect, log, logger,
+                connect_retries=connect_retries - 1,
+                connect_retry_delay=connect_retry_delay * 2,
+                **kwargs)
+
+        resp = AsyncResponse(raw.status, raw.headers, str(raw.url), content,
+                             reason=raw.reason, encoding=raw.charset)
+
+        if log:
+            self.session._http_log_response(resp, logger)
+
+        if resp.status_code in client_session.Session._REDIRECT_STATUSES:
+            # be careful here in python True == 1 and False == 0
+            if isinstance(redirect, bool):
+                redirect_allowed = redirect
+            else:
+                redirect -= 1
+                redirect_allowed = redirect >= 0
+
+            if not redirect_allowed:
+                return resp
+
+            try:
+                location = resp.headers['location']
+            except KeyError:
+                logger.warning("Failed to redirect request to %s as new "
+                               "location was not provided.", resp.url)
+            else:
+                location = urllib.parse.urljoin(resp.url, location)
+                new_resp = await self._send_request(
+                    location, method, redirect, log, logger,
+                    connect_retries=connect_retries,
+                    **kwargs)
+
+                new_resp.history.insert(0, resp)
+                resp = new_resp
+
+        return resp
+
+    def get(self, url, **kwargs):
+        return self.request(url, 'GET', **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request(url, 'HEAD', **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request(url, 'POST', **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request(url, 'PUT', **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request(url, 'DELETE', **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request(url, 'PATCH', **kwargs)
+
+
+class AsyncAdapter(object):
+    """An :py:class:`AsyncSession` with client local defaults.
+
+    The asyncio counterpart of :py:class:`keystoneclient.adapter.Adapter`,
+    taking the same arguments.
+    """
+
+    def __init__(self, session, service_type=None, service_name=None,
+                 interface=None, region_name=None, endpoint_override=None,
+                 version=None, auth=None, user_agent=None,
+                 connect_retries=None, logger=None):
+        self.session = session
+        self.service_type = service_type
+        self.service_name = service_name
+        self.interface = interface
+        self.region_name = region_name
+        self.endpoint_override = endpoint_override
+        self.version = version
+        self.user_agent = user_agent
+        self.auth = auth
+        self.connect_retries = connect_retries
+        self.logger = logger
+
+    def _set_endpoint_filter_kwargs(self, kwargs):
+        if self.service_type:
+            kwargs.setdefault('service_type', self.service_type)
+        if self.service_name:
+            kwargs.setdefault('service_name', self.service_name)
+        if self.interface:
+            kwargs.setdefault('interface', self.interface)
+        if self.region_name:
+            kwargs.setdefault('region_name', self.region_name)
+        if self.version:
+            kwargs.setdefault('version', self.version)
+
+    def request(self, url, method, **kwargs):
+        endpoint_filter = kwargs.setdefault('endpoint_filter', {})
+        self._set_endpoint_filter_kwargs(endpoint_filter)
+
+        if self.endpoint_override:
+            kwargs.setdefault('endpoint_override', self.endpoint_override)
+
+        if self.auth:
+            kwargs.setdefault('auth', self.auth)
+        if self.user_agent:
+            kwargs.setdefault('user_agent', self.user_agent)
+        if self.connect_retries is not None:
+            kwargs.setdefault('connect_retries', self.connect_retries)
+        if self.logger:
+            kwargs.setdefault('logger', self.logger)
+
+        return self.session.request(url, method, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request(url, 'GET', **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request(url, 'HEAD', **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request(url, 'POST', **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request(url, 'PUT', **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request(url, 'PATCH', **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request(url, 'DELETE', **kwargs)
+
+
+class AsyncLegacyJsonAdapter(AsyncAdapter):
+    """An :py:class:`AsyncAdapter` that also returns the decoded body.
+
+    The asyncio counterpart of
+    :py:class:`keystoneclient.adapter.LegacyJsonAdapter`, requests resolve to
+    a tuple of the response and the decoded JSON body (or None).
+    """
+
+    async def request(self, *args, **kwargs):
+        headers = kwargs.setdefault('headers', {})
+        headers.setdefault('Accept', 'application/json')
+
+        try:
+            kwargs['json'] = kwargs.pop('body')
+        except KeyError:  # nosec: 'body' is optional
+            pass
+
+        resp = await super(AsyncLegacyJsonAdapter, self).request(
+            *args, **kwargs)
+
+        body = None
+        if resp.content:
+            try:
+                body = resp.json()
+            except ValueError:  # nosec: return None for body as expected
+                pass
+
+        return resp, body
+
+
+class AsyncManager(object):
+    """Awaitable variants of the operations of a manager.
+
+    Resources are created exactly as the wrapped manager creates them, and
+    are bound to it, but the requests are made through an
+    :py:class:`AsyncLegacyJsonAdapter`.
+
+    :param manager: The manager to provide awaitable operations for.
+    :type manager: :py:class:`keystoneclient.base.Manager`
+    :param client: The adapter to send requests with.
+    :type client: :py:class:`AsyncLegacyJsonAdapter`
+    """
+
+    def __init__(self, manager, client):
+        self.manager = manager
+        self.client = client
+
+    async def _list(self, url, response_key, obj_class=None, body=None,
+                    **kwargs):
+        """Awaitable :py:meth:`keystoneclient.base.Manager._list`."""
+        cache_names = not body
+
+        if body:
+            resp, body = await self.client.post(url, body=body, **kwargs)
+        else:
+            resp, body = await self.client.get(url, **kwargs)
+
+        if obj_class is None:
+            obj_class = self.manager.resource_class
+
+        data = self.manager._list_data(body, response_key)
+        objs = [obj_class(self.manager, res, loaded=True)
+                for res in data if res]
+        if cache_names:
+            self.manager._cache_list_names(url, objs, complete=True)
+        return objs
+
+    async def _get(self, url, response_key, **kwargs):
+        """Awaitable :py:meth:`keystoneclient.base.Manager._get`."""
+        resp, body = await self.client.get(url, **kwargs)
+        obj = self.manager.resource_class(self.manager, body[response_key],
+                                          loaded=True)
+        self.manager._cache_names([obj])
+        return obj
+
+    async def _post(self, url, body, response_key, return_raw=False, **kwargs):
+        """Awaitable :py:meth:`keystoneclient.base.Manager._post`."""
+        resp, body = await self.client.post(url, body=body, **kwargs)
+        self.manager._uncache_url(url)
+        if return_raw:
+            return body[response_key]
+        obj = self.manager.resource_class(self.manager, body[response_key])
+        self.manager._cache_names([obj])
+        return obj
+
+    async def _delete(self, url, **kwargs):
+        """Awaitable :py:meth:`keystoneclient.base.Manager._delete`."""
+        resp = await self.client.delete(url, **kwargs)
+        self.manager._uncache_url(url)
+        return resp
+
+    # The operations of keystoneclient.base.CrudManager
+
+    _UNSUPPORTED_LIST_OPTIONS = ('paginate', 'stream', 'compact', 'raw',
+                                 'as_tuples')
+
+    async def list(self, **kwargs):
+        """Awaitable :py:meth:`keystoneclient.base.CrudManager.list`.
+
+        Takes the arguments of the wrapped manager's ``list``, so for example
+        ``projects.list(user=user)`` requests ``/users/{user_id}/projects``
+        just as :py:meth:`keystoneclient.v3.projects.ProjectManager.list`
+        does. The whole collection is returned; ``paginate``, ``stream``,
+        ``compact``, ``raw`` and ``as_tuples`` aren't supported.
+        """
+        options = [o for o in self._UNSUPPORTED_LIST_OPTIONS if o in kwargs]
+        if options:
+            raise TypeError(_('list() does not support %s') %
+                            ', '.join(options))
+        return await self._crud_list(**self.manager._list_kwargs(**kwargs))
+
+    @base.filter_kwargs
+    async def _crud_list(self, fallback_to_auth=False, **kwargs):
+        if 'id' in kwargs:
+            raise TypeError(
+                _("list() got an unexpected keyword argument 'id'. To "
+                  "retrieve a single object using a globally unique "
+                  "identifier, try using get() instead."))
+
+        url = self.manager.build_url(dict_args_in_out=kwargs)
+        url_query = '%s%s' % (url, self.manager._build_query(kwargs))
+        try:
+            return await self._list(url_query, self.manager.collection_key)
+        except ksa_exceptions.EmptyCatalog:
+            if not fallback_to_auth:
+                raise
+            return await self._list(
+                url_query, self.manager.collection_key,
+                endpoint_filter={'interface': plugin.AUTH_INTERFACE})
+
+    def _build_url(self, kwargs):
+        url = self.manager.build_url(dict_args_in_out=kwargs)
+        if kwargs:
+            # NOTE: these would be silently dropped, the request is made to
+            # the URL alone.
+            raise TypeError(_('unexpected keyword arguments: %s') %
+                            ', '.join(sorted(kwargs)))
+        return url
+
+    @base.filter_kwargs
+    async def get(self, **kwargs):
+        """Awaitable :py:meth:`keystoneclient.base.CrudManager.get`.
+
+        Takes the arguments of
+        :py:meth:`keystoneclient.base.CrudManager.get`, i.e. IDs named
+        ``<key>_id``, not those of the wrapped manager's ``get``.
+        """
+        return await self._get(self._build_url(kwargs), self.manager.key)
+
+    @base.filter_kwargs
+    async def create(self, **kwargs):
+        """Awaitable :py:meth:`keystoneclient.base.CrudManager.create`.
+
+        Takes the arguments of
+        :py:meth:`keystoneclient.base.CrudManager.create`, i.e. the
+        attributes of the new resource as the server names them, such as
+        ``domain_id``, not the arguments of the wrapped manager's ``create``.
+        """
+        url = self.manager.build_url(dict_args_in_out=kwargs)
+        return await self._post(url, {self.manager.key: kwargs},
+                                self.manager.key)
+
+    @base.filter_kwargs
+    async def delete(self, **kwargs):
+        """Awaitable :py:meth:`keystoneclient.base.CrudManager.delete`.
+
+        Takes the arguments of
+        :py:meth:`keystoneclient.base.CrudManager.delete`, i.e. IDs named
+        ``<key>_id``.
+        """
+        return await self._delete(self._build_url(kwargs))
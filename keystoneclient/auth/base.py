@@ -185,6 +185,24 @@ class BaseAuthPlugin(object):
         """
         return None
 
+    def get_endpoints(self, session, **kwargs):
+        """Return all the candidate endpoints for the client.
+
+        The keyword arguments are the same as for :py:meth:`get_endpoint`.
+        Plugins that know of several equivalent endpoints, such as those
+        listed in a service catalog, return all of them in order of
+        preference so that a session can fail over between them. By default
+        only the result of :py:meth:`get_endpoint` is returned.
+
+        :param session: The session object that the auth_plugin belongs to.
+        :type session: keystoneclient.session.Session
+
+        :returns: A list of base URLs, empty if none are available.
+        :rtype: list
+        """
+        url = self.get_endpoint(session, **kwargs)
+        return [url] if url else []
+
     def get_connection_params(self, session, **kwargs):
         """Return any additional connection parameters required for the plugin.
 
@@ -11,15 +11,18 @@
 # under the License.
 
 import abc
+import hashlib
 import logging
 import threading
 import warnings
 
 from oslo_config import cfg
+from oslo_utils import timeutils
 import six
 
 from keystoneclient import _discover
 from keystoneclient.auth import base
+from keystoneclient import discovery_cache
 from keystoneclient import exceptions
 
 LOG = logging.getLogger(__name__)
@@ -38,6 +41,11 @@ class BaseIdentityPlugin(base.BaseAuthPlugin):
     # least this many seconds before the token expiry time
     MIN_TOKEN_LIFE_SECONDS = 120
 
+    # when refreshing in the background, wait at least this many seconds
+    # between attempts so that a failing or short lived token can't spin.
+    MIN_BACKGROUND_REFRESH_SECONDS = 1
+    MAX_BACKGROUND_REFRESH_RETRY_SECONDS = 60
+
     def __init__(self,
                  auth_url=None,
                  username=None,
@@ -59,6 +67,14 @@ class BaseIdentityPlugin(base.BaseAuthPlugin):
 
         self._endpoint_cache = {}
         self._lock = threading.Lock()
+        self._access_snapshot = None
+        self._refresh_thread = None
+        self._refresh_stop = None
+
+        # a keystoneclient.token_cache.FileTokenCache or similar to share
+        # tokens with other processes. Only plugins that provide
+        # get_cache_id_elements are cached.
+        self.token_cache = None
 
         self._username = username
         self._password = password
@@ -242,6 +258,16 @@ class BaseIdentityPlugin(base.BaseAuthPlugin):
         :returns: Valid AccessInfo
         :rtype: :py:class:`keystoneclient.access.AccessInfo`
         """
+        # NOTE: the fast path. The snapshot is an immutable (auth_ref,
+        # deadline) tuple that is only ever replaced as a whole, so it can be
+        # read without the lock. It is only trusted while it refers to the
+        # current auth_ref, so invalidating or assigning auth_ref directly
+        # sends us through the locked path below.
+        snapshot = self._access_snapshot
+        if (snapshot is not None and snapshot[0] is self.auth_ref and
+                timeutils.utcnow_ts(microsecond=True) < snapshot[1]):
+            return snapshot[0]
+
         # Hey Kids! Thread safety is important particularly in the case where
         # a service is creating an admin style plugin that will then proceed
         # to make calls from many threads. As a token expires all the threads
@@ -249,9 +275,225 @@ class BaseIdentityPlugin(base.BaseAuthPlugin):
         # only one thread tries to actually fetch from keystone at once.
         with self._lock:
             if self._needs_reauthenticate():
-                self.auth_ref = self.get_auth_ref(session)
+                refresh = self.auth_ref is not None
+                auth_ref = self._get_cached_auth_ref()
+
+                if auth_ref is None:
+                    auth_ref = self.get_auth_ref(session)
+                    self._record_token(session, refresh)
+                    self._set_cached_auth_ref(auth_ref)
+
+                self.auth_ref = auth_ref
+
+            auth_ref = self.auth_ref
+            self._access_snapshot = (auth_ref,
+                                     self._get_access_deadline(auth_ref))
+
+        return auth_ref
+
+    def _record_token(self, session, refresh):
+        metrics = getattr(session, 'metrics', None)
+        if metrics:
+            metrics.record_token(self, refresh=refresh)
+
+    def get_cache_id_elements(self):
+        """Return the values that identify the tokens of this plugin.
+
+        Two plugins that return the same elements must fetch equivalent
+        tokens, so the elements should include the credentials and the scope
+        of the plugin. Plugins that don't return elements never use the
+        :py:attr:`token_cache`.
+
+        :returns: a dict of strings to strings or None if the plugin can't be
+                  cached.
+        :rtype: dict
+        """
+        return None
+
+    def get_cache_id(self):
+        """Return a key to store the tokens of this plugin under.
+
+        The key is a hash of :py:meth:`get_cache_id_elements` so it doesn't
+        reveal any credentials.
+
+        :returns: a string or None if the plugin can't be cached.
+        """
+        elements = self.get_cache_id_elements()
+        if elements is None:
+            return None
+
+        hasher = hashlib.sha256()
+        hasher.update(('%s.%s' % (type(self).__module__,
+                                  type(self).__name__)).encode('utf-8'))
+        for name, value in sorted(elements.items()):
+            hasher.update(('\0%s=%s' % (name, value)).encode('utf-8'))
+
+        return hasher.hexdigest()
+
+    def _get_cached_auth_ref(self):
+        if self.token_cache is None:
+            return None
+
+        key = self.get_cache_id()
+        if key is None:
+            return None
+
+        return self.token_cache.get(key, self.MIN_TOKEN_LIFE_SECONDS)
+
+    def _set_cached_auth_ref(self, auth_ref):
+        if self.token_cache is None:
+            return
+
+        key = self.get_cache_id()
+        if key is not None:
+            self.token_cache.set(key, auth_ref)
+
+    def _get_access_deadline(self, auth_ref):
+        """Return the time until which auth_ref can be used without checks.
+
+        This mirrors :py:meth:`_needs_reauthenticate` so that get_access can
+        avoid taking the lock while the token is nowhere near expiry.
+
+        :returns: a UNIX timestamp, infinity if the token should never be
+                  refreshed or 0 to always take the locked path.
+        :rtype: float
+        """
+        if not auth_ref:
+            return 0
+
+        if not self.reauthenticate:
+            return float('inf')
+
+        return auth_ref.expires_timestamp - self.MIN_TOKEN_LIFE_SECONDS
+
+    def start_background_refresh(self, session, refresh_fraction=0.5):
+        """Renew the token from a background thread before it expires.
+
+        Once started a daemon thread fetches a new token when the given
+        fraction of the current token's lifetime has passed and swaps it in
+        atomically, so that requests don't have to wait for authentication.
+        The token is always refreshed before it gets within
+        :py:attr:`MIN_TOKEN_LIFE_SECONDS` of expiring. If a refresh fails the
+        current token continues to be used and the refresh is retried.
 
-        return self.auth_ref
+        This has no effect if the plugin is not allowed to reauthenticate or
+        a background refresh is already running.
+
+        :param session: A session object used to fetch new tokens.
+        :type session: keystoneclient.session.Session
+        :param float refresh_fraction: The fraction of a token's lifetime
+                                       after which it should be renewed.
+                                       Must be between 0 and 1. (optional,
+                                       defaults to 0.5)
+
+        :returns: True if a refresh thread was started.
+        :rtype: bool
+        """
+        if not 0 < refresh_fraction < 1:
+            raise ValueError('refresh_fraction must be between 0 and 1')
+
+        if not self.reauthenticate:
+            LOG.warning('Not starting a background token refresh for a plugin '
+                        'that is not allowed to reauthenticate.')
+            return False
+
+        with self._lock:
+            if self._refresh_thread and self._refresh_thread.is_alive():
+                return False
+
+            stop = threading.Event()
+            thread = threading.Thread(target=self._background_refresh,
+                                      args=(session, refresh_fraction, stop),
+                                      name='keystoneclient-token-refresh')
+            thread.daemon = True
+
+            self._refresh_stop = stop
+            self._refresh_thread = thread
+
+        thread.start()
+        return True
+
+    def stop_background_refresh(self, timeout=None):
+        """Stop a background refresh started with start_background_refresh.
+
+        :param float timeout: How long to wait for the refresh thread to exit.
+                              (optional, defaults to waiting forever)
+        """
+        with self._lock:
+            stop = self._refresh_stop
+            thread = self._refresh_thread
+            self._refresh_stop = None
+            self._refresh_thread = None
+
+        if stop:
+            stop.set()
+
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _get_background_refresh_delay(self, auth_ref, refresh_fraction):
+        """Return the number of seconds until auth_ref should be renewed."""
+        now = timeutils.utcnow_ts(microsecond=True)
+        remaining = auth_ref.expires_timestamp - now
+
+        try:
+            lifetime = timeutils.delta_seconds(auth_ref.issued,
+                                               auth_ref.expires)
+        except KeyError:
+            # NOTE: without an issue time assume the token was just issued.
+            lifetime = remaining
+
+        delay = min(remaining - (1 - refresh_fraction) * lifetime,
+                    remaining - self.MIN_TOKEN_LIFE_SECONDS)
+
+        return max(delay, self.MIN_BACKGROUND_REFRESH_SECONDS)
+
+    def _background_refresh(self, session, refresh_fraction, stop):
+        delay = 0
+        failures = 0
+        # after a failure the backoff has already been waited out, refresh
+        # straight away rather than waiting until the token is due again.
+        retry_now = False
+
+        while not stop.wait(delay):
+            auth_ref = self.auth_ref
+
+            try:
+                if not auth_ref:
+                    # never authenticated or invalidated, authenticate with
+                    # the lock held as a request would.
+                    auth_ref = self.get_access(session)
+                else:
+                    if not retry_now:
+                        delay = self._get_background_refresh_delay(
+                            auth_ref, refresh_fraction)
+
+                        if stop.wait(delay):
+                            break
+
+                    auth_ref = self.get_auth_ref(session)
+                    self._record_token(session, refresh=True)
+                    self._set_cached_auth_ref(auth_ref)
+
+                    with self._lock:
+                        self.auth_ref = auth_ref
+                        self._access_snapshot = (
+                            auth_ref, self._get_access_deadline(auth_ref))
+
+                delay = 0
+                failures = 0
+                retry_now = False
+            except Exception:
+                # NOTE: back off so an unavailable identity server isn't
+                # hammered. Requests still refresh the token themselves if it
+                # gets too close to expiry in the meantime.
+                delay = min(
+                    self.MIN_BACKGROUND_REFRESH_SECONDS * 2 ** failures,
+                    self.MAX_BACKGROUND_REFRESH_RETRY_SECONDS)
+                failures += 1
+                retry_now = True
+                LOG.warning('Failed to refresh token in the background. '
+                            'Retrying in %d seconds.', delay, exc_info=True)
 
     def invalidate(self):
         """Invalidate the current authentication data.
@@ -269,6 +511,13 @@ class BaseIdentityPlugin(base.BaseAuthPlugin):
         """
         if self.auth_ref:
             self.auth_ref = None
+            self._access_snapshot = None
+
+            if self.token_cache is not None:
+                key = self.get_cache_id()
+                if key is not None:
+                    self.token_cache.delete(key)
+
             return True
 
         return False
@@ -330,6 +579,51 @@ class BaseIdentityPlugin(base.BaseAuthPlugin):
                                           region_name=region_name,
                                           service_name=service_name)
 
+        return self._get_versioned_url(session, service_type, url, version)
+
+    def get_endpoints(self, session, service_type=None, interface=None,
+                      region_name=None, service_name=None, version=None,
+                      **kwargs):
+        """Return all the catalog endpoints for a service.
+
+        The arguments are the same as for :py:meth:`get_endpoint`, the
+        endpoints are returned in the order they are listed in the service
+        catalog, with the same version discovery applied to each of them.
+        If no region is given only the endpoints in the region of the first
+        matching endpoint are returned, so that all the endpoints returned
+        are equivalent.
+
+        :return: A list of endpoint URLs, empty if none are available.
+        :rtype: list
+        """
+        if interface is base.AUTH_INTERFACE or not service_type:
+            return super(BaseIdentityPlugin, self).get_endpoints(
+                session, service_type=service_type, interface=interface,
+                region_name=region_name, service_name=service_name,
+                version=version, **kwargs)
+
+        interface = interface or 'public'
+        service_catalog = self.get_access(session).service_catalog
+
+        if not region_name:
+            endpoints = service_catalog.get_endpoints(
+                service_type=service_type,
+                endpoint_type=interface,
+                service_name=service_name).get(service_type)
+            if endpoints:
+                region_name = service_catalog._get_endpoint_region(
+                    endpoints[0])
+
+        urls = service_catalog.get_urls(service_type=service_type,
+                                        endpoint_type=interface,
+                                        region_name=region_name,
+                                        service_name=service_name)
+
+        urls = [self._get_versioned_url(session, service_type, url, version)
+                for url in urls or ()]
+        return [url for url in urls if url]
+
+    def _get_versioned_url(self, session, service_type, url, version):
         if not version:
             # NOTE(jamielennox): This may not be the best thing to default to
             # but is here for backwards compatibility. It may be worth
@@ -370,7 +664,9 @@ class BaseIdentityPlugin(base.BaseAuthPlugin):
 
         Check the session and the plugin cache to see if we have already
         performed discovery on the URL and if so return it, otherwise create
-        a new discovery object, cache it and return it.
+        a new discovery object, cache it and return it. If the process wide
+        :py:mod:`keystoneclient.discovery_cache` is enabled it is used
+        instead.
 
         This function is expected to be used by subclasses and should not
         be needed by users.
@@ -389,6 +685,12 @@ class BaseIdentityPlugin(base.BaseAuthPlugin):
 
         :returns: A discovery object with the results of looking up that URL.
         """
+        if discovery_cache.get_cache() is not None:
+            # NOTE: the process wide cache is shared by every session and
+            # plugin and expires results, so don't hold on to them here.
+            return _discover.Discover(session, url,
+                                      authenticated=authenticated)
+
         # NOTE(jamielennox): we want to cache endpoints on the session as well
         # so that they maintain sharing between auth plugins. Create a cache on
         # the session if it doesn't exist already.
@@ -400,12 +702,18 @@ class BaseIdentityPlugin(base.BaseAuthPlugin):
         # NOTE(jamielennox): There is a cache located on both the session
         # object and the auth plugin object so that they can be shared and the
         # cache is still usable
+        metrics = getattr(session, 'metrics', None)
+
         for cache in (self._endpoint_cache, session_endpoint_cache):
             disc = cache.get(url)
 
             if disc:
+                if metrics:
+                    metrics.record_discovery(hit=True)
                 break
         else:
+            if metrics:
+                metrics.record_discovery(hit=False)
             disc = _discover.Discover(session, url,
                                       authenticated=authenticated)
             self._endpoint_cache[url] = disc
@@ -19,6 +19,7 @@ import six.moves.urllib.parse as urlparse
 
 from keystoneclient import _discover
 from keystoneclient.auth.identity import base
+from keystoneclient import discovery_cache
 from keystoneclient import exceptions
 from keystoneclient.i18n import _
 
@@ -130,6 +131,12 @@ class BaseGenericPlugin(base.BaseIdentityPlugin):
                 'domain_id': self._domain_id,
                 'domain_name': self._domain_name}
 
+    def _get_cache_id_elements(self):
+        """Return the cache id elements common to generic plugins."""
+        elements = {'auth_url': self.auth_url}
+        elements.update(self._v3_params)
+        return elements
+
     def _do_create_plugin(self, session):
         plugin = None
 
@@ -171,6 +178,10 @@ class BaseGenericPlugin(base.BaseIdentityPlugin):
 
                 if plugin:
                     break
+            else:
+                # NOTE: don't let other plugins reuse version data that was of
+                # no use here, the server may be fixed by the time they try.
+                discovery_cache.invalidate(self.auth_url)
 
         if plugin:
             return plugin
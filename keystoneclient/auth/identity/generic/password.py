@@ -51,6 +51,15 @@ class Password(base.BaseGenericPlugin):
         self._user_domain_id = user_domain_id
         self._user_domain_name = user_domain_name
 
+    def get_cache_id_elements(self):
+        elements = self._get_cache_id_elements()
+        elements.update(username=self._username,
+                        user_id=self._user_id,
+                        password=self._password,
+                        user_domain_id=self._user_domain_id,
+                        user_domain_name=self._user_domain_name)
+        return elements
+
     def create_plugin(self, session, version, url, raw_status=None):
         if _discover.version_match((2,), version):
             if self._user_domain_id or self._user_domain_name:
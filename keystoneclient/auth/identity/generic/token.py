@@ -34,6 +34,11 @@ class Token(base.BaseGenericPlugin):
         super(Token, self).__init__(auth_url, **kwargs)
         self._token = token
 
+    def get_cache_id_elements(self):
+        elements = self._get_cache_id_elements()
+        elements['token'] = self._token
+        return elements
+
     def create_plugin(self, session, version, url, raw_status=None):
         if _discover.version_match((2,), version):
             return v2.Token(url, self._token, **self._v2_params)
@@ -14,6 +14,7 @@ import abc
 import logging
 
 from oslo_config import cfg
+from oslo_serialization import jsonutils
 import six
 
 from keystoneclient import access
@@ -93,6 +94,15 @@ class Auth(base.BaseIdentityPlugin):
 
         return access.AccessInfoV2(**resp_data)
 
+    def get_cache_id_elements(self):
+        # the auth data holds the credentials of whichever subclass this is.
+        return {'auth_url': self.auth_url,
+                'tenant_id': self.tenant_id,
+                'tenant_name': self.tenant_name,
+                'trust_id': self.trust_id,
+                'auth_data': jsonutils.dumps(self.get_auth_data(),
+                                             sort_keys=True)}
+
     @abc.abstractmethod
     def get_auth_data(self, headers=None):
         """Return the authentication section of an auth plugin.
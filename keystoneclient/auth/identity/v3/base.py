@@ -197,6 +197,31 @@ class Auth(BaseAuth):
         return access.AccessInfoV3(resp.headers['X-Subject-Token'],
                                    **resp_data)
 
+    def _get_cache_id_elements(self):
+        """Return the scope and the method parameters as cache elements.
+
+        This is only complete for methods that keep all their credentials in
+        ``_method_parameters``, so plugins must opt in to caching by
+        returning it from get_cache_id_elements.
+        """
+        elements = {'auth_url': self.auth_url,
+                    'trust_id': self.trust_id,
+                    'domain_id': self.domain_id,
+                    'domain_name': self.domain_name,
+                    'project_id': self.project_id,
+                    'project_name': self.project_name,
+                    'project_domain_id': self.project_domain_id,
+                    'project_domain_name': self.project_domain_name,
+                    'include_catalog': self.include_catalog,
+                    'unscoped': self.unscoped}
+
+        for i, method in enumerate(self.auth_methods):
+            prefix = '%d_%s_' % (i, type(method).__name__)
+            for param in method._method_parameters:
+                elements[prefix + param] = getattr(method, param)
+
+        return elements
+
 
 @six.add_metaclass(abc.ABCMeta)
 class AuthMethod(object):
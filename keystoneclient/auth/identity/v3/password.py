@@ -73,6 +73,9 @@ class Password(base.AuthConstructor):
 
     _auth_method_class = PasswordMethod
 
+    def get_cache_id_elements(self):
+        return self._get_cache_id_elements()
+
     @classmethod
     def get_options(cls):
         options = super(Password, cls).get_options()
@@ -52,6 +52,9 @@ class Token(base.AuthConstructor):
     def __init__(self, auth_url, token, **kwargs):
         super(Token, self).__init__(auth_url, token=token, **kwargs)
 
+    def get_cache_id_elements(self):
+        return self._get_cache_id_elements()
+
     @classmethod
     def get_options(cls):
         options = super(Token, cls).get_options()
@@ -18,16 +18,21 @@
 """Base utilities to build API operation managers and objects on top of."""
 
 import abc
+import collections
 import copy
 import functools
+import itertools
+import threading
 import warnings
 
 from keystoneauth1 import exceptions as ksa_exceptions
 from keystoneauth1 import plugin
 from oslo_utils import strutils
+from oslo_utils import timeutils
 import six
 from six.moves import urllib
 
+from keystoneclient.common import jsonstream
 from keystoneclient import exceptions as ksc_exceptions
 from keystoneclient.i18n import _
 
@@ -88,10 +93,58 @@ class Manager(object):
 
     resource_class = None
 
+    #: An optional :py:class:`NameCache` that remembers the IDs of the
+    #: resources seen by this manager so that
+    #: :py:func:`keystoneclient.utils.find_resource` can resolve names
+    #: without contacting the server.
+    name_cache = None
+
+    #: Whether the server guarantees resource names are unique within a
+    #: domain. Only the names of such resources are kept in the name_cache.
+    unique_names = False
+
+    # list filters that can't hide a resource with a duplicate name.
+    _NAME_CACHE_FILTERS = frozenset(['limit', 'marker', 'domain_id'])
+
     def __init__(self, client):
         super(Manager, self).__init__()
         self.client = client
 
+    def _cache_names(self, objs):
+        if self.name_cache is not None and self.unique_names:
+            self.name_cache.add_resources(self.resource_class, objs)
+
+    def _cache_list_names(self, url, objs, complete=False):
+        """Remember the names of a listed collection if it is unfiltered.
+
+        :param complete: whether objs is the whole collection rather than a
+            page of it. Names are then also remembered without a domain if
+            they are unique across all domains.
+        """
+        if self.name_cache is None or not self.unique_names:
+            return
+
+        parts = urllib.parse.urlsplit(url)
+        query = urllib.parse.parse_qs(parts.query)
+
+        # NOTE: lists filtered by anything but the domain, or nested under
+        # another resource, may hide a resource with the same name.
+        if (set(query) - self._NAME_CACHE_FILTERS or
+                '/' in parts.path.strip('/')):
+            return
+
+        complete = complete and not set(query) & self._NAME_CACHE_FILTERS
+        self.name_cache.add_resources(self.resource_class, objs,
+                                      complete=complete)
+
+    def _uncache_url(self, url):
+        if self.name_cache is not None:
+            # NOTE: the resource being changed is identified by the last part
+            # of the path. Invalidating an unrelated ID only costs a miss.
+            path = urllib.parse.urlsplit(url).path
+            self.name_cache.invalidate(self.resource_class,
+                                       path.rstrip('/').rsplit('/', 1)[-1])
+
     @property
     def api(self):
         """The client.
@@ -119,6 +172,10 @@ class Manager(object):
             request (GET will be sent by default)
         :param kwargs: Additional arguments will be passed to the request.
         """
+        # NOTE: lists that send a body are searches, their results can't be
+        # used to tell whether a name is unique.
+        cache_names = not body
+
         if body:
             resp, body = self.client.post(url, body=body, **kwargs)
         else:
@@ -127,6 +184,14 @@ class Manager(object):
         if obj_class is None:
             obj_class = self.resource_class
 
+        data = self._list_data(body, response_key)
+        objs = [obj_class(self, res, loaded=True) for res in data if res]
+        if cache_names:
+            self._cache_list_names(url, objs, complete=True)
+        return objs
+
+    @staticmethod
+    def _list_data(body, response_key):
         data = body[response_key]
         # NOTE(ja): keystone returns values as list as {'values': [ ... ]}
         #           unlike other services which just return the list...
@@ -137,7 +202,151 @@ class Manager(object):
             # are already returned in a list (so simply utilize that list)
             pass
 
-        return [obj_class(self, res, loaded=True) for res in data if res]
+        return data
+
+    def _list_page(self, url, response_key, obj_class=None, limit=None,
+                   cache_names=True, **kwargs):
+        """Retrieve a single page of a collection.
+
+        :param url: a partial or absolute URL, e.g., '/servers'
+        :param response_key: the key to be looked up in response dictionary,
+            e.g., 'servers'
+        :param obj_class: class for constructing the returned objects
+            (self.resource_class will be used by default)
+        :param limit: the page size that was requested from the server. If the
+            response doesn't contain a next link but the page holds exactly
+            that many items then the next page is requested with a marker of
+            the last returned ID.
+        :param cache_names: whether the names on the page may be kept in the
+            name cache. Pass False when following a next link of a filtered
+            list as the link doesn't show the original filters.
+        :param kwargs: Additional arguments will be passed to the request.
+
+        :returns: a tuple of the objects on the page and the URL of the next
+            page, or None if this was the last page.
+        """
+        resp, body = self.client.get(url, **kwargs)
+
+        if obj_class is None:
+            obj_class = self.resource_class
+
+        data = self._list_data(body, response_key)
+
+        try:
+            next_url = body['links']['next']
+        except (KeyError, TypeError):
+            next_url = None
+
+        # NOTE: a server that doesn't honour the limit returns more items, or
+        # the whole collection, so only page by marker when it did.
+        if not next_url and limit and data and len(data) == int(limit):
+            next_url = self._marker_url(url, data[-1].get('id'))
+
+        marker = self._get_marker(url)
+        if marker is not None:
+            ids = [res.get('id') for res in data if res]
+            if marker in ids:
+                # the server ignored the marker, or included the marked item,
+                # so skip the items that were already returned.
+                data = [res for res in data if res][ids.index(marker) + 1:]
+                if not data:
+                    return [], None
+
+        objs = [obj_class(self, res, loaded=True) for res in data if res]
+        if cache_names:
+            self._cache_list_names(url, objs)
+        return objs, next_url
+
+    @staticmethod
+    def _get_marker(url):
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        try:
+            return query['marker'][-1]
+        except KeyError:
+            return None
+
+    @staticmethod
+    def _marker_url(url, marker):
+        if marker is None:
+            return None
+
+        parts = urllib.parse.urlsplit(url)
+        query = urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+
+        if ('marker', marker) in query:
+            # the server ignored the marker and returned the same page again
+            return None
+
+        query = [(k, v) for k, v in query if k != 'marker']
+        query.append(('marker', marker))
+
+        return urllib.parse.urlunsplit(
+            parts._replace(query=urllib.parse.urlencode(query)))
+
+    def _stream_list(self, url, response_key, obj_class=None,
+                     chunk_size=65536, **kwargs):
+        """Iterate over a collection as its response is received.
+
+        The members of the collection are decoded and turned into objects one
+        at a time while the response body is read, so the whole body is never
+        held in memory. If the client can't stream responses the collection is
+        retrieved with :py:meth:`_list`.
+
+        :param url: a partial URL, e.g., '/servers'
+        :param response_key: the key to be looked up in response dictionary,
+            e.g., 'servers'
+        :param obj_class: class for constructing the returned objects
+            (self.resource_class will be used by default)
+        :param chunk_size: the number of bytes to read from the response at a
+            time.
+        :param kwargs: Additional arguments will be passed to the request.
+        """
+        if obj_class is None:
+            obj_class = self.resource_class
+
+        stream = getattr(self.client, 'stream', None)
+        if stream is None:
+            for obj in self._list(url, response_key, obj_class=obj_class,
+                                  **kwargs):
+                yield obj
+            return
+
+        resp = stream(url, 'GET', **kwargs)
+        try:
+            for res in jsonstream.iter_items(
+                    resp.iter_content(chunk_size=chunk_size), response_key):
+                if res:
+                    yield obj_class(self, res, loaded=True)
+        finally:
+            resp.close()
+
+    def _iter_list(self, url, response_key, obj_class=None, limit=None,
+                   **kwargs):
+        """Iterate over a collection, one page at a time.
+
+        Pages are requested as they are needed by following the next links
+        returned by the server so that only a single page of the collection
+        needs to be held in memory. Takes the same arguments as
+        :py:meth:`_list_page`.
+        """
+        cache_names = True
+
+        while url:
+            objs, next_url = self._list_page(url, response_key,
+                                             obj_class=obj_class, limit=limit,
+                                             cache_names=cache_names,
+                                             **kwargs)
+            # NOTE: decide from the first URL, following pages are requested
+            # by links that may not show the filters.
+            if cache_names and self._get_marker(url) is None:
+                parts = urllib.parse.urlsplit(url)
+                cache_names = not (
+                    set(urllib.parse.parse_qs(parts.query)) -
+                    self._NAME_CACHE_FILTERS)
+            url = next_url
+
+            for obj in objs:
+                yield obj
 
     def _get(self, url, response_key, **kwargs):
         """Get an object from collection.
@@ -148,7 +357,9 @@ class Manager(object):
         :param kwargs: Additional arguments will be passed to the request.
         """
         resp, body = self.client.get(url, **kwargs)
-        return self.resource_class(self, body[response_key], loaded=True)
+        obj = self.resource_class(self, body[response_key], loaded=True)
+        self._cache_names([obj])
+        return obj
 
     def _head(self, url, **kwargs):
         """Retrieve request headers for an object.
@@ -172,9 +383,12 @@ class Manager(object):
         :param kwargs: Additional arguments will be passed to the request.
         """
         resp, body = self.client.post(url, body=body, **kwargs)
+        self._uncache_url(url)
         if return_raw:
             return body[response_key]
-        return self.resource_class(self, body[response_key])
+        obj = self.resource_class(self, body[response_key])
+        self._cache_names([obj])
+        return obj
 
     def _put(self, url, body=None, response_key=None, **kwargs):
         """Update an object with PUT method.
@@ -187,12 +401,15 @@ class Manager(object):
         :param kwargs: Additional arguments will be passed to the request.
         """
         resp, body = self.client.put(url, body=body, **kwargs)
+        self._uncache_url(url)
         # PUT requests may not return a body
         if body is not None:
             if response_key is not None:
-                return self.resource_class(self, body[response_key])
+                obj = self.resource_class(self, body[response_key])
             else:
-                return self.resource_class(self, body)
+                obj = self.resource_class(self, body)
+            self._cache_names([obj])
+            return obj
 
     def _patch(self, url, body=None, response_key=None, **kwargs):
         """Update an object with PATCH method.
@@ -205,10 +422,13 @@ class Manager(object):
         :param kwargs: Additional arguments will be passed to the request.
         """
         resp, body = self.client.patch(url, body=body, **kwargs)
+        self._uncache_url(url)
         if response_key is not None:
-            return self.resource_class(self, body[response_key])
+            obj = self.resource_class(self, body[response_key])
         else:
-            return self.resource_class(self, body)
+            obj = self.resource_class(self, body)
+        self._cache_names([obj])
+        return obj
 
     def _delete(self, url, **kwargs):
         """Delete an object.
@@ -216,7 +436,9 @@ class Manager(object):
         :param url: a partial URL, e.g., '/servers/my-server'
         :param kwargs: Additional arguments will be passed to the request.
         """
-        return self.client.delete(url, **kwargs)
+        resp = self.client.delete(url, **kwargs)
+        self._uncache_url(url)
+        return resp
 
     def _update(self, url, body=None, response_key=None, method="PUT",
                 **kwargs):
@@ -229,26 +451,83 @@ class Manager(object):
         except KeyError:
             raise ksc_exceptions.ClientException(_("Invalid update method: %s")
                                                  % method)
+        self._uncache_url(url)
         # PUT requests may not return a body
         if body:
-            return self.resource_class(self, body[response_key])
+            obj = self.resource_class(self, body[response_key])
+            self._cache_names([obj])
+            return obj
 
 
 @six.add_metaclass(abc.ABCMeta)
 class ManagerWithFind(Manager):
     """Manager with additional `find()`/`findall()` methods."""
 
+    #: A mapping of resource attributes to the keyword arguments of
+    #: :py:meth:`list` that filter on them on the server. Searches on these
+    #: attributes are passed to the server so that fewer resources need to be
+    #: retrieved and filtered locally.
+    list_filters = {}
+
     @abc.abstractmethod
     def list(self):
         pass  # pragma: no cover
 
+    def _list_candidates(self, **filters):
+        """Return the resources that may match the server side filters.
+
+        :param filters: keyword arguments for :py:meth:`list` built from
+            :py:attr:`list_filters`.
+        """
+        return self.list(**filters)
+
+    def _query_candidates(self, url, response_key, collection_key,
+                          **kwargs):
+        """Retrieve the results of a query for a single resource.
+
+        Some queries return a single resource under ``response_key`` if it
+        exists while servers that don't support the query return the whole
+        collection under ``collection_key``. Handle both.
+
+        :returns: a list of resources, empty if the query returned 404.
+        """
+        try:
+            resp, body = self.client.get(url, **kwargs)
+        except ksa_exceptions.NotFound:
+            return []
+
+        if response_key in body:
+            return [self.resource_class(self, body[response_key],
+                                        loaded=True)]
+
+        data = self._list_data(body, collection_key)
+        return [self.resource_class(self, res, loaded=True)
+                for res in data if res]
+
+    def _find_matches(self, **kwargs):
+        filters = dict((self.list_filters[attr], value)
+                       for attr, value in kwargs.items()
+                       if attr in self.list_filters)
+        searches = kwargs.items()
+
+        # NOTE: the server side filters are checked again locally as a server
+        # may not support them.
+        for obj in self._list_candidates(**filters):
+            try:
+                if all(getattr(obj, attr) == value
+                       for (attr, value) in searches):
+                    yield obj
+            except AttributeError:
+                continue
+
     def find(self, **kwargs):
         """Find a single item with attributes matching ``**kwargs``.
 
-        This isn't very efficient: it loads the entire list then filters on
-        the Python side.
+        Attributes in :py:attr:`list_filters` are filtered on by the server,
+        the remainder are filtered on the Python side. Searching stops as
+        soon as a second match is found.
         """
-        rl = self.findall(**kwargs)
+        rl = list(itertools.islice(self._find_matches(**kwargs), 2))
         num = len(rl)
 
         if num == 0:
@@ -263,21 +542,10 @@ class ManagerWithFind(Manager):
     def findall(self, **kwargs):
         """Find all items with attributes matching ``**kwargs``.
 
-        This isn't very efficient: it loads the entire list then filters on
-        the Python side.
+        Attributes in :py:attr:`list_filters` are filtered on by the server,
+        the remainder are filtered on the Python side.
         """
-        found = []
-        searches = kwargs.items()
-
-        for obj in self.list():
-            try:
-                if all(getattr(obj, attr) == value
-                       for (attr, value) in searches):
-                    found.append(obj)
-            except AttributeError:
-                continue
-
-        return found
+        return list(self._find_matches(**kwargs))
 
 
 class CrudManager(Manager):
@@ -298,6 +566,16 @@ class CrudManager(Manager):
     key = None
     base_url = None
 
+    def _list_kwargs(self, **kwargs):
+        """Return the arguments of CrudManager.list for those of list.
+
+        Managers whose ``list`` takes arguments that are renamed or that
+        change the URL convert them here, so that
+        :py:class:`keystoneclient.async_session.AsyncManager` makes the same
+        request.
+        """
+        return kwargs
+
     def build_url(self, dict_args_in_out=None):
         """Build a resource URL for the given kwargs.
 
@@ -367,8 +645,82 @@ class CrudManager(Manager):
         """
         return '?%s' % '&'.join(params_list) if params_list else ''
 
+    def _iter_collection(self, url, fallback_to_auth=False, limit=None,
+                         obj_class=None):
+        kwargs = {'obj_class': obj_class, 'limit': limit}
+
+        try:
+            objs, next_url = self._list_page(url, self.collection_key,
+                                             **kwargs)
+        except ksa_exceptions.EmptyCatalog:
+            if not fallback_to_auth:
+                raise
+
+            kwargs['endpoint_filter'] = {'interface': plugin.AUTH_INTERFACE}
+            objs, next_url = self._list_page(url, self.collection_key,
+                                             **kwargs)
+
+        for obj in objs:
+            yield obj
+
+        for obj in self._iter_list(next_url, self.collection_key, **kwargs):
+            yield obj
+
+    def _stream_collection(self, url, fallback_to_auth=False,
+                           obj_class=None):
+        try:
+            for obj in self._stream_list(url, self.collection_key,
+                                         obj_class=obj_class):
+                yield obj
+        except ksa_exceptions.EmptyCatalog:
+            # NOTE: the catalog is consulted before the response is read so
+            # nothing has been yielded yet.
+            if not fallback_to_auth:
+                raise
+
+            for obj in self._stream_list(
+                    url, self.collection_key, obj_class=obj_class,
+                    endpoint_filter={'interface': plugin.AUTH_INTERFACE}):
+                yield obj
+
+    def iter_list(self, **kwargs):
+        """Iterate over the collection, fetching it from the server in pages.
+
+        Accepts the same arguments as :py:meth:`list`. Rather than loading the
+        whole collection up front, the returned generator follows the next
+        links provided by the server and requests each page when it is
+        reached. If a ``limit`` is given and the server doesn't provide next
+        links, the following page is requested with a ``marker`` of the last
+        resource ID.
+        """
+        return self.list(paginate=True, **kwargs)
+
     @filter_kwargs
-    def list(self, fallback_to_auth=False, **kwargs):
+    def list(self, fallback_to_auth=False, paginate=False, stream=False,
+             compact=False, raw=False, as_tuples=None, **kwargs):
+        """List the collection.
+
+        :param bool fallback_to_auth: retry the request against the auth
+            interface if the service catalog is empty. (optional)
+        :param bool paginate: return a generator that retrieves the
+            collection a page at a time, see :py:meth:`iter_list`. (optional)
+        :param bool stream: return a generator that decodes the collection
+            from a single response as it is received rather than loading the
+            entire response first. Can't be combined with ``paginate``.
+            (optional)
+        :param bool compact: return :py:class:`CompactResource` objects that
+            keep their attributes only in the response data. They use less
+            memory and are faster to create, which helps when listing very
+            large collections, but are read only. (optional)
+        :param bool raw: return the resources as the dicts received from the
+            server without constructing resource objects. (optional)
+        :param as_tuples: a list of field names. Return a named tuple of just
+            these fields for each resource instead of a resource object.
+            Nested fields can be given as dotted paths, e.g. ``user.id``,
+            which become ``user_id`` in the tuple. Missing fields are None.
+            (optional)
+        :param kwargs: filters to pass to the server.
+        """
         if 'id' in kwargs.keys():
             # Ensure that users are not trying to call things like
             # ``domains.list(id='default')`` when they should have used
@@ -382,17 +734,53 @@ class CrudManager(Manager):
 
         url = self.build_url(dict_args_in_out=kwargs)
 
+        if paginate and stream:
+            raise ValueError(_('paginate and stream are mutually exclusive'))
+
+        if len([o for o in (compact, raw, as_tuples) if o]) > 1:
+            raise ValueError(_('compact, raw and as_tuples are mutually '
+                               'exclusive'))
+
+        if isinstance(as_tuples, six.string_types):
+            # a string would be taken as a list of single character fields
+            raise ValueError(_('as_tuples must be a list of field names'))
+
+        obj_class = None
+        if compact:
+            obj_class = compact_resource_class(self.resource_class)
+        elif raw:
+            obj_class = _raw_resource
+        elif as_tuples:
+            obj_class = _tuple_resource_class(as_tuples)
+
+        if stream:
+            query = self._build_query(kwargs)
+            url_query = '%(url)s%(query)s' % {'url': url, 'query': query}
+            return self._stream_collection(url_query,
+                                           fallback_to_auth=fallback_to_auth,
+                                           obj_class=obj_class)
+
+        if paginate:
+            query = self._build_query(kwargs)
+            url_query = '%(url)s%(query)s' % {'url': url, 'query': query}
+            return self._iter_collection(url_query,
+                                         fallback_to_auth=fallback_to_auth,
+                                         limit=kwargs.get('limit'),
+                                         obj_class=obj_class)
+
         try:
             query = self._build_query(kwargs)
             url_query = '%(url)s%(query)s' % {'url': url, 'query': query}
             return self._list(
                 url_query,
-                self.collection_key)
+                self.collection_key,
+                obj_class=obj_class)
         except ksa_exceptions.EmptyCatalog:
             if fallback_to_auth:
                 return self._list(
                     url_query,
                     self.collection_key,
+                    obj_class=obj_class,
                     endpoint_filter={'interface': plugin.AUTH_INTERFACE})
             else:
                 raise
@@ -442,6 +830,141 @@ class CrudManager(Manager):
             return elements[0]
 
 
+class NameCache(object):
+    """A bounded cache of resource names to IDs with a TTL.
+
+    A cache can be set as the ``name_cache`` of one or more managers. The
+    names and IDs of the resources those managers list, get and create are
+    remembered, and forgotten again when the resources are updated or deleted
+    through the manager, so that :py:func:`keystoneclient.utils.find_resource`
+    can resolve names without contacting the server::
+
+        cache = base.NameCache(ttl=60)
+        keystone.projects.name_cache = cache
+        keystone.roles.name_cache = cache
+
+    Only the managers of resources whose names are unique within a domain
+    (domains, projects, users, groups and roles) use the cache. Names are
+    scoped by the type of the resource and its domain.
+
+    :param int ttl: The number of seconds a name is remembered for.
+                    (optional, defaults to 60)
+    :param int max_size: The maximum number of names to remember. The least
+                         recently used names are forgotten first. (optional,
+                         defaults to 1000)
+    """
+
+    def __init__(self, ttl=60, max_size=1000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, resource_class, domain_id, name):
+        """Return the ID of a named resource or None if it isn't known."""
+        key = (resource_class, domain_id, name)
+        now = timeutils.utcnow_ts(microsecond=True)
+
+        with self._lock:
+            try:
+                expires, resource_id = self._entries.pop(key)
+            except KeyError:
+                return None
+
+            if expires <= now:
+                return None
+
+            self._entries[key] = (expires, resource_id)
+            return resource_id
+
+    def set(self, resource_class, domain_id, name, resource_id):
+        """Remember the ID of a named resource."""
+        key = (resource_class, domain_id, name)
+        expires = timeutils.utcnow_ts(microsecond=True) + self.ttl
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires, resource_id)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def add_resources(self, resource_class, objs, complete=False):
+        """Remember the names of resources.
+
+        A name that appears more than once in the same domain is forgotten
+        rather than remembered as it is ambiguous. So is a name remembered
+        without a domain when a resource of another ID with that name is
+        added, as it may now be used in several domains.
+
+        :param bool complete: whether objs are all the resources of the type,
+            in every domain. Names are then also remembered without a domain
+            if they appear in only one domain, so that they can be found
+            without giving the domain.
+        """
+        seen = {}
+
+        for obj in objs:
+            # NOTE: use the data rather than attributes so that resources
+            # that aren't loaded don't fetch themselves.
+            info = obj if isinstance(obj, dict) else getattr(obj, '_info',
+                                                             None)
+            if not isinstance(info, dict):
+                continue
+
+            resource_id = info.get('id')
+            name = info.get('name')
+            if resource_id is None or name is None:
+                continue
+
+            key = (info.get('domain_id'), name)
+            try:
+                hash(key)
+            except TypeError:
+                continue
+
+            seen[key] = None if key in seen else resource_id
+
+        if complete:
+            unscoped = {}
+            for (_domain_id, name), resource_id in seen.items():
+                unscoped[name] = None if name in unscoped else resource_id
+
+            for name, resource_id in unscoped.items():
+                seen[(None, name)] = resource_id
+        else:
+            for (domain_id, name), resource_id in list(seen.items()):
+                if (domain_id is not None and resource_id !=
+                        self.get(resource_class, None, name)):
+                    self.delete(resource_class, None, name)
+
+        for (domain_id, name), resource_id in seen.items():
+            if resource_id is None:
+                self.delete(resource_class, domain_id, name)
+            else:
+                self.set(resource_class, domain_id, name, resource_id)
+
+    def delete(self, resource_class, domain_id, name):
+        """Forget a name."""
+        with self._lock:
+            self._entries.pop((resource_class, domain_id, name), None)
+
+    def invalidate(self, resource_class, resource_id):
+        """Forget every name of the resource with ``resource_id``."""
+        with self._lock:
+            for key in [k for k, (_e, i) in self._entries.items()
+                        if i == resource_id and k[0] is resource_class]:
+                del self._entries[key]
+
+    def clear(self):
+        """Forget all names."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
 class Resource(object):
     """Base class for OpenStack resources (tenant, user, etc.).
 
@@ -547,3 +1070,149 @@ class Resource(object):
 
     def delete(self):
         return self.manager.delete(self)
+
+
+def _copy_json(value):
+    # deepcopy for the types that can appear in decoded JSON, it avoids the
+    # memo and dispatch overhead of copy.deepcopy.
+    if isinstance(value, dict):
+        return dict((k, _copy_json(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return [_copy_json(v) for v in value]
+    return value
+
+
+class CompactResource(object):
+    """A read only, low overhead alternative to :py:class:`Resource`.
+
+    Attributes are looked up in the resource data rather than being copied
+    onto the object, and the object has no ``__dict__``, so only a reference
+    to the data and the manager is stored per resource. This makes them
+    considerably smaller and faster to create than :py:class:`Resource`
+    which matters when listing large collections.
+
+    Compact resources are always considered loaded and don't support
+    setting attributes.
+    """
+
+    __slots__ = ('manager', '_info')
+
+    HUMAN_ID = False
+    NAME_ATTR = 'name'
+
+    def __init__(self, manager, info, loaded=True):
+        self.manager = manager
+        self._info = info
+
+    def __getattr__(self, k):
+        if k in CompactResource.__slots__ or k.startswith('__'):
+            # avoid recursing when the slots aren't set yet, e.g. on copy
+            raise AttributeError(k)
+
+        try:
+            return self._info[k]
+        except KeyError:
+            raise AttributeError(k)
+
+    def __dir__(self):
+        return sorted(set(dir(type(self))) | set(self._info))
+
+    def __repr__(self):
+        """Return string representation of resource attributes."""
+        info = ", ".join("%s=%s" % (k, self._info[k])
+                         for k in sorted(self._info) if k[0] != '_')
+        return "<%s %s>" % (self.__class__.__name__, info)
+
+    @property
+    def human_id(self):
+        """Human-readable ID which can be used for bash completion."""
+        if self.HUMAN_ID:
+            name = self._info.get(self.NAME_ATTR)
+            if name is not None:
+                return strutils.to_slug(name)
+        return None
+
+    def __eq__(self, other):
+        """Define equality for resources."""
+        if not isinstance(other, (Resource, CompactResource)):
+            return NotImplemented
+        if self.__class__.__name__ != other.__class__.__name__:
+            return False
+        return self._info == other._info
+
+    def __ne__(self, other):
+        """Define inequality for resources."""
+        return not self == other
+
+    __hash__ = None
+
+    def is_loaded(self):
+        return True
+
+    def to_dict(self):
+        return _copy_json(self._info)
+
+    def delete(self):
+        return self.manager.delete(self)
+
+
+_compact_classes = {}
+_tuple_classes = {}
+
+
+def compact_resource_class(resource_class):
+    """Return the :py:class:`CompactResource` class for a resource class.
+
+    The returned class has the same name and ``HUMAN_ID`` and ``NAME_ATTR``
+    settings as ``resource_class`` so that the two represent themselves the
+    same way.
+    """
+    try:
+        return _compact_classes[resource_class]
+    except KeyError:
+        pass
+
+    cls = type(resource_class.__name__, (CompactResource,), {
+        '__slots__': (),
+        '__module__': resource_class.__module__,
+        'HUMAN_ID': getattr(resource_class, 'HUMAN_ID', False),
+        'NAME_ATTR': getattr(resource_class, 'NAME_ATTR', 'name'),
+    })
+
+    return _compact_classes.setdefault(resource_class, cls)
+
+
+def _raw_resource(manager, info, loaded=False):
+    return info
+
+
+def _tuple_resource_class(fields):
+    """Return a callable that projects resource data onto a named tuple."""
+    fields = tuple(fields)
+
+    try:
+        return _tuple_classes[fields]
+    except KeyError:
+        pass
+
+    row = collections.namedtuple(
+        'Row', [f.replace('.', '_') for f in fields], rename=True)
+    paths = [(f, f.split('.')) for f in fields]
+
+    def _get(info, field, path):
+        try:
+            return info[field]
+        except KeyError:
+            pass
+
+        for part in path:
+            try:
+                info = info[part]
+            except (KeyError, TypeError):
+                return None
+        return info
+
+    def _make(manager, info, loaded=False):
+        return row(*[_get(info, f, p) for f, p in paths])
+
+    return _tuple_classes.setdefault(fields, _make)
@@ -0,0 +1,179 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Incremental decoding of JSON collection responses.
+
+Collection responses from the identity server have the form::
+
+    {"users": [{...}, {...}, ...], "links": {...}}
+
+:py:func:`iter_items` decodes the members of such a collection one at a
+time from an iterable of chunks (e.g. ``response.iter_content()``) so that
+neither the whole response text nor the whole decoded collection needs to be
+held in memory.
+"""
+
+import codecs
+import json
+import re
+
+import six
+
+from keystoneclient.i18n import _
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+class _Reader(object):
+    """A buffer over an iterable of chunks of JSON text."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buf = u''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Append the next chunk to the buffer.
+
+        Data before the current position is discarded.
+
+        :returns: False if there was no more data to read.
+        """
+        if self.eof:
+            return False
+
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+
+        for chunk in self._chunks:
+            if isinstance(chunk, six.binary_type):
+                chunk = self._decoder.decode(chunk)
+            if chunk:
+                self.buf += chunk
+                return True
+
+        self.buf += self._decoder.decode(b'', final=True)
+        self.eof = True
+        return False
+
+    def _error(self, expected):
+        msg = _('Expecting %(expected)s at offset %(pos)d of buffer '
+                '%(buf)r') % {'expected': expected, 'pos': self.pos,
+                              'buf': self.buf[self.pos:self.pos + 20]}
+        return ValueError(msg)
+
+    def peek(self):
+        """Skip whitespace and return the next character or '' at the end."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return u''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self._error(repr(char))
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+
+        while True:
+            try:
+                obj, end = _DECODER.raw_decode(self.buf, self.pos)
+            except ValueError:
+                if self._fill():
+                    continue
+                raise
+
+            if end == len(self.buf) and not self.eof:
+                # a number may continue in the next chunk, check again with
+                # more data.
+                self._fill()
+                continue
+
+            self.pos = end
+            return obj
+
+
+def iter_items(chunks, key):
+    """Decode the members of a collection in a JSON object incrementally.
+
+    :param chunks: An iterable of ``bytes`` (UTF-8 encoded) or text making up
+                   a JSON document.
+    :param str key: The key of the top level object that holds the
+                    collection.
+
+    :returns: A generator of the decoded members of the collection. Keystone's
+              legacy ``{"values": [...]}`` wrapping of a collection is also
+              accepted.
+    :raises KeyError: if the document does not contain ``key``.
+    :raises ValueError: if the document is not valid JSON.
+    """
+    reader = _Reader(chunks)
+    found = False
+
+    reader.expect(u'{')
+    if reader.peek() == u'}':
+        raise KeyError(key)
+
+    while True:
+        name = reader.value()
+        if not isinstance(name, six.string_types):
+            raise reader._error(_('a property name'))
+        reader.expect(u':')
+
+        if name != key:
+            reader.value()
+        elif reader.peek() == u'[':
+            found = True
+            reader.pos += 1
+
+            if reader.peek() == u']':
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+
+                    char = reader.peek()
+                    reader.pos += 1
+                    if char == u']':
+                        break
+                    elif char != u',':
+                        reader.pos -= 1
+                        raise reader._error(u"',' or ']'")
+        else:
+            found = True
+            value = reader.value()
+            try:
+                value = value['values']
+            except (KeyError, TypeError):  # nosec: not the legacy wrapping
+                pass
+            for item in value:
+                yield item
+
+        char = reader.peek()
+        reader.pos += 1
+        if char == u'}':
+            break
+        elif char != u',':
+            reader.pos -= 1
+            raise reader._error(u"',' or '}'")
+
+    if not found:
+        raise KeyError(key)
@@ -0,0 +1,371 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""A process wide cache of version discovery results.
+
+By default version discovery results are only cached on the auth plugin and
+the session that performed discovery, so every new session repeats the
+discovery requests. Enabling the process wide cache shares the results
+between all sessions and plugins for a limited time::
+
+    from keystoneclient import discovery_cache
+
+    discovery_cache.enable(ttl=600)
+
+While enabled, :py:class:`keystoneclient.discover.Discover`, the
+``get_discovery`` method of identity plugins and the version detection of
+the generic plugins consult the cache before contacting the server. Failed
+discovery is remembered for a shorter time so that an unreachable endpoint
+isn't retried by every session. Until then a
+:py:class:`keystoneclient.exceptions.DiscoveryFailure` is raised for it,
+caused by the original error.
+
+Short lived processes, such as command line tools and cron jobs, can also
+keep version data on disk so that it survives from one run to the next::
+
+    discovery_cache.enable_file_cache(ttl=3600)
+
+When both are enabled the in-process cache is consulted first, then the
+files, and only then the server.
+"""
+
+import collections
+import copy
+import functools
+import logging
+import os
+import threading
+
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
+import six
+
+from keystoneclient import _fileutils
+from keystoneclient import exceptions
+from keystoneclient.i18n import _
+
+
+_logger = logging.getLogger(__name__)
+
+# The exception discovering a URL raised and whether the request was
+# authenticated, a failure may only apply to one or the other.
+_Failure = collections.namedtuple('_Failure', ['error', 'authenticated'])
+
+
+class DiscoveryCache(object):
+    """A bounded cache of the version data of URLs with per entry expiry.
+
+    :param int ttl: The number of seconds to cache version data for.
+                    (optional, defaults to 300)
+    :param int failure_ttl: The number of seconds to remember that discovery
+                            of a URL failed for. 0 disables caching failures.
+                            (optional, defaults to 30)
+    :param int max_size: The maximum number of URLs to cache. The least
+                         recently used URLs are removed to make room for new
+                         ones. (optional, defaults to 100)
+    """
+
+    _FAILURES = (exceptions.DiscoveryFailure,
+                 exceptions.HTTPError,
+                 exceptions.ConnectionError)
+
+    def __init__(self, ttl=300, failure_ttl=30, max_size=100):
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """Return the cached version data or failure of a URL.
+
+        :returns: a tuple of whether the URL was found and either its
+                  version data or a ``_Failure`` holding the exception
+                  discovering it raised.
+        """
+        now = timeutils.utcnow_ts(microsecond=True)
+
+        with self._lock:
+            try:
+                expires, value = self._entries.pop(url)
+            except KeyError:
+                return False, None
+
+            if expires <= now:
+                return False, None
+
+            # re-insert to mark it as the most recently used
+            self._entries[url] = (expires, value)
+            return True, value
+
+    def set(self, url, value, ttl=None):
+        """Cache the version data, or an exception, for a URL."""
+        if ttl is None:
+            ttl = self.ttl
+
+        expires = timeutils.utcnow_ts(microsecond=True) + ttl
+
+        with self._lock:
+            self._entries.pop(url, None)
+            self._entries[url] = (expires, value)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_version_data(self, session, url, fetch, **kwargs):
+        """Return the version data of a URL, fetching it on a cache miss.
+
+        :param session: The session to discover with.
+        :param str url: The URL to discover.
+        :param fetch: The function to fetch version data with. It is called
+                      with the session, the URL and any other keyword
+                      arguments.
+
+        :raises keystoneclient.exceptions.DiscoveryFailure: if discovery
+            fails, or failed recently.
+        :raises keystoneclient.exceptions.HttpError: An error from an invalid
+                                                     HTTP response.
+        """
+        authenticated = kwargs.get('authenticated')
+        found, value = self.get(url)
+        if (found and isinstance(value, _Failure) and
+                value.authenticated != authenticated):
+            found = False
+
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        metrics = getattr(session, 'metrics', None)
+        if metrics:
+            metrics.record_discovery(hit=found)
+
+        if found:
+            if isinstance(value, _Failure):
+                # NOTE: the cached exception is shared between threads,
+                # raising it again would extend its traceback every time.
+                six.raise_from(exceptions.DiscoveryFailure(
+                    _('Discovery of %(url)s failed recently: %(error)s') %
+                    {'url': url, 'error': value.error}), value.error)
+            return copy.deepcopy(value)
+
+        try:
+            data = fetch(session, url, **kwargs)
+        except self._FAILURES as e:
+            if self.failure_ttl:
+                self.set(url, _Failure(e, authenticated), self.failure_ttl)
+            raise
+
+        self.set(url, data)
+        return copy.deepcopy(data)
+
+    def invalidate(self, url=None):
+        """Forget the result for a URL or for all URLs if not given."""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(url, None)
+
+    def stats(self):
+        """Return the hit and miss counters of the cache.
+
+        :returns: a dict with ``hits``, ``misses`` and ``size`` keys.
+        :rtype: dict
+        """
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._entries)}
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileCache(object):
+    """Version data kept in files, shared between processes.
+
+    Each URL is stored in its own file in ``directory``. Files are replaced
+    atomically by renaming so readers never see a partial write, and where
+    the platform supports it the processes that find a URL missing lock its
+    file so that only one of them fetches it while the others wait for the
+    result. Errors reading or writing the files are logged and otherwise
+    ignored, the cache never causes discovery to fail.
+
+    :param str directory: The directory to keep the files in. It is created,
+                          readable only by the user, if it doesn't exist.
+                          (optional, defaults to ``keystoneclient/discovery``
+                          in the user's cache directory)
+    :param int ttl: The number of seconds version data is used for.
+                    (optional, defaults to 3600)
+    """
+
+    def __init__(self, directory=None, ttl=3600):
+        self.directory = directory or _fileutils.default_directory('discovery')
+        self.ttl = ttl
+
+    def _path(self, url, suffix='.json'):
+        return _fileutils.key_path(self.directory, url, suffix)
+
+    def get(self, url):
+        """Return the cached version data of a URL or None."""
+        try:
+            with open(self._path(url)) as f:
+                entry = jsonutils.loads(f.read())
+        except (IOError, OSError, ValueError):
+            return None
+
+        try:
+            if (entry['url'] != url or
+                    entry['expires'] <= timeutils.utcnow_ts(microsecond=True)):
+                return None
+            return entry['data']
+        except (KeyError, TypeError):
+            return None
+
+    def set(self, url, data):
+        """Store the version data of a URL."""
+        entry = {'url': url,
+                 'expires': timeutils.utcnow_ts(microsecond=True) + self.ttl,
+                 'data': data}
+
+        try:
+            _fileutils.write_atomic(self._path(url), jsonutils.dumps(entry))
+        except (IOError, OSError) as e:
+            _logger.debug('Failed to cache version data of %s: %s', url, e)
+
+    def get_version_data(self, session, url, fetch, **kwargs):
+        """Return the version data of a URL, fetching it on a cache miss.
+
+        The arguments are the same as for
+        :py:meth:`DiscoveryCache.get_version_data`.
+        """
+        data = self.get(url)
+        if data is not None:
+            return data
+
+        with _fileutils.locked(self._path(url, '.lock')):
+            # another process may have fetched it while we waited
+            data = self.get(url)
+            if data is not None:
+                return data
+
+            data = fetch(session, url, **kwargs)
+            self.set(url, data)
+
+        return data
+
+    def invalidate(self, url=None):
+        """Remove the file for a URL or all the files if not given."""
+        if url is not None:
+            paths = [self._path(url)]
+        else:
+            try:
+                paths = [os.path.join(self.directory, name)
+                         for name in os.listdir(self.directory)
+                         if name.endswith('.json')]
+            except OSError:
+                return
+
+        for path in paths:
+            try:
+                os.unlink(path)
+            except OSError:  # nosec: already removed
+                pass
+
+
+_cache = None
+_file_cache = None
+
+
+def enable(ttl=300, failure_ttl=30, max_size=100):
+    """Enable the process wide discovery cache.
+
+    Any cache that was already enabled is replaced. The arguments are the
+    same as for :py:class:`DiscoveryCache`.
+
+    :returns: The cache now in use.
+    :rtype: :py:class:`DiscoveryCache`
+    """
+    global _cache
+    _cache = DiscoveryCache(ttl=ttl, failure_ttl=failure_ttl,
+                            max_size=max_size)
+    return _cache
+
+
+def disable():
+    """Disable the process wide discovery cache, dropping its contents."""
+    global _cache
+    _cache = None
+
+
+def get_cache():
+    """Return the process wide discovery cache or None if not enabled."""
+    return _cache
+
+
+def enable_file_cache(directory=None, ttl=3600):
+    """Keep version data in files that outlive the process.
+
+    Any file cache that was already enabled is replaced. The arguments are
+    the same as for :py:class:`FileCache`.
+
+    :returns: The file cache now in use.
+    :rtype: :py:class:`FileCache`
+    """
+    global _file_cache
+    _file_cache = FileCache(directory=directory, ttl=ttl)
+    return _file_cache
+
+
+def disable_file_cache():
+    """Stop using the file cache. The files are left in place."""
+    global _file_cache
+    _file_cache = None
+
+
+def get_file_cache():
+    """Return the file cache or None if not enabled."""
+    return _file_cache
+
+
+def get_version_data(session, url, fetch, **kwargs):
+    """Return the version data of a URL from the enabled caches.
+
+    The process wide cache is consulted first, then the file cache and if
+    neither has the URL it is fetched.
+
+    :param session: The session to discover with.
+    :param str url: The URL to discover.
+    :param fetch: The function to fetch version data with. It is called
+                  with the session, the URL and any other keyword arguments.
+    """
+    cache = _cache
+    file_cache = _file_cache
+
+    if file_cache is not None:
+        fetch = functools.partial(file_cache.get_version_data, fetch=fetch)
+    if cache is not None:
+        fetch = functools.partial(cache.get_version_data, fetch=fetch)
+
+    return fetch(session, url, **kwargs)
+
+
+def invalidate(url=None):
+    """Forget the discovery result for a URL or for all URLs if not given."""
+    for cache in (_cache, _file_cache):
+        if cache is not None:
+            cache.invalidate(url)
@@ -435,3 +435,26 @@ class InvalidResponse(ClientException):
     def __init__(self, response):
         super(InvalidResponse, self).__init__()
         self.response = response
+
+
+class CircuitOpen(ConnectionRefused):
+    """Requests to an endpoint are failing fast after repeated failures.
+
+    Raised instead of trying to connect while the circuit breaker of a
+    session considers the endpoint down.
+
+    .. py:attribute:: endpoint
+
+        The host and port of the endpoint.
+
+    .. py:attribute:: retry_after
+
+        Seconds until a request will be let through to probe the endpoint.
+    """
+
+    def __init__(self, endpoint, retry_after=None):
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+        m = _('Not connecting to %s after repeated connection failures')
+        super(CircuitOpen, self).__init__(m % endpoint)
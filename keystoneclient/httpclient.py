@@ -142,6 +142,25 @@ class _KeystoneAdapter(adapter.LegacyJsonAdapter):
 
         return None
 
+    def stream(self, url, method='GET', **kwargs):
+        """Send a request without reading or decoding the response body.
+
+        The response is returned as soon as the headers have been received so
+        that the body can be consumed incrementally, e.g. with
+        ``resp.iter_content()``. The caller is responsible for closing the
+        response.
+
+        A keystoneclient session logs that the body is omitted. Other
+        sessions would read the whole body to log it, so with those the
+        request isn't logged at all.
+        """
+        headers = kwargs.setdefault('headers', {})
+        headers.setdefault('Accept', 'application/json')
+        kwargs['stream'] = True
+        if not isinstance(self.session, client_session.Session):
+            kwargs.setdefault('log', False)
+        return adapter.Adapter.request(self, url, method, **kwargs)
+
 
 class HTTPClient(baseclient.Client, base.BaseAuthPlugin):
     """HTTP client.
@@ -206,6 +225,10 @@ class HTTPClient(baseclient.Client, base.BaseAuthPlugin):
     :param integer stale_duration: Gap in seconds to determine if token from
                                    keyring is about to expire. default: 30
                                    (optional)
+    :param token_cache: A cache to store auth_ref in instead of the keyring,
+                        such as a
+                        :py:class:`keystoneclient.token_cache.FileTokenCache`.
+                        default: None (optional)
     :param string tenant_name: Tenant name. (optional) The tenant_name keyword
                                argument is deprecated as of the 1.7.0 release
                                in favor of project_name and may be removed in
@@ -249,7 +272,8 @@ class HTTPClient(baseclient.Client, base.BaseAuthPlugin):
                  project_domain_id=None, project_domain_name=None,
                  trust_id=None, session=None, service_name=None,
                  interface='admin', endpoint_override=None, auth=None,
-                 user_agent=USER_AGENT, connect_retries=None, **kwargs):
+                 user_agent=USER_AGENT, connect_retries=None,
+                 token_cache=None, **kwargs):
         # set baseline defaults
         self.user_id = None
         self.username = None
@@ -393,6 +417,7 @@ class HTTPClient(baseclient.Client, base.BaseAuthPlugin):
         if use_keyring and keyring is None:
             _logger.warning('Failed to load keyring modules.')
         self.use_keyring = use_keyring and keyring is not None
+        self.token_cache = token_cache
         self.force_new_token = force_new_token
         self.stale_duration = stale_duration or access.STALE_TOKEN_DURATION
         self.stale_duration = int(self.stale_duration)
@@ -521,14 +546,14 @@ class HTTPClient(baseclient.Client, base.BaseAuthPlugin):
         :raises keystoneclient.exceptions.ValueError: if insufficient
                                                       parameters are used.
 
-        If keyring is used, token is retrieved from keyring instead.
-        Authentication will only be necessary if any of the following
-        conditions are met:
+        If keyring or a token cache is used, token is retrieved from it
+        instead. Authentication will only be necessary if any of the
+        following conditions are met:
 
-        * keyring is not used
-        * if token is not found in keyring
-        * if token retrieved from keyring is expired or about to
-          expired (as determined by stale_duration)
+        * neither keyring nor a token cache is used
+        * if token is not found in keyring or the token cache
+        * if token retrieved from keyring or the token cache is expired or
+          about to expired (as determined by stale_duration)
         * if force_new_token is true
 
         """
@@ -581,15 +606,15 @@ class HTTPClient(baseclient.Client, base.BaseAuthPlugin):
                 self.auth_ref = resp
             else:
                 self.auth_ref = access.AccessInfo.factory(*resp)
-
-            # NOTE(jamielennox): The original client relies on being able to
-            # push the region name into the service catalog but new auth
-            # it in.
-            if region_name:
-                self.auth_ref.service_catalog._region_name = region_name
         else:
             self.auth_ref = auth_ref
 
+        # NOTE(jamielennox): The original client relies on being able to
+        # push the region name into the service catalog but new auth
+        # it in.
+        if region_name:
+            self.auth_ref.service_catalog._region_name = region_name
+
         self.process_token(region_name=region_name)
         if new_token_needed:
             self.store_auth_ref_into_keyring(keyring_key)
@@ -598,7 +623,7 @@ class HTTPClient(baseclient.Client, base.BaseAuthPlugin):
     def _build_keyring_key(self, **kwargs):
         """Create a unique key for keyring.
 
-        Used to store and retrieve auth_ref from keyring.
+        Used to store and retrieve auth_ref from keyring or the token cache.
 
         Return a slash-separated string of values ordered by key name.
 
@@ -606,18 +631,23 @@ class HTTPClient(baseclient.Client, base.BaseAuthPlugin):
         return '/'.join([kwargs[k] or '?' for k in sorted(kwargs)])
 
     def get_auth_ref_from_keyring(self, **kwargs):
-        """Retrieve auth_ref from keyring.
+        """Retrieve auth_ref from the token cache or keyring.
 
-        If auth_ref is found in keyring, (keyring_key, auth_ref) is returned.
-        Otherwise, (keyring_key, None) is returned.
+        If auth_ref is found, (keyring_key, auth_ref) is returned.
+        Otherwise, (keyring_key, None) is returned. A token cache, if set,
+        is used instead of the keyring.
 
         :returns: (keyring_key, auth_ref) or (keyring_key, None)
-        :returns: or (None, None) if use_keyring is not set in the object
+        :returns: or (None, None) if neither token_cache nor use_keyring is
+                  set in the object
 
         """
         keyring_key = None
         auth_ref = None
-        if self.use_keyring:
+        if self.token_cache is not None:
+            keyring_key = self._build_keyring_key(**kwargs)
+            auth_ref = self.token_cache.get(keyring_key, self.stale_duration)
+        elif self.use_keyring:
             keyring_key = self._build_keyring_key(**kwargs)
             try:
                 auth_ref = keyring.get_password("keystoneclient_auth",
@@ -634,8 +664,10 @@ class HTTPClient(baseclient.Client, base.BaseAuthPlugin):
         return (keyring_key, auth_ref)
 
     def store_auth_ref_into_keyring(self, keyring_key):
-        """Store auth_ref into keyring."""
-        if self.use_keyring:
+        """Store auth_ref into the token cache or keyring."""
+        if self.token_cache is not None:
+            self.token_cache.set(keyring_key, self.auth_ref)
+        elif self.use_keyring:
             try:
                 keyring.set_password("keystoneclient_auth",
                                      keyring_key,
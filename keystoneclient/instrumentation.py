@@ -0,0 +1,213 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Timing breakdowns of the requests made by a session.
+
+A :py:class:`keystoneclient.session.Session` given ``timing_sinks`` records
+where the time of each request went and passes a :py:class:`RequestTiming` to
+every sink once the request completes::
+
+    from keystoneclient import instrumentation
+
+    sess = session.Session(auth=auth, timing_sinks=[
+        instrumentation.LoggingSink(),
+        instrumentation.StatsdSink(statsd_client),
+    ])
+
+A sink is any callable that accepts a :py:class:`RequestTiming`. The time of
+a request is divided into the following phases:
+
+    :auth: Getting the auth headers and connection parameters from the auth
+           plugin, including fetching a token if required.
+    :endpoint: Resolving the URL from the endpoint filter.
+    :serialize: Encoding the JSON body.
+    :network: Sending the request and receiving the response.
+    :retry_wait: Waiting before retrying after a connection failure or a
+                 response that the retry policy allows retrying.
+    :redirect: Following redirects.
+    :reauth: Fetching a new token and resending the request after a 401
+             response.
+
+Without sinks no timing is recorded.
+"""
+
+import contextlib
+import logging
+
+from oslo_utils import timeutils
+
+
+_logger = logging.getLogger(__name__)
+
+PHASES = ('auth', 'endpoint', 'serialize', 'network', 'retry_wait',
+          'redirect', 'reauth')
+
+
+class RequestTiming(object):
+    """The timing breakdown of a single request.
+
+    :ivar str method: The HTTP method of the request.
+    :ivar str service_type: The service type of the endpoint filter of the
+                            request, if any.
+    :ivar str url: The URL requested. This is the URL resolved from the
+                   endpoint filter, not a URL redirected to.
+    :ivar int status_code: The status code of the final response or None if
+                           no response was received.
+    :ivar exception: The exception raised by the request, if any.
+    :ivar dict phases: The seconds spent in each phase. Only phases the request
+                       went through are present.
+    :ivar dict counts: The number of ``retries``, ``redirects``,
+                       ``reauths``, ``failovers`` and ``hedges`` that
+                       occurred.
+    :ivar float total: The total seconds taken by the request.
+    """
+
+    def __init__(self, method, sinks=(), service_type=None):
+        self.method = method
+        self.service_type = service_type
+        self.url = None
+        self.status_code = None
+        self.exception = None
+        self.phases = {}
+        self.counts = {}
+        self.total = None
+        self._sinks = sinks
+        self._start = timeutils.now()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Add the time spent in the block to a phase."""
+        start = timeutils.now()
+        try:
+            yield
+        finally:
+            elapsed = timeutils.now() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def incr(self, name):
+        """Count an occurrence of a retry, redirect, reauth or failover."""
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def child(self):
+        """Return a timing for one of several concurrent attempts.
+
+        The child has no sinks. Once an attempt has been chosen its phases
+        and counts are added to the request's with :py:meth:`merge`.
+        """
+        return RequestTiming(self.method, service_type=self.service_type)
+
+    def merge(self, other):
+        """Add the phases and counts of a child timing to this one."""
+        for name, seconds in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        for name, count in other.counts.items():
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    def finish(self, url, response=None, exception=None):
+        """Complete the timing and pass it to the sinks."""
+        self.total = timeutils.now() - self._start
+        self.url = url
+        self.exception = exception
+        if response is not None:
+            self.status_code = response.status_code
+
+        for sink in self._sinks:
+            try:
+                sink(self)
+            except Exception:
+                _logger.exception('Failed to record request timing')
+
+
+class _NullPhase(object):
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+class _NullTiming(object):
+    """Stands in for a :py:class:`RequestTiming` when timing is disabled."""
+
+    _phase = _NullPhase()
+
+    def phase(self, name):
+        return self._phase
+
+    def incr(self, name):
+        pass
+
+    def child(self):
+        return self
+
+    def merge(self, other):
+        pass
+
+    def finish(self, url, response=None, exception=None):
+        pass
+
+
+NULL_TIMING = _NullTiming()
+
+
+class LoggingSink(object):
+    """Log the timing breakdown of each request.
+
+    :param logger: The logger to use. (optional, defaults to the logger of
+                   this module)
+    :param int level: The level to log at. (optional, defaults to DEBUG)
+    """
+
+    def __init__(self, logger=None, level=logging.DEBUG):
+        self.logger = logger or _logger
+        self.level = level
+
+    def __call__(self, timing):
+        if not self.logger.isEnabledFor(self.level):
+            return
+
+        parts = ['%s=%.1fms' % (name, timing.phases[name] * 1000)
+                 for name in PHASES if name in timing.phases]
+        parts.extend('%s=%d' % (name, count)
+                     for name, count in sorted(timing.counts.items()))
+
+        self.logger.log(self.level, '%s %s %s %.1fms %s',
+                        timing.method, timing.url,
+                        timing.status_code or type(timing.exception).__name__,
+                        timing.total * 1000, ' '.join(parts))
+
+
+class StatsdSink(object):
+    """Send the timing breakdown of each request to statsd.
+
+    :param client: A statsd client, any object with ``timing(stat, ms)`` and
+                   ``incr(stat, count)`` methods.
+    :param str prefix: The prefix of the stat names. (optional)
+
+    The stats sent are ``<prefix>.total``, ``<prefix>.<phase>`` for each phase
+    and ``<prefix>.<count>`` for retries, redirects, reauths, failovers and
+    hedges.
+    """
+
+    def __init__(self, client, prefix='keystoneclient.request'):
+        self.client = client
+        self.prefix = prefix
+
+    def __call__(self, timing):
+        self.client.timing('%s.total' % self.prefix, timing.total * 1000)
+
+        for name, elapsed in timing.phases.items():
+            self.client.timing('%s.%s' % (self.prefix, name), elapsed * 1000)
+
+        for name, count in timing.counts.items():
+            self.client.incr('%s.%s' % (self.prefix, name), count)
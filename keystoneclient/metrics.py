@@ -0,0 +1,380 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""In-process metrics of client activity.
+
+A :py:class:`ClientMetrics` passed to a
+:py:class:`keystoneclient.session.Session` collects counters and histograms
+of the requests made by the session, the tokens fetched by its auth plugins
+and the hit rates of the discovery and catalog caches::
+
+    from keystoneclient import metrics
+
+    client_metrics = metrics.ClientMetrics()
+    sess = session.Session(auth=auth, metrics=client_metrics)
+
+    # in the handler of the service's metrics endpoint
+    body = client_metrics.registry.expose()
+
+The metrics are kept in a :py:class:`Registry` and exported in the
+Prometheus text exposition format. A registry can be shared between several
+sessions and with metrics of the application itself.
+"""
+
+import math
+import threading
+
+import six
+
+from keystoneclient.i18n import _
+
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+"""The content type of :py:meth:`Registry.expose` output."""
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0)
+
+
+def _format_value(value):
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _escape(value):
+    return (six.text_type(value).replace('\\', r'\\')
+            .replace('\n', r'\n').replace('"', r'\"'))
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, _escape(value))
+                             for name, value in zip(names, values))
+
+
+class _Metric(object):
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            msg = _('%(name)s requires the labels %(labels)s') % {
+                'name': self.name, 'labels': ', '.join(self.labelnames)}
+            raise ValueError(msg)
+
+        return tuple(six.text_type(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        raise NotImplementedError()
+
+    def expose(self):
+        lines = ['# HELP %s %s' % (self.name,
+                                   self.documentation.replace('\\', r'\\')
+                                   .replace('\n', r'\n')),
+                 '# TYPE %s %s' % (self.name, self.type)]
+
+        with self._lock:
+            samples = self._samples()
+
+        for suffix, names, values, value in samples:
+            lines.append('%s%s%s %s' % (self.name, suffix,
+                                        _format_labels(names, values),
+                                        _format_value(value)))
+
+        return lines
+
+
+class Counter(_Metric):
+    """A value that only ever increases, such as a number of requests."""
+
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Increase the counter for the given label values."""
+        if amount < 0:
+            raise ValueError(_('Counters can only be increased'))
+
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels):
+        """Return the current value for the given label values."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        return [('', self.labelnames, key, value)
+                for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """The distribution of observed values, such as request durations.
+
+    :param buckets: The upper bounds of the buckets to count observations in.
+                    (optional, defaults to :py:data:`DEFAULT_BUCKETS`)
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=None):
+        super(Histogram, self).__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+
+    def observe(self, value, **labels):
+        """Record an observation for the given label values."""
+        key = self._key(labels)
+
+        with self._lock:
+            try:
+                counts, total = self._values[key]
+            except KeyError:
+                counts, total = [0] * (len(self.buckets) + 1), 0.0
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            else:
+                counts[-1] += 1
+
+            self._values[key] = (counts, total + value)
+
+    def get(self, **labels):
+        """Return the observation count and sum for the given label values.
+
+        :returns: a tuple of the number and the sum of observations.
+        """
+        with self._lock:
+            counts, total = self._values.get(self._key(labels), ([0], 0.0))
+            return sum(counts), total
+
+    def _samples(self):
+        names = self.labelnames + ('le',)
+        samples = []
+
+        for key, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append(('_bucket', names,
+                                key + (_format_value(bound),), cumulative))
+
+            samples.append(('_sum', self.labelnames, key, total))
+            samples.append(('_count', self.labelnames, key, cumulative))
+
+        return samples
+
+
+class Registry(object):
+    """A collection of metrics that can be exported together."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            try:
+                metric = self._metrics[name]
+            except KeyError:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+
+        if not isinstance(metric, cls):
+            msg = _('%(name)s is already registered as a %(type)s') % {
+                'name': name, 'type': metric.type}
+            raise ValueError(msg)
+
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Return the named counter, creating it if required."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=None):
+        """Return the named histogram, creating it if required."""
+        return self._register(Histogram, name, documentation, labelnames,
+                              buckets=buckets)
+
+    def get(self, name):
+        """Return a registered metric or None."""
+        return self._metrics.get(name)
+
+    def expose(self):
+        """Return all metrics in the Prometheus text exposition format.
+
+        :rtype: str
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+
+        lines = []
+        for _name, metric in metrics:
+            lines.extend(metric.expose())
+
+        return ''.join('%s\n' % line for line in lines)
+
+
+class ClientMetrics(object):
+    """The metrics collected about the activity of a client.
+
+    :param registry: The registry to add the metrics to. (optional, a new
+                     registry is created if not provided)
+    :type registry: :py:class:`Registry`
+    :param str namespace: The prefix of the metric names. (optional)
+    :param buckets: The buckets of the request duration histogram.
+                    (optional, defaults to :py:data:`DEFAULT_BUCKETS`)
+
+    The metrics collected are:
+
+    :<namespace>_http_requests_total: Requests by ``service_type``,
+        ``method`` and ``status``. The status is the exception name for
+        requests that got no response.
+    :<namespace>_http_request_duration_seconds: A histogram of request
+        durations by ``service_type`` and ``method``.
+    :<namespace>_http_retries_total: Connection retries by ``service_type``.
+    :<namespace>_http_redirects_total: Redirects followed by
+        ``service_type``.
+    :<namespace>_http_reauths_total: Requests retried with a new token after a
+        401 response by ``service_type``.
+    :<namespace>_http_failovers_total: Requests sent to the next catalog
+        endpoint after a failure by ``service_type``.
+    :<namespace>_http_hedges_total: Slow requests also sent to the next
+        catalog endpoint by ``service_type``.
+    :<namespace>_token_fetches_total: Tokens fetched by auth ``plugin`` when
+        none was held.
+    :<namespace>_token_refreshes_total: Tokens fetched by auth ``plugin`` to
+        replace an expiring one.
+    :<namespace>_discovery_cache_requests_total: Discovery lookups by
+        ``result``, either ``hit`` or ``miss``.
+    :<namespace>_catalog_lookups_total: Endpoint lookups by ``result``,
+        either ``hit`` if the endpoint cache of the session was used or
+        ``miss``.
+    :<namespace>_circuit_breaker_opened_total: Times the circuit breaker of
+        the session opened by ``endpoint``.
+    :<namespace>_circuit_breaker_rejected_total: Requests failed fast by the
+        circuit breaker of the session by ``endpoint``.
+    """
+
+    def __init__(self, registry=None, namespace='keystoneclient',
+                 buckets=None):
+        self.registry = registry if registry is not None else Registry()
+
+        def name(suffix):
+            return '%s_%s' % (namespace, suffix)
+
+        self.requests = self.registry.counter(
+            name('http_requests_total'), 'HTTP requests made.',
+            ('service_type', 'method', 'status'))
+        self.request_duration = self.registry.histogram(
+            name('http_request_duration_seconds'),
+            'Duration of HTTP requests.', ('service_type', 'method'),
+            buckets=buckets)
+        self.retries = self.registry.counter(
+            name('http_retries_total'), 'HTTP connection retries.',
+            ('service_type',))
+        self.redirects = self.registry.counter(
+            name('http_redirects_total'), 'HTTP redirects followed.',
+            ('service_type',))
+        self.reauths = self.registry.counter(
+            name('http_reauths_total'),
+            'HTTP requests retried with a new token.', ('service_type',))
+        self.failovers = self.registry.counter(
+            name('http_failovers_total'),
+            'HTTP requests sent to the next endpoint after a failure.',
+            ('service_type',))
+        self.hedges = self.registry.counter(
+            name('http_hedges_total'),
+            'Slow HTTP requests also sent to the next endpoint.',
+            ('service_type',))
+        self.token_fetches = self.registry.counter(
+            name('token_fetches_total'), 'Tokens fetched.', ('plugin',))
+        self.token_refreshes = self.registry.counter(
+            name('token_refreshes_total'), 'Tokens refreshed.', ('plugin',))
+        self.discovery_cache = self.registry.counter(
+            name('discovery_cache_requests_total'),
+            'Discovery cache lookups.', ('result',))
+        self.catalog_lookups = self.registry.counter(
+            name('catalog_lookups_total'), 'Endpoint cache lookups.',
+            ('result',))
+        self.circuit_opened = self.registry.counter(
+            name('circuit_breaker_opened_total'),
+            'Times a circuit opened after connection failures.',
+            ('endpoint',))
+        self.circuit_rejected = self.registry.counter(
+            name('circuit_breaker_rejected_total'),
+            'Requests failed fast because a circuit was open.',
+            ('endpoint',))
+
+    def record_request(self, timing):
+        """Record a completed request.
+
+        This is a sink for :py:mod:`keystoneclient.instrumentation` timings.
+
+        :param timing: The timing of the request.
+        :type timing: :py:class:`keystoneclient.instrumentation.RequestTiming`
+        """
+        service_type = timing.service_type or 'unknown'
+
+        if timing.status_code is not None:
+            status = timing.status_code
+        else:
+            status = type(timing.exception).__name__
+
+        self.requests.inc(service_type=service_type, method=timing.method,
+                          status=status)
+        self.request_duration.observe(timing.total,
+                                      service_type=service_type,
+                                      method=timing.method)
+
+        for counter, name in ((self.retries, 'retries'),
+                              (self.redirects, 'redirects'),
+                              (self.reauths, 'reauths'),
+                              (self.failovers, 'failovers'),
+                              (self.hedges, 'hedges')):
+            count = timing.counts.get(name)
+            if count:
+                counter.inc(count, service_type=service_type)
+
+    def record_token(self, plugin, refresh=False):
+        """Record an auth plugin fetching a token.
+
+        :param plugin: The auth plugin that fetched a token.
+        :param bool refresh: Whether the token replaced one held previously.
+        """
+        counter = self.token_refreshes if refresh else self.token_fetches
+        counter.inc(plugin=type(plugin).__name__)
+
+    def record_discovery(self, hit):
+        """Record a lookup in the discovery cache."""
+        self.discovery_cache.inc(result='hit' if hit else 'miss')
+
+    def record_catalog_lookup(self, hit):
+        """Record a lookup in the endpoint cache of a session."""
+        self.catalog_lookups.inc(result='hit' if hit else 'miss')
+
+    def record_circuit_opened(self, endpoint):
+        """Record the circuit of an endpoint opening."""
+        self.circuit_opened.inc(endpoint=endpoint)
+
+    def record_circuit_rejected(self, endpoint):
+        """Record a request failed fast because of an open circuit."""
+        self.circuit_rejected.inc(endpoint=endpoint)
@@ -66,6 +66,13 @@ class ServiceCatalog(object):
 
         self._region_name = region_name
 
+        # NOTE: lookups are memoized per filter in _endpoint_index. The index
+        # remembers which catalog data it was built from so that it is thrown
+        # away when the catalog on the underlying resource dict changes.
+        self._endpoint_index = {}
+        self._endpoint_index_data = None
+        self._endpoint_index_len = 0
+
     @property
     def region_name(self):
         """Region name.
@@ -138,6 +145,47 @@ class ServiceCatalog(object):
         endpoint_type = self._normalize_endpoint_type(endpoint_type)
         region_name = region_name or self._region_name
 
+        key = (service_type, endpoint_type, region_name, service_name)
+        index = self._get_endpoint_index()
+
+        try:
+            sc = index[key]
+        except KeyError:
+            sc = index[key] = self._filter_endpoints(*key)
+
+        # return copies of the endpoint lists so that callers modifying the
+        # result cannot corrupt the index.
+        return dict((st, list(endpoints)) for st, endpoints in sc.items())
+
+    def _get_endpoint_index(self):
+        """Return the endpoint lookup index for the current catalog data.
+
+        The index is rebuilt lazily if the catalog data was replaced or resized
+        since it was last used.
+        """
+        data = self.get_data()
+        data_len = len(data) if data else 0
+
+        if (data is not self._endpoint_index_data or
+                data_len != self._endpoint_index_len):
+            self._endpoint_index = {}
+            self._endpoint_index_data = data
+            self._endpoint_index_len = data_len
+
+        return self._endpoint_index
+
+    def invalidate_index(self):
+        """Discard any cached endpoint lookups.
+
+        This only needs to be called if the catalog data was modified in place,
+        replacing the catalog on the resource dict is detected automatically.
+        """
+        self._endpoint_index = {}
+        self._endpoint_index_data = None
+        self._endpoint_index_len = 0
+
+    def _filter_endpoints(self, service_type, endpoint_type, region_name,
+                          service_name):
         sc = {}
 
         for service in (self.get_data() or []):
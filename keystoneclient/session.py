@@ -11,26 +11,35 @@
 # under the License.
 
 import argparse
+import collections
+import email.utils
 import functools
 import hashlib
 import logging
+import math
 import os
+import random
 import socket
+import threading
 import time
 import warnings
+import weakref
 
 from debtcollector import removals
 from oslo_config import cfg
+from oslo_config import types
 from oslo_serialization import jsonutils
 from oslo_utils import encodeutils
 from oslo_utils import importutils
 from oslo_utils import strutils
+from oslo_utils import timeutils
 import requests
 import six
 from six.moves import urllib
 
 from keystoneclient import exceptions
 from keystoneclient.i18n import _
+from keystoneclient import instrumentation
 
 osprofiler_web = importutils.try_import("osprofiler.web")
 
@@ -58,10 +67,609 @@ def _positive_non_zero_float(argument_value):
     return value
 
 
+def _positive_non_zero_int(argument_value):
+    if argument_value is None:
+        return None
+    try:
+        value = int(argument_value)
+    except ValueError:
+        msg = _("%s must be an integer") % argument_value
+        raise argparse.ArgumentTypeError(msg)
+    if value <= 0:
+        msg = _("%s must be greater than 0") % argument_value
+        raise argparse.ArgumentTypeError(msg)
+    return value
+
+
+def _non_negative_int(argument_value):
+    try:
+        value = int(argument_value)
+    except ValueError:
+        msg = _("%s must be an integer") % argument_value
+        raise argparse.ArgumentTypeError(msg)
+    if value < 0:
+        msg = _("%s must not be negative") % argument_value
+        raise argparse.ArgumentTypeError(msg)
+    return value
+
+
+def _non_negative_float(argument_value):
+    try:
+        value = float(argument_value)
+    except ValueError:
+        msg = _("%s must be a float") % argument_value
+        raise argparse.ArgumentTypeError(msg)
+    if value < 0:
+        msg = _("%s must not be negative") % argument_value
+        raise argparse.ArgumentTypeError(msg)
+    return value
+
+
+def _status_code_list(argument_value):
+    try:
+        return [int(code) for code in argument_value.split(',')]
+    except ValueError:
+        msg = _("%s must be a comma separated list of status "
+                "codes") % argument_value
+        raise argparse.ArgumentTypeError(msg)
+
+
 def request(url, method='GET', **kwargs):
     return Session().request(url, method=method, **kwargs)
 
 
+def _get_plugin_endpoints(auth, session, **kwargs):
+    # plugins not derived from BaseAuthPlugin may only provide get_endpoint
+    try:
+        get_endpoints = auth.get_endpoints
+    except AttributeError:
+        url = auth.get_endpoint(session, **kwargs)
+        return [url] if url else []
+
+    return get_endpoints(session, **kwargs)
+
+
+class _EndpointCache(object):
+    """A memo of base URLs resolved by auth plugins.
+
+    Entries are kept per auth plugin, keyed by the endpoint filter used to
+    resolve them, and are only valid for the ``auth_ref`` that was current on
+    the plugin when they were stored. A re-authentication therefore discards
+    them implicitly. Plugins are only referenced weakly, so passing a new
+    plugin to every request doesn't keep them alive, and at most
+    ``max_size`` filters are remembered for each plugin.
+    """
+
+    def __init__(self, max_size=64):
+        self.max_size = max_size
+        self._plugins = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _make_key(endpoint_filter, multiple):
+        key = (frozenset(endpoint_filter.items()), multiple)
+
+        try:
+            hash(key)
+        except TypeError:
+            # an unhashable filter value (such as a list version), don't cache
+            return None
+
+        return key
+
+    def _lookup(self, auth, key):
+        with self._lock:
+            try:
+                auth_ref, entries = self._plugins[auth]
+            except (KeyError, TypeError):
+                return None
+
+            if auth_ref is None or auth_ref is not auth.auth_ref:
+                # the plugin re-authenticated, everything it held is stale.
+                del self._plugins[auth]
+                return None
+
+            try:
+                url = entries.pop(key)
+            except KeyError:
+                return None
+
+            # re-insert to mark it as the most recently used
+            entries[key] = url
+            return url
+
+    def _store(self, auth, key, url):
+        with self._lock:
+            try:
+                auth_ref, entries = self._plugins[auth]
+            except KeyError:
+                auth_ref, entries = None, None
+            except TypeError:
+                # the plugin can't be weakly referenced, don't cache
+                return
+
+            if entries is None or auth_ref is not auth.auth_ref:
+                entries = collections.OrderedDict()
+                try:
+                    self._plugins[auth] = (auth.auth_ref, entries)
+                except TypeError:
+                    return
+
+            entries.pop(key, None)
+            entries[key] = url
+
+            while len(entries) > self.max_size:
+                entries.popitem(last=False)
+
+    def get_endpoint(self, session, auth, endpoint_filter, multiple=False):
+        """Return the endpoint, or all endpoints if multiple, for a filter."""
+        if multiple:
+            fetch = functools.partial(_get_plugin_endpoints, auth)
+        else:
+            fetch = auth.get_endpoint
+
+        # NOTE: only plugins that hold an auth_ref can be cached because that
+        # is what tells us the catalog the endpoint came from is unchanged.
+        if not hasattr(auth, 'auth_ref'):
+            return fetch(session, **endpoint_filter)
+
+        key = self._make_key(endpoint_filter, multiple)
+
+        if key is None:
+            return fetch(session, **endpoint_filter)
+
+        url = self._lookup(auth, key)
+        if url is not None:
+            self.hits += 1
+            if session.metrics:
+                session.metrics.record_catalog_lookup(hit=True)
+            return list(url) if multiple else url
+
+        self.misses += 1
+        if session.metrics:
+            session.metrics.record_catalog_lookup(hit=False)
+        url = fetch(session, **endpoint_filter)
+
+        # NOTE: resolving the endpoint may have triggered a re-authentication
+        # so associate the result with whatever auth_ref is current now.
+        if url and auth.auth_ref:
+            self._store(auth, key, tuple(url) if multiple else url)
+
+        return url
+
+    def clear(self, auth=None):
+        """Drop cached endpoints for auth or for all plugins if not given."""
+        with self._lock:
+            if auth is None:
+                self._plugins.clear()
+                return
+
+            try:
+                self._plugins.pop(auth, None)
+            except TypeError:  # nosec: the plugin was never cached
+                pass
+
+    def stats(self):
+        """Return the hit and miss counters of the cache.
+
+        :returns: a dict with ``hits``, ``misses`` and ``size`` keys.
+        :rtype: dict
+        """
+        with self._lock:
+            size = sum(len(entries)
+                       for _ref, entries in list(self._plugins.values()))
+
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': size}
+
+
+class RetryPolicy(object):
+    """Decide whether and when to retry requests that got an error status.
+
+    Responses with one of the ``status_codes`` to requests with one of the
+    ``methods`` are retried up to ``retries`` times. Before each retry the
+    session waits for an exponentially increasing delay with random jitter,
+    so that clients that failed together don't all retry together, or for
+    the time requested by a ``Retry-After`` header.
+
+    :param int retries: The maximum number of times to retry a request.
+                        (optional, defaults to 3)
+    :param status_codes: The response status codes to retry.
+                         (optional, defaults to 429, 502, 503 and 504)
+    :param methods: The HTTP methods to retry. By default only idempotent
+                    methods are retried, POST and PATCH requests are not.
+                    (optional)
+    :param float backoff_factor: The delay before the first retry. It is
+                                 doubled for each further retry.
+                                 (optional, defaults to 0.5)
+    :param float max_backoff: The longest to wait before a retry, including
+                              when a longer Retry-After is requested.
+                              (optional, defaults to 60)
+    :param bool respect_retry_after: Wait for the time given in a
+                                     Retry-After header rather than the
+                                     backoff delay. (optional, defaults to
+                                     True)
+    """
+
+    DEFAULT_STATUS_CODES = (429, 502, 503, 504)
+    DEFAULT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+    def __init__(self, retries=3, status_codes=DEFAULT_STATUS_CODES,
+                 methods=DEFAULT_METHODS, backoff_factor=0.5, max_backoff=60,
+                 respect_retry_after=True):
+        self.retries = retries
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.respect_retry_after = respect_retry_after
+
+    def should_retry(self, method, response, attempt):
+        """Whether to retry a request.
+
+        :param str method: The HTTP method of the request.
+        :param response: The response received.
+        :param int attempt: The number of retries already made.
+        """
+        return (attempt < self.retries and
+                response.status_code in self.status_codes and
+                method.upper() in self.methods)
+
+    def _get_retry_after(self, response):
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:  # nosec: not delay-seconds, try an HTTP-date
+            pass
+
+        parsed = email.utils.parsedate_tz(value)
+        if parsed is None:
+            return None
+
+        return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+    def get_delay(self, response, attempt):
+        """Return the number of seconds to wait before retrying.
+
+        :param response: The response received.
+        :param int attempt: The number of retries already made.
+        """
+        if self.respect_retry_after:
+            retry_after = self._get_retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+
+        delay = min(self.backoff_factor * 2 ** attempt, self.max_backoff)
+        # wait between half and all of the delay
+        return delay / 2 + random.uniform(0, delay / 2)  # nosec
+
+
+class FailoverPolicy(object):
+    """Spread requests over all the catalog endpoints of a service.
+
+    A session given a failover policy resolves every endpoint the service
+    catalog lists for a service, interface and region, in catalog order,
+    instead of only the first one. A request that fails to connect, times out
+    or gets one of the ``status_codes`` is sent to the next endpoint. Only
+    requests with one of the ``methods`` fail over, other requests use the
+    first endpoint only.
+
+    With ``hedge`` enabled a request with one of the ``hedge_methods`` that
+    has not completed after the ``hedge_percentile`` of recent request
+    latencies is also sent to the next endpoint, and whichever response
+    arrives first is used. No requests are hedged until ``hedge_min_samples``
+    latencies have been recorded unless a fixed ``hedge_delay`` is given.
+
+    :param status_codes: The response status codes to fail over on.
+                         (optional, defaults to 500, 502, 503 and 504)
+    :param methods: The HTTP methods that may fail over. By default only
+                    idempotent methods do. (optional)
+    :param bool hedge: Send slow requests to a second endpoint. (optional,
+                       defaults to False)
+    :param hedge_methods: The HTTP methods that may be hedged. (optional,
+                          defaults to GET and HEAD)
+    :param float hedge_percentile: The percentile of recent latencies to wait
+                                   for before hedging. (optional, defaults to
+                                   95)
+    :param int hedge_min_samples: The number of latencies to record before
+                                  hedging. (optional, defaults to 20)
+    :param float hedge_delay: The seconds to wait before hedging. Overrides
+                              the percentile if given. (optional)
+    :param int sample_size: The number of recent latencies to keep.
+                            (optional, defaults to 100)
+    """
+
+    DEFAULT_STATUS_CODES = (500, 502, 503, 504)
+    DEFAULT_METHODS = RetryPolicy.DEFAULT_METHODS
+    DEFAULT_HEDGE_METHODS = ('GET', 'HEAD')
+
+    def __init__(self, status_codes=DEFAULT_STATUS_CODES,
+                 methods=DEFAULT_METHODS, hedge=False,
+                 hedge_methods=DEFAULT_HEDGE_METHODS, hedge_percentile=95,
+                 hedge_min_samples=20, hedge_delay=None, sample_size=100):
+        self.status_codes = frozenset(status_codes)
+        self.methods = frozenset(m.upper() for m in methods)
+        self.hedge = hedge
+        self.hedge_methods = frozenset(m.upper() for m in hedge_methods)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_delay = hedge_delay
+        self._latencies = collections.deque(maxlen=sample_size)
+
+    def applies_to(self, method):
+        """Whether requests with the method may fail over."""
+        return method.upper() in self.methods
+
+    def should_fail_over(self, response):
+        """Whether to send a request to the next endpoint after a response."""
+        return response.status_code in self.status_codes
+
+    def record_latency(self, seconds):
+        """Record the time taken by a successful request."""
+        self._latencies.append(seconds)
+
+    def get_hedge_delay(self, method):
+        """Return the seconds to wait before hedging a request.
+
+        :returns: The delay or None if the request should not be hedged.
+        """
+        if not self.hedge or method.upper() not in self.hedge_methods:
+            return None
+
+        if self.hedge_delay is not None:
+            return self.hedge_delay
+
+        samples = sorted(self._latencies)
+        if len(samples) < max(self.hedge_min_samples, 1):
+            return None
+
+        index = int(math.ceil(self.hedge_percentile / 100.0 * len(samples)))
+        return samples[min(max(index, 1), len(samples)) - 1]
+
+
+class EndpointSelector(object):
+    """Prefer the fastest of the equivalent catalog endpoints of a service.
+
+    The session records an exponentially weighted moving average of the
+    round trip time of the requests to each endpoint (host and port). When
+    the catalog lists several endpoints for a service, interface and region
+    the healthy endpoint with the lowest average is used first. Endpoints
+    that failed to connect, timed out or responded with a server error are
+    used last.
+
+    So that an endpoint that has recovered or become faster gets traffic
+    again, any endpoint that has not been measured for ``probe_interval``
+    seconds is put first for a single request, which probes it. Endpoints
+    that failed are only probed by requests that can fail over to the next
+    endpoint, so that the probe doesn't fail the request.
+
+    :param float decay: The weight of each new measurement in the average,
+                        between 0 and 1. (optional, defaults to 0.3)
+    :param float probe_interval: The seconds after which an endpoint is
+                                 measured again. (optional, defaults to 60)
+    """
+
+    def __init__(self, decay=0.3, probe_interval=60):
+        self.decay = decay
+        self.probe_interval = probe_interval
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record_latency(self, endpoint, seconds):
+        """Record the round trip time of a request to the endpoint."""
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {'latency': None})
+
+            if stats['latency'] is None:
+                stats['latency'] = seconds
+            else:
+                stats['latency'] += self.decay * (seconds - stats['latency'])
+
+            stats['failed'] = False
+            stats['measured_at'] = timeutils.now()
+
+    def record_failure(self, endpoint):
+        """Record a failed request to the endpoint."""
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, {'latency': None})
+            stats['failed'] = True
+            stats['measured_at'] = timeutils.now()
+
+    def get_latency(self, endpoint):
+        """Return the average latency of an endpoint or None if unknown."""
+        stats = self._endpoints.get(endpoint)
+        return stats['latency'] if stats else None
+
+    def order(self, urls, probe_failed=True):
+        """Return the urls ordered by preference.
+
+        :param list urls: Equivalent URLs in catalog order.
+        :param bool probe_failed: Whether an endpoint that failed may be put
+                                  first to probe it. (optional, defaults to
+                                  True)
+        :rtype: list
+        """
+        now = timeutils.now()
+        probe = None
+        ranked = []
+
+        with self._lock:
+            for i, url in enumerate(urls):
+                endpoint = urllib.parse.urlparse(url).netloc
+                stats = self._endpoints.get(endpoint)
+
+                if probe is None and (
+                        stats is None or
+                        (now - stats['measured_at'] >= self.probe_interval and
+                         (probe_failed or not stats['failed']))):
+                    # claim the probe so that concurrent requests don't all
+                    # probe the same endpoint.
+                    stats = self._endpoints.setdefault(endpoint,
+                                                       {'latency': None,
+                                                        'failed': False})
+                    stats['measured_at'] = now
+                    probe = url
+                    continue
+
+                if stats is None or stats['failed']:
+                    rank = (2, i)
+                elif stats['latency'] is None:
+                    rank = (1, i)
+                else:
+                    rank = (0, stats['latency'], i)
+
+                ranked.append((rank, url))
+
+        ranked.sort()
+        urls = [url for _rank, url in ranked]
+
+        if probe is not None:
+            urls.insert(0, probe)
+
+        return urls
+
+    def stats(self):
+        """Return the average latency and health of each endpoint.
+
+        :returns: a dict from endpoint to a dict with the ``latency`` in
+                  seconds, or None if not measured yet, and whether the last
+                  request ``failed``.
+        :rtype: dict
+        """
+        with self._lock:
+            return dict((endpoint, {'latency': s['latency'],
+                                    'failed': s['failed']})
+                        for endpoint, s in self._endpoints.items())
+
+
+class CircuitBreaker(object):
+    """Fail fast on requests to endpoints that are down.
+
+    Each endpoint (host and port) is tracked separately. After
+    ``failure_threshold`` consecutive connection failures, timeouts or server
+    errors from an endpoint its circuit opens and requests to it raise
+    :py:exc:`keystoneclient.exceptions.CircuitOpen` immediately rather than
+    waiting for a connection timeout. Once ``reset_timeout`` seconds have
+    passed the circuit is half-open: a single request is let through as a
+    probe. If it gets a good response the circuit closes again, otherwise it
+    stays open for another ``reset_timeout``.
+
+    Responses with a 5xx status, or one of the ``status_codes`` of the
+    request's :py:class:`FailoverPolicy`, count as failures. Any other
+    response, including a client error, counts as a success because it shows
+    the endpoint is serving requests.
+
+    :param int failure_threshold: The number of consecutive failures that open
+                                  the circuit. (optional, defaults to 5)
+    :param float reset_timeout: The seconds to fail fast before probing the
+                                endpoint again. (optional, defaults to 30)
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def _new_circuit(self):
+        return {'state': self.CLOSED, 'failures': 0, 'opened_at': None,
+                'rejected': 0, 'opened': 0}
+
+    def before_request(self, endpoint):
+        """Check that a request to the endpoint may be attempted.
+
+        :raises keystoneclient.exceptions.CircuitOpen: if the circuit of the
+            endpoint is open.
+        """
+        with self._lock:
+            circuit = self._circuits.get(endpoint)
+            if not circuit or circuit['state'] == self.CLOSED:
+                return
+
+            now = timeutils.utcnow_ts(microsecond=True)
+            retry_after = circuit['opened_at'] + self.reset_timeout - now
+
+            if retry_after <= 0:
+                # let this request probe the endpoint, any others wait for the
+                # next window.
+                circuit['state'] = self.HALF_OPEN
+                circuit['opened_at'] = now
+                return
+
+            circuit['rejected'] += 1
+
+        raise exceptions.CircuitOpen(endpoint, retry_after=retry_after)
+
+    def record_success(self, endpoint):
+        """Record that a response was received from the endpoint."""
+        circuit = self._circuits.get(endpoint)
+        if not circuit or (circuit['state'] == self.CLOSED and
+                           not circuit['failures']):
+            return
+
+        with self._lock:
+            circuit['state'] = self.CLOSED
+            circuit['failures'] = 0
+            circuit['opened_at'] = None
+
+    def record_failure(self, endpoint):
+        """Record a failed request to the endpoint.
+
+        :returns: True if the failure opened the circuit.
+        :rtype: bool
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(endpoint, self._new_circuit())
+            circuit['failures'] += 1
+
+            if circuit['state'] == self.HALF_OPEN:
+                # the probe failed, wait out another timeout
+                circuit['state'] = self.OPEN
+                circuit['opened_at'] = timeutils.utcnow_ts(microsecond=True)
+            elif (circuit['state'] == self.CLOSED and
+                    circuit['failures'] >= self.failure_threshold):
+                circuit['state'] = self.OPEN
+                circuit['opened_at'] = timeutils.utcnow_ts(microsecond=True)
+                circuit['opened'] += 1
+                return True
+
+        return False
+
+    def get_state(self, endpoint):
+        """Return the state of the circuit of an endpoint.
+
+        :returns: One of :py:attr:`CLOSED`, :py:attr:`OPEN` or
+                  :py:attr:`HALF_OPEN`.
+        """
+        circuit = self._circuits.get(endpoint)
+        return circuit['state'] if circuit else self.CLOSED
+
+    def stats(self):
+        """Return the state and counters of each endpoint that has failed.
+
+        :returns: a dict from endpoint to a dict with the ``state``, the
+                  consecutive ``failures``, the number of times the circuit
+                  was ``opened`` and the number of requests ``rejected``.
+        :rtype: dict
+        """
+        with self._lock:
+            return dict((endpoint, {'state': c['state'],
+                                    'failures': c['failures'],
+                                    'opened': c['opened'],
+                                    'rejected': c['rejected']})
+                        for endpoint, c in self._circuits.items())
+
+
 def _remove_service_catalog(body):
     try:
         data = jsonutils.loads(body)
@@ -117,11 +725,63 @@ class Session(object):
                               can be followed by a request. Either an integer
                               for a specific count or True/False for
                               forever/never. (optional, default to 30)
+    :param bool cache_endpoints: Remember the base URLs resolved from an
+                                 endpoint_filter by the auth plugin for as long
+                                 as the plugin's current token is in use. The
+                                 plugins are referenced weakly and a bounded
+                                 number of filters is kept for each. Hit
+                                 and miss counters are available from
+                                 :py:meth:`get_endpoint_cache_stats`.
+                                 (optional, defaults to True)
+    :param int pool_connections: The number of hosts to keep connection pools
+                                 for. (optional, defaults to the requests
+                                 default of 10)
+    :param int pool_maxsize: The maximum number of idle connections to keep
+                             open to each host. This should be at least the
+                             number of threads sharing the session, otherwise
+                             connections are discarded and re-established.
+                             (optional, defaults to the requests default of
+                             10)
+    :param bool pool_block: Wait for a connection to be returned to the pool
+                            rather than opening an additional connection when
+                            all ``pool_maxsize`` connections to a host are in
+                            use. (optional, defaults to False)
+
+    :param list timing_sinks: Callables that are passed a
+                              :py:class:`keystoneclient.instrumentation.RequestTiming`
+                              with the breakdown of where the time went after
+                              each request. (optional)
+
+    :param metrics: Collect metrics of the requests made and of the tokens
+                    fetched and the discovery performed by the auth plugins
+                    through the session. (optional)
+    :type metrics: :py:class:`keystoneclient.metrics.ClientMetrics`
+    :param retry_policy: Retry requests that receive an overloaded or
+                         unavailable response as this policy allows.
+                         (optional, defaults to not retrying)
+    :type retry_policy: :py:class:`RetryPolicy`
+    :param circuit_breaker: Fail fast on requests to endpoints that repeatedly
+                            can't be connected to. It is shared by all the
+                            adapters and clients using the session.
+                            (optional)
+    :type circuit_breaker: :py:class:`CircuitBreaker`
+    :param failover_policy: Send requests using an endpoint filter to the
+                            other catalog endpoints of the service when the
+                            first fails or is slow. (optional)
+    :type failover_policy: :py:class:`FailoverPolicy`
+    :param endpoint_selector: Send requests using an endpoint filter to the
+                              fastest of the catalog endpoints of the
+                              service. (optional)
+    :type endpoint_selector: :py:class:`EndpointSelector`
+
+    The pool parameters only apply when a requests session is not provided.
     """
 
     user_agent = None
 
     _REDIRECT_STATUSES = (301, 302, 303, 305, 307)
+    _FAILOVER_EXCEPTIONS = (exceptions.RequestTimeout,
+                            exceptions.ConnectionRefused)
 
     REDIRECT_STATUSES = _REDIRECT_STATUSES
     """This property is deprecated as of the 1.7.0 release and may be removed
@@ -135,7 +795,11 @@ class Session(object):
 
     def __init__(self, auth=None, session=None, original_ip=None, verify=True,
                  cert=None, timeout=None, user_agent=None,
-                 redirect=_DEFAULT_REDIRECT_LIMIT):
+                 redirect=_DEFAULT_REDIRECT_LIMIT, cache_endpoints=True,
+                 pool_connections=None, pool_maxsize=None, pool_block=None,
+                 timing_sinks=None, metrics=None, retry_policy=None,
+                 circuit_breaker=None, failover_policy=None,
+                 endpoint_selector=None):
         warnings.warn(
             'keystoneclient.session.Session is deprecated as of the 2.1.0 '
             'release in favor of keystoneauth1.session.Session. It will be '
@@ -143,10 +807,18 @@ class Session(object):
             DeprecationWarning)
 
         if not session:
+            pool_kwargs = {}
+            if pool_connections is not None:
+                pool_kwargs['pool_connections'] = pool_connections
+            if pool_maxsize is not None:
+                pool_kwargs['pool_maxsize'] = pool_maxsize
+            if pool_block is not None:
+                pool_kwargs['pool_block'] = pool_block
+
             session = requests.Session()
             # Use TCPKeepAliveAdapter to fix bug 1323862
             for scheme in list(session.adapters):
-                session.mount(scheme, TCPKeepAliveAdapter())
+                session.mount(scheme, TCPKeepAliveAdapter(**pool_kwargs))
 
         self.auth = auth
         self.session = session
@@ -155,6 +827,16 @@ class Session(object):
         self.cert = cert
         self.timeout = None
         self.redirect = redirect
+        self._endpoint_cache = _EndpointCache() if cache_endpoints else None
+        self.timing_sinks = list(timing_sinks or [])
+        self.metrics = metrics
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.failover_policy = failover_policy
+        self.endpoint_selector = endpoint_selector
+
+        if metrics:
+            self.timing_sinks.append(metrics.record_request)
 
         if timeout is not None:
             self.timeout = float(timeout)
@@ -221,7 +903,7 @@ class Session(object):
                     part, errors='replace') for part in string_parts]
             logger.debug(' '.join(string_parts))
 
-    def _http_log_response(self, response, logger):
+    def _http_log_response(self, response, logger, stream=False):
         if not logger.isEnabledFor(logging.DEBUG):
             return
 
@@ -232,17 +914,23 @@ class Session(object):
         # unexpected MemoryError. See bug 1616105 for further details.
         content_type = response.headers.get('content-type', None)
 
-        # NOTE(lamt): Per [1], the Content-Type header can be of the form
-        # Content-Type := type "/" subtype *[";" parameter]
-        # [1] https://www.w3.org/Protocols/rfc1341/4_Content-Type.html
-        for log_type in _LOG_CONTENT_TYPES:
-            if content_type is not None and content_type.startswith(log_type):
-                text = _remove_service_catalog(response.text)
-                break
+        if stream:
+            # NOTE: reading the body to log it would load all of it into
+            # memory and leave nothing for the caller to stream.
+            text = 'Omitted, the response is streamed.'
         else:
-            text = ('Omitted, Content-Type is set to %s. Only '
-                    '%s responses have their bodies logged.')
-            text = text % (content_type, ', '.join(_LOG_CONTENT_TYPES))
+            # NOTE(lamt): Per [1], the Content-Type header can be of the form
+            # Content-Type := type "/" subtype *[";" parameter]
+            # [1] https://www.w3.org/Protocols/rfc1341/4_Content-Type.html
+            for log_type in _LOG_CONTENT_TYPES:
+                if (content_type is not None and
+                        content_type.startswith(log_type)):
+                    text = _remove_service_catalog(response.text)
+                    break
+            else:
+                text = ('Omitted, Content-Type is set to %s. Only '
+                        '%s responses have their bodies logged.')
+                text = text % (content_type, ', '.join(_LOG_CONTENT_TYPES))
 
         string_parts = [
             'RESP:',
@@ -260,7 +948,7 @@ class Session(object):
                 endpoint_filter=None, auth=None, requests_auth=None,
                 raise_exc=True, allow_reauth=True, log=True,
                 endpoint_override=None, connect_retries=0, logger=_logger,
-                **kwargs):
+                retry_policy=None, failover_policy=None, **kwargs):
         """Send an HTTP request with the specified characteristics.
 
         Wrapper around `requests.Session.request` to handle tasks such as
@@ -323,6 +1011,15 @@ class Session(object):
                        If not provided the keystoneclient.session default
                        logger will be used.
         :type logger: logging.Logger
+        :param retry_policy: The policy for retrying error responses, instead
+                             of the session's policy. Pass False to not retry.
+                             (optional)
+        :type retry_policy: :py:class:`RetryPolicy`
+        :param failover_policy: The policy for failing over between the
+                                catalog endpoints of the service, instead of
+                                the session's policy. Pass False to only use
+                                the first endpoint. (optional)
+        :type failover_policy: :py:class:`FailoverPolicy`
         :param kwargs: any other parameter that can be passed to
                        requests.Session.request (such as `headers`). Except:
                        'data' will be overwritten by the data in 'json' param.
@@ -334,108 +1031,163 @@ class Session(object):
 
         :returns: The response to the request.
         """
-        headers = kwargs.setdefault('headers', dict())
-
-        if authenticated is None:
-            authenticated = bool(auth or self.auth)
-
-        if authenticated:
-            auth_headers = self.get_auth_headers(auth)
-
-            if auth_headers is None:
-                msg = _('No valid authentication is available')
-                raise exceptions.AuthorizationFailure(msg)
-
-            headers.update(auth_headers)
-
-        if osprofiler_web:
-            headers.update(osprofiler_web.get_trace_id_headers())
-
-        # if we are passed a fully qualified URL and an endpoint_filter we
-        # should ignore the filter. This will make it easier for clients who
-        # want to overrule the default endpoint_filter data added to all client
-        # requests. We check fully qualified here by the presence of a host.
-        if not urllib.parse.urlparse(url).netloc:
-            base_url = None
-
-            if endpoint_override:
-                base_url = endpoint_override
-            elif endpoint_filter:
-                base_url = self.get_endpoint(auth, **endpoint_filter)
-
-            if not base_url:
-                service_type = (endpoint_filter or {}).get('service_type',
-                                                           'unknown')
-                msg = _('Endpoint for %s service') % service_type
-                raise exceptions.EndpointNotFound(msg)
-
-            url = '%s/%s' % (base_url.rstrip('/'), url.lstrip('/'))
-
-        if self.cert:
-            kwargs.setdefault('cert', self.cert)
-
-        if self.timeout is not None:
-            kwargs.setdefault('timeout', self.timeout)
-
-        if user_agent:
-            headers['User-Agent'] = user_agent
-        elif self.user_agent:
-            user_agent = headers.setdefault('User-Agent', self.user_agent)
+        if self.timing_sinks:
+            timing = instrumentation.RequestTiming(
+                method, self.timing_sinks,
+                service_type=(endpoint_filter or {}).get('service_type'))
         else:
-            user_agent = headers.setdefault('User-Agent', USER_AGENT)
-
-        if self.original_ip:
-            headers.setdefault('Forwarded',
-                               'for=%s;by=%s' % (self.original_ip, user_agent))
+            timing = instrumentation.NULL_TIMING
 
-        if json is not None:
-            headers['Content-Type'] = 'application/json'
-            kwargs['data'] = jsonutils.dumps(json)
+        if failover_policy is None:
+            failover_policy = self.failover_policy
 
-        kwargs.setdefault('verify', self.verify)
-
-        if requests_auth:
-            kwargs['auth'] = requests_auth
-
-        if log:
-            self._http_log_request(url, method=method,
-                                   data=kwargs.get('data'),
-                                   headers=headers,
-                                   logger=logger)
-
-        # Force disable requests redirect handling. We will manage this below.
-        kwargs['allow_redirects'] = False
-
-        if redirect is None:
-            redirect = self.redirect
-
-        send = functools.partial(self._send_request,
-                                 url, method, redirect, log, logger,
-                                 connect_retries)
+        if failover_policy and not failover_policy.applies_to(method):
+            failover_policy = None
 
         try:
-            connection_params = self.get_auth_connection_params(auth=auth)
-        except exceptions.MissingAuthPlugin:  # nosec(cjschaef)
-            # NOTE(jamielennox): If we've gotten this far without an auth
-            # plugin then we should be happy with allowing no additional
-            # connection params. This will be the typical case for plugins
-            # anyway.
-            pass
-        else:
-            if connection_params:
-                kwargs.update(connection_params)
+            headers = kwargs.setdefault('headers', dict())
+
+            if authenticated is None:
+                authenticated = bool(auth or self.auth)
+
+            if authenticated:
+                with timing.phase('auth'):
+                    auth_headers = self.get_auth_headers(auth)
+
+                if auth_headers is None:
+                    msg = _('No valid authentication is available')
+                    raise exceptions.AuthorizationFailure(msg)
+
+                headers.update(auth_headers)
+
+            if osprofiler_web:
+                headers.update(osprofiler_web.get_trace_id_headers())
+
+            # if we are passed a fully qualified URL and an endpoint_filter we
+            # should ignore the filter. This will make it easier for clients
+            # who want to overrule the default endpoint_filter data added to
+            # all client requests. We check fully qualified here by the
+            # presence of a host.
+            urls = [url]
+
+            if not urllib.parse.urlparse(url).netloc:
+                base_urls = None
+
+                if endpoint_override:
+                    base_urls = [endpoint_override]
+                elif endpoint_filter and (failover_policy or
+                                          self.endpoint_selector):
+                    with timing.phase('endpoint'):
+                        base_urls = self.get_endpoints(auth,
+                                                       **endpoint_filter)
+
+                    if self.endpoint_selector and len(base_urls) > 1:
+                        base_urls = self.endpoint_selector.order(
+                            base_urls, probe_failed=bool(failover_policy))
+                elif endpoint_filter:
+                    with timing.phase('endpoint'):
+                        base_url = self.get_endpoint(auth, **endpoint_filter)
+                    base_urls = [base_url] if base_url else None
+
+                if not base_urls:
+                    service_type = (endpoint_filter or {}).get('service_type',
+                                                               'unknown')
+                    msg = _('Endpoint for %s service') % service_type
+                    raise exceptions.EndpointNotFound(msg)
+
+                urls = ['%s/%s' % (base_url.rstrip('/'), url.lstrip('/'))
+                        for base_url in base_urls]
+                url = urls[0]
+
+            if self.cert:
+                kwargs.setdefault('cert', self.cert)
+
+            if self.timeout is not None:
+                kwargs.setdefault('timeout', self.timeout)
+
+            if user_agent:
+                headers['User-Agent'] = user_agent
+            elif self.user_agent:
+                user_agent = headers.setdefault('User-Agent', self.user_agent)
+            else:
+                user_agent = headers.setdefault('User-Agent', USER_AGENT)
+
+            if self.original_ip:
+                headers.setdefault('Forwarded',
+                                   'for=%s;by=%s' % (self.original_ip,
+                                                     user_agent))
+
+            if json is not None:
+                headers['Content-Type'] = 'application/json'
+                with timing.phase('serialize'):
+                    kwargs['data'] = jsonutils.dumps(json)
+
+            kwargs.setdefault('verify', self.verify)
+
+            if requests_auth:
+                kwargs['auth'] = requests_auth
+
+            if log:
+                self._http_log_request(url, method=method,
+                                       data=kwargs.get('data'),
+                                       headers=headers,
+                                       logger=logger)
+
+            # Force disable requests redirect handling. We will manage this
+            # below.
+            kwargs['allow_redirects'] = False
+
+            if redirect is None:
+                redirect = self.redirect
+
+            if retry_policy is None:
+                retry_policy = self.retry_policy
+
+            send_one = functools.partial(self._send_request,
+                                         method=method, redirect=redirect,
+                                         log=log, logger=logger,
+                                         connect_retries=connect_retries,
+                                         timing=timing,
+                                         retry_policy=retry_policy,
+                                         failover_policy=failover_policy)
+            send = functools.partial(self._send_to_endpoints, urls, method,
+                                     send_one, failover_policy, timing,
+                                     logger)
 
-        resp = send(**kwargs)
+            try:
+                with timing.phase('auth'):
+                    connection_params = self.get_auth_connection_params(
+                        auth=auth)
+            except exceptions.MissingAuthPlugin:  # nosec(cjschaef)
+                # NOTE(jamielennox): If we've gotten this far without an auth
+                # plugin then we should be happy with allowing no additional
+                # connection params. This will be the typical case for plugins
+                # anyway.
+                pass
+            else:
+                if connection_params:
+                    kwargs.update(connection_params)
+
+            url, resp = send(**kwargs)
 
-        # handle getting a 401 Unauthorized response by invalidating the plugin
-        # and then retrying the request. This is only tried once.
-        if resp.status_code == 401 and authenticated and allow_reauth:
-            if self.invalidate(auth):
-                auth_headers = self.get_auth_headers(auth)
+            # handle getting a 401 Unauthorized response by invalidating the
+            # plugin and then retrying the request. This is only tried once.
+            if resp.status_code == 401 and authenticated and allow_reauth:
+                with timing.phase('reauth'):
+                    if self.invalidate(auth):
+                        auth_headers = self.get_auth_headers(auth)
+                    else:
+                        auth_headers = None
 
                 if auth_headers is not None:
+                    timing.incr('reauths')
                     headers.update(auth_headers)
-                    resp = send(**kwargs)
+                    url, resp = send(phase='reauth', **kwargs)
+        except Exception as e:
+            timing.finish(url, exception=e)
+            raise
+
+        timing.finish(url, response=resp)
 
         if raise_exc and resp.status_code >= 400:
             logger.debug('Request returned failure status: %s',
@@ -444,8 +1196,158 @@ class Session(object):
 
         return resp
 
+    def _send_to_endpoints(self, urls, method, send, failover_policy, timing,
+                           logger, **kwargs):
+        """Send a request to the first of the urls that works.
+
+        :returns: a tuple of the url that was used and the response.
+        """
+        if not failover_policy or len(urls) == 1:
+            return urls[0], send(urls[0], **kwargs)
+
+        hedge_delay = failover_policy.get_hedge_delay(method)
+        if hedge_delay is not None:
+            return self._send_hedged(urls, hedge_delay, send, failover_policy,
+                                     timing, logger, **kwargs)
+
+        for i, url in enumerate(urls):
+            last = i == len(urls) - 1
+            start = timeutils.now()
+
+            try:
+                resp = send(url, **kwargs)
+            except self._FAILOVER_EXCEPTIONS as e:
+                if last:
+                    raise
+
+                logger.info('Failure: %(e)s. Trying the next endpoint.',
+                            {'e': e})
+            else:
+                if last or not failover_policy.should_fail_over(resp):
+                    failover_policy.record_latency(timeutils.now() - start)
+                    return url, resp
+
+                logger.info('Got %(status)s response from %(url)s. Trying '
+                            'the next endpoint.',
+                            {'status': resp.status_code, 'url': url})
+                resp.close()
+
+            timing.incr('failovers')
+
+    def _send_hedged(self, urls, delay, send, failover_policy, timing, logger,
+                     **kwargs):
+        # Each attempt runs in its own thread and reports to the queue. The
+        # next endpoint is tried when an attempt fails, or alongside it when
+        # no attempt has completed within the delay. The first good response
+        # is returned and any that arrive after it are closed.
+        #
+        # Attempts get their own timing and headers so that those still
+        # running after the request returns don't change the request's
+        # timing while it is passed to the sinks, or each other's headers.
+        results = six.moves.queue.Queue()
+        lock = threading.Lock()
+        state = {'done': False}
+        timings = {}
+
+        def attempt(url, attempt_timing):
+            attempt_kwargs = dict(kwargs)
+            if attempt_kwargs.get('headers') is not None:
+                attempt_kwargs['headers'] = attempt_kwargs['headers'].copy()
+
+            start = timeutils.now()
+            try:
+                result = (url, send(url, timing=attempt_timing,
+                                    **attempt_kwargs), None)
+            except Exception as e:
+                result = (url, None, e)
+            else:
+                if not failover_policy.should_fail_over(result[1]):
+                    failover_policy.record_latency(timeutils.now() - start)
+
+            with lock:
+                if not state['done']:
+                    results.put(result)
+                elif result[1] is not None:
+                    result[1].close()
+
+        def start(url):
+            timings[url] = timing.child()
+            thread = threading.Thread(target=attempt,
+                                      args=(url, timings[url]))
+            thread.daemon = True
+            thread.start()
+
+        def finish():
+            with lock:
+                state['done'] = True
+
+            while True:
+                try:
+                    _url, resp, _exc = results.get_nowait()
+                except six.moves.queue.Empty:
+                    return
+                if resp is not None:
+                    resp.close()
+
+        remaining = list(urls)
+        start(remaining.pop(0))
+        pending = 1
+        failed = None
+
+        while pending:
+            try:
+                url, resp, exc = results.get(
+                    timeout=delay if remaining else None)
+            except six.moves.queue.Empty:
+                url = remaining.pop(0)
+                logger.info('No response after %(delay).3fs. Also trying '
+                            '%(url)s.', {'delay': delay, 'url': url})
+                timing.incr('hedges')
+                start(url)
+                pending += 1
+                continue
+
+            pending -= 1
+
+            if exc is None and not failover_policy.should_fail_over(resp):
+                finish()
+                timing.merge(timings[url])
+                if failed and failed[1] is not None:
+                    failed[1].close()
+                return url, resp
+
+            if exc is not None and not isinstance(exc,
+                                                  self._FAILOVER_EXCEPTIONS):
+                finish()
+                timing.merge(timings[url])
+                raise exc
+
+            logger.info('Request to %(url)s failed: %(error)s.',
+                        {'url': url, 'error': exc or resp.status_code})
+
+            # report the last response rather than an exception if all fail
+            if resp is not None or not failed or failed[1] is None:
+                if failed and failed[1] is not None:
+                    failed[1].close()
+                failed = (url, resp, exc)
+
+            if remaining and not pending:
+                timing.incr('failovers')
+                start(remaining.pop(0))
+                pending += 1
+
+        finish()
+        url, resp, exc = failed
+        timing.merge(timings[url])
+        if exc is not None:
+            raise exc
+        return url, resp
+
     def _send_request(self, url, method, redirect, log, logger,
-                      connect_retries, connect_retry_delay=0.5, **kwargs):
+                      connect_retries, connect_retry_delay=0.5,
+                      timing=instrumentation.NULL_TIMING, phase='network',
+                      retry_policy=None, status_retries=0,
+                      failover_policy=None, **kwargs):
         # NOTE(jamielennox): We handle redirection manually because the
         # requests lib follows some browser patterns where it will redirect
         # POSTs as GETs for certain statuses which is not want we want for an
@@ -457,9 +1359,25 @@ class Session(object):
         # could be redirects * retries requests. This will be sufficient in
         # most cases and can be fixed properly if there's ever a need.
 
+        breaker = self.circuit_breaker
+        selector = self.endpoint_selector
+        if breaker or selector:
+            endpoint = urllib.parse.urlparse(url).netloc
+
+        if breaker:
+            try:
+                breaker.before_request(endpoint)
+            except exceptions.CircuitOpen:
+                if self.metrics:
+                    self.metrics.record_circuit_rejected(endpoint)
+                raise
+
+        start = timeutils.now()
+
         try:
             try:
-                resp = self.session.request(method, url, **kwargs)
+                with timing.phase(phase):
+                    resp = self.session.request(method, url, **kwargs)
             except requests.exceptions.SSLError as e:
                 msg = _('SSL exception connecting to %(url)s: '
                         '%(error)s') % {'url': url, 'error': e}
@@ -471,21 +1389,60 @@ class Session(object):
                 msg = _('Unable to establish connection to %s') % url
                 raise exceptions.ConnectionRefused(msg)
         except (exceptions.RequestTimeout, exceptions.ConnectionRefused) as e:
+            if breaker or selector:
+                self._record_endpoint_failure(endpoint)
+
             if connect_retries <= 0:
                 raise
 
             logger.info('Failure: %(e)s. Retrying in %(delay).1fs.',
                         {'e': e, 'delay': connect_retry_delay})
-            time.sleep(connect_retry_delay)
+            timing.incr('retries')
+            with timing.phase('retry_wait'):
+                time.sleep(connect_retry_delay)
 
             return self._send_request(
                 url, method, redirect, log, logger,
                 connect_retries=connect_retries - 1,
                 connect_retry_delay=connect_retry_delay * 2,
-                **kwargs)
+                timing=timing, phase=phase,
+                retry_policy=retry_policy, status_retries=status_retries,
+                failover_policy=failover_policy, **kwargs)
+
+        if (breaker or selector) and (
+                resp.status_code >= 500 or
+                (failover_policy and failover_policy.should_fail_over(resp))):
+            # NOTE: an endpoint that answers with server errors is no
+            # healthier than one that can't be reached.
+            self._record_endpoint_failure(endpoint)
+        else:
+            if breaker:
+                breaker.record_success(endpoint)
+            if selector:
+                selector.record_latency(endpoint, timeutils.now() - start)
 
         if log:
-            self._http_log_response(resp, logger)
+            self._http_log_response(resp, logger,
+                                    stream=kwargs.get('stream', False))
+
+        if (retry_policy and
+                retry_policy.should_retry(method, resp, status_retries)):
+            delay = retry_policy.get_delay(resp, status_retries)
+            logger.info('Got %(status)s response. Retrying in %(delay).1fs.',
+                        {'status': resp.status_code, 'delay': delay})
+            resp.close()
+
+            timing.incr('retries')
+            with timing.phase('retry_wait'):
+                time.sleep(delay)
+
+            return self._send_request(
+                url, method, redirect, log, logger,
+                connect_retries=connect_retries,
+                connect_retry_delay=connect_retry_delay,
+                timing=timing, phase=phase,
+                retry_policy=retry_policy, status_retries=status_retries + 1,
+                failover_policy=failover_policy, **kwargs)
 
         if resp.status_code in self._REDIRECT_STATUSES:
             # be careful here in python True == 1 and False == 0
@@ -506,10 +1463,13 @@ class Session(object):
             else:
                 # NOTE(jamielennox): We don't pass through connect_retry_delay.
                 # This request actually worked so we can reset the delay count.
+                timing.incr('redirects')
                 new_resp = self._send_request(
                     location, method, redirect, log, logger,
                     connect_retries=connect_retries,
-                    **kwargs)
+                    timing=timing, phase='redirect',
+                    retry_policy=retry_policy, status_retries=status_retries,
+                    failover_policy=failover_policy, **kwargs)
 
                 if not isinstance(new_resp.history, list):
                     new_resp.history = list(new_resp.history)
@@ -518,6 +1478,14 @@ class Session(object):
 
         return resp
 
+    def _record_endpoint_failure(self, endpoint):
+        if (self.circuit_breaker and
+                self.circuit_breaker.record_failure(endpoint) and
+                self.metrics):
+            self.metrics.record_circuit_opened(endpoint)
+        if self.endpoint_selector:
+            self.endpoint_selector.record_failure(endpoint)
+
     def head(self, url, **kwargs):
         """Perform a HEAD request.
 
@@ -597,7 +1565,9 @@ class Session(object):
         params = {}
 
         for attr in ('verify', 'cacert', 'cert', 'key', 'insecure',
-                     'timeout', 'session', 'original_ip', 'user_agent'):
+                     'timeout', 'session', 'original_ip', 'user_agent',
+                     'pool_connections', 'pool_maxsize', 'pool_block',
+                     'retry_policy'):
             try:
                 params[attr] = kwargs.pop(attr)
             except KeyError:  # nosec(cjschaef): we are brute force
@@ -700,7 +1670,46 @@ class Session(object):
         """
         msg = _('An auth plugin is required to determine endpoint URL')
         auth = self._auth_required(auth, msg)
-        return auth.get_endpoint(self, **kwargs)
+
+        if self._endpoint_cache is None:
+            return auth.get_endpoint(self, **kwargs)
+
+        return self._endpoint_cache.get_endpoint(self, auth, kwargs)
+
+    def get_endpoints(self, auth=None, **kwargs):
+        """Get all the candidate endpoints provided by the auth plugin.
+
+        :param auth: The auth plugin to use for token. Overrides the plugin on
+                     the session. (optional)
+        :type auth: :py:class:`keystoneclient.auth.base.BaseAuthPlugin`
+
+        :raises keystoneclient.exceptions.MissingAuthPlugin: if a plugin is not
+                                                             available.
+
+        :returns: A list of endpoints in order of preference, empty if none
+                  are available.
+        :rtype: list
+        """
+        msg = _('An auth plugin is required to determine endpoint URL')
+        auth = self._auth_required(auth, msg)
+
+        if self._endpoint_cache is None:
+            return _get_plugin_endpoints(auth, self, **kwargs)
+
+        return self._endpoint_cache.get_endpoint(self, auth, kwargs,
+                                                 multiple=True)
+
+    def get_endpoint_cache_stats(self):
+        """Return the counters of the resolved endpoint cache.
+
+        :returns: a dict with ``hits``, ``misses`` and ``size`` keys or None
+                  if endpoint caching is disabled on this session.
+        :rtype: dict
+        """
+        if self._endpoint_cache is None:
+            return None
+
+        return self._endpoint_cache.stats()
 
     def get_auth_connection_params(self, auth=None, **kwargs):
         """Return auth connection params as provided by the auth plugin.
@@ -766,6 +1775,10 @@ class Session(object):
         """
         msg = _('An auth plugin is required to validate')
         auth = self._auth_required(auth, msg)
+
+        if self._endpoint_cache is not None:
+            self._endpoint_cache.clear(auth)
+
         return auth.invalidate()
 
     def get_user_id(self, auth=None):
@@ -817,6 +1830,14 @@ class Session(object):
             :keyfile: The key for the client certificate.
             :insecure: Whether to ignore SSL verification.
             :timeout: The max time to wait for HTTP connections.
+            :pool_connections: The number of hosts to keep connections for.
+            :pool_maxsize: The maximum number of idle connections per host.
+            :pool_block: Whether to wait for a free connection when the pool
+                         is exhausted.
+            :status_code_retries: How many times to retry an error response.
+            :retriable_status_codes: The status codes of responses to retry.
+            :status_code_retry_delay: The delay before the first retry.
+            :status_code_max_retry_delay: The longest delay before a retry.
 
         :param dict deprecated_opts: Deprecated options that should be included
              in the definition of new options. This should be a dict from the
@@ -851,6 +1872,55 @@ class Session(object):
                 cfg.IntOpt('timeout',
                            deprecated_opts=deprecated_opts.get('timeout'),
                            help='Timeout value for http requests'),
+                cfg.IntOpt('pool_connections',
+                           min=1,
+                           deprecated_opts=deprecated_opts.get(
+                               'pool_connections'),
+                           help='Number of hosts to keep HTTP connection '
+                                'pools for.'),
+                cfg.IntOpt('pool_maxsize',
+                           min=1,
+                           deprecated_opts=deprecated_opts.get(
+                               'pool_maxsize'),
+                           help='Maximum number of idle HTTP connections to '
+                                'keep per host. Set this to at least the '
+                                'number of threads sharing the session.'),
+                cfg.BoolOpt('pool_block',
+                            default=False,
+                            deprecated_opts=deprecated_opts.get('pool_block'),
+                            help='Wait for a free connection rather than '
+                                 'opening a new one when a host\'s pool is '
+                                 'exhausted.'),
+                cfg.IntOpt('status_code_retries',
+                           default=0,
+                           min=0,
+                           deprecated_opts=deprecated_opts.get(
+                               'status_code_retries'),
+                           help='How many times to retry idempotent requests '
+                                'that receive one of the '
+                                'retriable_status_codes. 0 disables '
+                                'retrying.'),
+                cfg.ListOpt('retriable_status_codes',
+                            item_type=types.Integer(min=100, max=599),
+                            default=list(RetryPolicy.DEFAULT_STATUS_CODES),
+                            deprecated_opts=deprecated_opts.get(
+                                'retriable_status_codes'),
+                            help='The response status codes to retry.'),
+                cfg.FloatOpt('status_code_retry_delay',
+                             default=0.5,
+                             min=0,
+                             deprecated_opts=deprecated_opts.get(
+                                 'status_code_retry_delay'),
+                             help='Seconds to wait before the first retry. '
+                                  'The delay doubles for each further retry '
+                                  'unless the response has a Retry-After '
+                                  'header.'),
+                cfg.FloatOpt('status_code_max_retry_delay',
+                             default=60,
+                             min=0,
+                             deprecated_opts=deprecated_opts.get(
+                                 'status_code_max_retry_delay'),
+                             help='The longest to wait before a retry.'),
                 ]
 
     @classmethod
@@ -863,6 +1933,14 @@ class Session(object):
             :keyfile: The key for the client certificate.
             :insecure: Whether to ignore SSL verification.
             :timeout: The max time to wait for HTTP connections.
+            :pool_connections: The number of hosts to keep connections for.
+            :pool_maxsize: The maximum number of idle connections per host.
+            :pool_block: Whether to wait for a free connection when the pool
+                         is exhausted.
+            :status_code_retries: How many times to retry an error response.
+            :retriable_status_codes: The status codes of responses to retry.
+            :status_code_retry_delay: The delay before the first retry.
+            :status_code_max_retry_delay: The longest delay before a retry.
 
         :param oslo_config.Cfg conf: config object to register with.
         :param string group: The ini group to register options in.
@@ -905,6 +1983,16 @@ class Session(object):
         if c.certfile and c.keyfile:
             kwargs['cert'] = (c.certfile, c.keyfile)
         kwargs['timeout'] = c.timeout
+        kwargs['pool_connections'] = c.pool_connections
+        kwargs['pool_maxsize'] = c.pool_maxsize
+        kwargs['pool_block'] = c.pool_block
+
+        if c.status_code_retries:
+            kwargs['retry_policy'] = RetryPolicy(
+                retries=c.status_code_retries,
+                status_codes=c.retriable_status_codes,
+                backoff_factor=c.status_code_retry_delay,
+                max_backoff=c.status_code_max_retry_delay)
 
         return cls._make(**kwargs)
 
@@ -946,6 +2034,52 @@ class Session(object):
                             metavar='<seconds>',
                             help='Set request timeout (in seconds).')
 
+        parser.add_argument('--pool-connections',
+                            type=_positive_non_zero_int,
+                            metavar='<count>',
+                            help='Number of hosts to keep HTTP connection '
+                                 'pools for.')
+
+        parser.add_argument('--pool-maxsize',
+                            type=_positive_non_zero_int,
+                            metavar='<count>',
+                            help='Maximum number of idle HTTP connections to '
+                                 'keep per host.')
+
+        parser.add_argument('--pool-block',
+                            default=False,
+                            action='store_true',
+                            help='Wait for a free connection rather than '
+                                 'opening a new one when a host\'s pool is '
+                                 'exhausted.')
+
+        parser.add_argument('--status-code-retries',
+                            default=0,
+                            type=_non_negative_int,
+                            metavar='<count>',
+                            help='How many times to retry idempotent requests '
+                                 'that receive an overloaded or unavailable '
+                                 'response.')
+
+        parser.add_argument('--retriable-status-codes',
+                            default=list(RetryPolicy.DEFAULT_STATUS_CODES),
+                            type=_status_code_list,
+                            metavar='<codes>',
+                            help='Comma separated list of the response status '
+                                 'codes to retry.')
+
+        parser.add_argument('--status-code-retry-delay',
+                            default=0.5,
+                            type=_non_negative_float,
+                            metavar='<seconds>',
+                            help='Seconds to wait before the first retry.')
+
+        parser.add_argument('--status-code-max-retry-delay',
+                            default=60,
+                            type=_non_negative_float,
+                            metavar='<seconds>',
+                            help='The longest to wait before a retry.')
+
     @classmethod
     def load_from_cli_options(cls, args, **kwargs):
         """Create a :py:class:`.Session` object from CLI arguments.
@@ -963,6 +2097,16 @@ class Session(object):
         if args.os_cert and args.os_key:
             kwargs['cert'] = (args.os_cert, args.os_key)
         kwargs['timeout'] = args.timeout
+        kwargs['pool_connections'] = args.pool_connections
+        kwargs['pool_maxsize'] = args.pool_maxsize
+        kwargs['pool_block'] = args.pool_block
+
+        if args.status_code_retries:
+            kwargs['retry_policy'] = RetryPolicy(
+                retries=args.status_code_retries,
+                status_codes=args.retriable_status_codes,
+                backoff_factor=args.status_code_retry_delay,
+                max_backoff=args.status_code_max_retry_delay)
 
         return cls._make(**kwargs)
 
@@ -12,11 +12,13 @@
 
 import abc
 import datetime
+import time
 import uuid
 
 from keystoneauth1 import fixture
 from keystoneauth1 import plugin
 import mock
+from oslo_utils import fixture as oslo_fixture
 from oslo_utils import timeutils
 import six
 
@@ -24,6 +26,7 @@ from keystoneclient import access
 from keystoneclient.auth import base
 from keystoneclient.auth import identity
 from keystoneclient import exceptions
+from keystoneclient import metrics
 from keystoneclient import session
 from keystoneclient.tests.unit import utils
 
@@ -196,6 +199,27 @@ class CommonIdentityTests(object):
 
         self.assertEqual(self.TEST_URL, auth_url)
 
+    def test_get_endpoints(self):
+        self.stub_url('GET', [],
+                      base_url=self.TEST_COMPUTE_ADMIN,
+                      json=self.TEST_DISCOVERY)
+
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a)
+
+        self.assertEqual([self.TEST_COMPUTE_ADMIN],
+                         a.get_endpoints(s, service_type='compute',
+                                         interface='admin'))
+        self.assertEqual([self.TEST_URL],
+                         a.get_endpoints(s, service_type='compute',
+                                         interface='admin',
+                                         version=self.version))
+        self.assertEqual([self.TEST_URL],
+                         a.get_endpoints(s, service_type='compute',
+                                         interface=plugin.AUTH_INTERFACE))
+        self.assertEqual([], a.get_endpoints(s, service_type='image'))
+        self.assertEqual([], a.get_endpoints(s))
+
     def _create_expired_auth_plugin(self, **kwargs):
         expires = timeutils.utcnow() - datetime.timedelta(minutes=20)
         expired_token = self.get_auth_data(expires=expires)
@@ -221,6 +245,123 @@ class CommonIdentityTests(object):
         s = session.Session(auth=a)
         self.assertIs(expired_auth_ref, a.get_access(s))
 
+    def test_get_access_fast_path(self):
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a)
+
+        auth_ref = a.get_access(s)
+
+        a._lock = mock.MagicMock()
+        self.assertIs(auth_ref, a.get_access(s))
+        self.assertFalse(a._lock.__enter__.called)
+
+        # assigning a new auth_ref must not serve the old snapshot
+        a.auth_ref = access.AccessInfo.factory(body=self.get_auth_data())
+        self.assertIs(a.auth_ref, a.get_access(s))
+        self.assertTrue(a._lock.__enter__.called)
+
+    def test_get_access_fast_path_expiring(self):
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a)
+
+        auth_ref = a.get_access(s)
+        soon = timeutils.normalize_time(auth_ref.expires) - datetime.timedelta(
+            seconds=a.MIN_TOKEN_LIFE_SECONDS - 1)
+        self.useFixture(oslo_fixture.TimeFixture(soon))
+
+        self.assertIsNot(auth_ref, a.get_access(s))
+
+    def test_background_refresh_delay(self):
+        now = timeutils.utcnow()
+        self.useFixture(oslo_fixture.TimeFixture(now))
+
+        self.stub_auth_data(issued=now,
+                            expires=now + datetime.timedelta(hours=1))
+        a = self.create_auth_plugin()
+        auth_ref = a.get_access(session.Session())
+
+        self.assertAlmostEqual(
+            1800, a._get_background_refresh_delay(auth_ref, 0.5), delta=1)
+        # never refresh later than a request would
+        self.assertAlmostEqual(
+            3600 - a.MIN_TOKEN_LIFE_SECONDS,
+            a._get_background_refresh_delay(auth_ref, 0.99), delta=1)
+
+    def _wait_for(self, predicate):
+        for _ in range(500):
+            if predicate():
+                return
+            time.sleep(0.01)
+        self.fail('Timed out waiting for background refresh')
+
+    def test_background_refresh(self):
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a)
+        auth_ref = a.get_access(s)
+
+        with mock.patch.object(a, '_get_background_refresh_delay',
+                               return_value=0.01):
+            self.assertTrue(a.start_background_refresh(s))
+            self.addCleanup(a.stop_background_refresh)
+            self.assertFalse(a.start_background_refresh(s))
+
+            self._wait_for(lambda: a.auth_ref is not auth_ref)
+
+        a.stop_background_refresh()
+        self.assertIs(a.auth_ref, a.get_access(s))
+
+    def test_background_refresh_failure(self):
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a)
+        auth_ref = a.get_access(s)
+        a.MIN_BACKGROUND_REFRESH_SECONDS = 0.01
+
+        new_auth_ref = access.AccessInfo.factory(body=self.get_auth_data())
+        get_auth_ref = mock.Mock(side_effect=[exceptions.ConnectionRefused(),
+                                              new_auth_ref])
+
+        with mock.patch.object(a, '_get_background_refresh_delay',
+                               return_value=0.01):
+            with mock.patch.object(a, 'get_auth_ref', get_auth_ref):
+                a.start_background_refresh(s)
+                self.addCleanup(a.stop_background_refresh)
+
+                self._wait_for(lambda: a.auth_ref is new_auth_ref)
+
+        self.assertIsNot(auth_ref, a.auth_ref)
+
+    def test_background_refresh_retry_waits(self):
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a)
+        a.get_access(s)
+
+        new_auth_ref = access.AccessInfo.factory(body=self.get_auth_data())
+        get_auth_ref = mock.Mock(side_effect=[exceptions.ConnectionRefused(),
+                                              new_auth_ref])
+        # stop once the refresh after the failure is waited for
+        stop = mock.Mock()
+        stop.wait.side_effect = [False, False, False, False, True]
+
+        with mock.patch.object(a, '_get_background_refresh_delay',
+                               return_value=100):
+            with mock.patch.object(a, 'get_auth_ref', get_auth_ref):
+                a._background_refresh(s, 0.5, stop)
+
+        # the retry follows the backoff without waiting for the token again
+        self.assertEqual(
+            [mock.call(0), mock.call(100),
+             mock.call(a.MIN_BACKGROUND_REFRESH_SECONDS),
+             mock.call(0), mock.call(100)],
+            stop.wait.call_args_list)
+        self.assertIs(new_auth_ref, a.auth_ref)
+
+    def test_background_refresh_not_reauthenticating(self):
+        a = self.create_auth_plugin(reauthenticate=False)
+        s = session.Session(auth=a)
+
+        self.assertFalse(a.start_background_refresh(s))
+        self.assertRaises(ValueError, a.start_background_refresh, s, 1.5)
+
     def test_invalidate(self):
         a = self.create_auth_plugin()
         s = session.Session(auth=a)
@@ -233,6 +374,84 @@ class CommonIdentityTests(object):
         self.assertIsNone(a.auth_ref)
         self.assertFalse(a.invalidate())
 
+    def test_endpoint_cache(self):
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a)
+        endpoint_filter = {'service_type': 'compute', 'interface': 'admin'}
+
+        with mock.patch.object(a, 'get_endpoint',
+                               wraps=a.get_endpoint) as m:
+            for _ in range(3):
+                self.assertEqual(self.TEST_COMPUTE_ADMIN,
+                                 s.get_endpoint(**endpoint_filter))
+
+        self.assertEqual(1, m.call_count)
+        self.assertEqual({'hits': 2, 'misses': 1, 'size': 1},
+                         s.get_endpoint_cache_stats())
+
+    def test_endpoint_cache_dropped_on_reauthentication(self):
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a)
+        endpoint_filter = {'service_type': 'compute', 'interface': 'public'}
+
+        s.get_endpoint(**endpoint_filter)
+        self.assertTrue(s.invalidate())
+        self.assertEqual(0, s.get_endpoint_cache_stats()['size'])
+
+        s.get_endpoint(**endpoint_filter)
+
+        # a new token was fetched without going through the session
+        a.auth_ref = None
+        self.assertEqual(self.TEST_COMPUTE_PUBLIC,
+                         s.get_endpoint(**endpoint_filter))
+
+        stats = s.get_endpoint_cache_stats()
+        self.assertEqual(0, stats['hits'])
+        self.assertEqual(3, stats['misses'])
+
+    def test_endpoint_cache_disabled(self):
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a, cache_endpoints=False)
+
+        self.assertEqual(self.TEST_COMPUTE_PUBLIC,
+                         s.get_endpoint(service_type='compute'))
+        self.assertIsNone(s.get_endpoint_cache_stats())
+
+    def test_metrics(self):
+        self.requests_mock.get(self.TEST_COMPUTE_ADMIN,
+                               json=self.TEST_DISCOVERY)
+        self.stub_url('GET', ['path'], text='SUCCESS')
+
+        client_metrics = metrics.ClientMetrics()
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a, metrics=client_metrics)
+        endpoint_filter = {'service_type': 'compute',
+                           'interface': 'admin',
+                           'version': self.version}
+
+        for _ in range(2):
+            s.get('/path', endpoint_filter=endpoint_filter)
+
+        # the second request used the endpoint cache, look up directly
+        a.get_discovery(s, self.TEST_COMPUTE_ADMIN)
+
+        # move to just before the token expires so it is refreshed
+        soon = timeutils.normalize_time(a.auth_ref.expires) - (
+            datetime.timedelta(seconds=a.MIN_TOKEN_LIFE_SECONDS - 1))
+        self.useFixture(oslo_fixture.TimeFixture(soon))
+        s.get_auth_headers()
+
+        plugin = type(a).__name__
+        self.assertEqual(1, client_metrics.token_fetches.get(plugin=plugin))
+        self.assertEqual(1, client_metrics.token_refreshes.get(plugin=plugin))
+        self.assertEqual(1, client_metrics.discovery_cache.get(result='miss'))
+        self.assertEqual(1, client_metrics.discovery_cache.get(result='hit'))
+        self.assertEqual(1, client_metrics.catalog_lookups.get(result='miss'))
+        self.assertEqual(1, client_metrics.catalog_lookups.get(result='hit'))
+        self.assertEqual(2, client_metrics.requests.get(service_type='compute',
+                                                        method='GET',
+                                                        status=200))
+
     def test_get_auth_properties(self):
         a = self.create_auth_plugin()
         s = session.Session()
@@ -269,6 +488,45 @@ class V3(CommonIdentityTests, utils.TestCase):
         kwargs.setdefault('headers', {})['X-Subject-Token'] = subject_token
         self.stub_url('POST', ['auth', 'tokens'], **kwargs)
 
+    def test_get_endpoints_from_catalog(self):
+        az1 = 'http://swift-az1:8080/v1'
+        az2 = 'http://swift-az2:8080/v1'
+
+        token = self.get_auth_data()
+        svc = token.add_service('object-store')
+        svc.add_standard_endpoints(public=az1, region='RegionOne')
+        svc.add_standard_endpoints(public=az2, region='RegionOne')
+        self.stub_auth(json=token)
+
+        self.requests_mock.get(az1 + '/path', status_code=503)
+        self.requests_mock.get(az2 + '/path', text='SUCCESS')
+
+        s = session.Session(auth=self.create_auth_plugin(),
+                            failover_policy=session.FailoverPolicy())
+
+        self.assertEqual([az1, az2],
+                         s.get_endpoints(service_type='object-store'))
+        resp = s.get('/path', endpoint_filter={'service_type': 'object-store'})
+        self.assertEqual('SUCCESS', resp.text)
+
+    def test_get_endpoints_single_region(self):
+        one = ['http://swift-one-az1:8080/v1', 'http://swift-one-az2:8080/v1']
+        two = ['http://swift-two-az1:8080/v1']
+
+        token = self.get_auth_data()
+        svc = token.add_service('object-store')
+        svc.add_standard_endpoints(public=one[0], region='RegionOne')
+        svc.add_standard_endpoints(public=two[0], region='RegionTwo')
+        svc.add_standard_endpoints(public=one[1], region='RegionOne')
+        self.stub_auth(json=token)
+
+        a = self.create_auth_plugin()
+        s = session.Session(auth=a)
+
+        self.assertEqual(one, a.get_endpoints(s, service_type='object-store'))
+        self.assertEqual(two, a.get_endpoints(s, service_type='object-store',
+                                              region_name='RegionTwo'))
+
     def create_auth_plugin(self, **kwargs):
         kwargs.setdefault('auth_url', self.TEST_URL)
         kwargs.setdefault('username', self.TEST_USER)
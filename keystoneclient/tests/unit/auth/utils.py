@@ -19,6 +19,7 @@ from oslo_config import cfg
 
 from keystoneclient import access
 from keystoneclient.auth import base
+from keystoneclient import discovery_cache
 from keystoneclient import exceptions
 from keystoneclient import session
 from keystoneclient.tests.unit import utils
@@ -179,6 +180,39 @@ class GenericPluginTestCase(utils.TestCase):
         self.stub_discovery(v2=False, v3=False)
         self.assertDiscoveryFailure()
 
+    def test_discovery_cache_shared(self):
+        cache = discovery_cache.enable()
+        self.addCleanup(discovery_cache.disable)
+        self.stub_discovery()
+
+        self.assertCreateV2()
+        self.session = session.Session()
+        self.assertCreateV2()
+
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1}, cache.stats())
+
+    def test_discovery_failure_cached(self):
+        discovery_cache.enable()
+        self.addCleanup(discovery_cache.disable)
+        url = self.TEST_URL + 'v3'
+        disc = self.requests_mock.get(url, status_code=500)
+
+        self.assertCreateV3(auth_url=url)
+        self.assertCreateV3(auth_url=url)
+        self.assertEqual(1, disc.call_count)
+
+        discovery_cache.invalidate(url)
+        self.assertCreateV3(auth_url=url)
+        self.assertEqual(2, disc.call_count)
+
+    def test_unusable_discovery_not_cached(self):
+        cache = discovery_cache.enable()
+        self.addCleanup(discovery_cache.disable)
+        self.stub_discovery(v2=False, v3=False)
+
+        self.assertDiscoveryFailure()
+        self.assertEqual(0, len(cache))
+
     def test_path_based_url_v2(self):
         self.stub_url('GET', ['v2.0'], status_code=403)
         self.assertCreateV2(auth_url=self.TEST_URL + 'v2.0')
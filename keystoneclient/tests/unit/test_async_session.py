@@ -0,0 +1,315 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import socket
+import threading
+import uuid
+
+from oslo_serialization import jsonutils
+from oslo_utils import importutils
+from six.moves import BaseHTTPServer
+import testtools
+
+from keystoneclient.auth import token_endpoint
+from keystoneclient import exceptions
+from keystoneclient import session as client_session
+from keystoneclient.tests.unit import utils
+from keystoneclient.v3 import projects
+from keystoneclient.v3 import users
+
+aiohttp = importutils.try_import('aiohttp')
+if aiohttp:
+    # aiohttp is only available on python 3 and the module uses its syntax
+    import asyncio
+
+    from keystoneclient import async_session
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        self.server.requests.append((self.command, self.path,
+                                     dict(self.headers), body))
+
+        try:
+            status, headers, text = self.server.routes[(self.command,
+                                                        self.path)]
+        except KeyError:
+            status, headers, text = 404, {}, ''
+
+        content = text.encode('utf-8')
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if 'Content-Length' not in headers:
+            self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+class _ServerTestCase(utils.TestCase):
+
+    def setUp(self):
+        super(_ServerTestCase, self).setUp()
+        self.deprecations.expect_deprecations()
+
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.routes = {}
+        self.server.requests = []
+        thread = threading.Thread(target=self.server.serve_forever,
+                                  kwargs={'poll_interval': 0.01})
+        thread.daemon = True
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.endpoint = 'http://127.0.0.1:%d/v3' % self.server.server_port
+        self.token = uuid.uuid4().hex
+
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+        auth = token_endpoint.Token(self.endpoint, self.token)
+        self.session = async_session.AsyncSession(
+            client_session.Session(auth=auth))
+        self.addCleanup(self.wait, self.session.close())
+
+    def wait(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def stub(self, method, path, status=200, json=None, text='',
+             headers=None):
+        headers = dict(headers or {})
+        if json is not None:
+            headers['Content-Type'] = 'application/json'
+            text = jsonutils.dumps(json)
+        self.server.routes[(method, '/v3' + path)] = (status, headers, text)
+
+
+@testtools.skipUnless(aiohttp, 'aiohttp is not available')
+class AsyncSessionTests(_ServerTestCase):
+
+    def test_get(self):
+        self.stub('GET', '/users', text='response')
+
+        resp = self.wait(self.session.get(self.endpoint + '/users'))
+
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual('response', resp.text)
+        method, path, headers, body = self.server.requests[-1]
+        self.assertEqual('GET', method)
+        self.assertEqual(self.token, headers['X-Auth-Token'])
+        self.assertEqual(client_session.USER_AGENT, headers['User-Agent'])
+
+    def test_post_json(self):
+        self.stub('POST', '/users', status=201, json={'user': {'id': 'u'}})
+
+        resp = self.wait(self.session.post(self.endpoint + '/users',
+                                           json={'user': {'name': 'n'}}))
+
+        self.assertEqual({'user': {'id': 'u'}}, resp.json())
+        method, path, headers, body = self.server.requests[-1]
+        self.assertEqual('application/json', headers['Content-Type'])
+        self.assertEqual({'user': {'name': 'n'}}, jsonutils.loads(body))
+
+    def test_not_authenticated(self):
+        self.stub('GET', '/', text='response')
+
+        self.wait(self.session.get(self.endpoint + '/', authenticated=False))
+
+        self.assertNotIn('X-Auth-Token', self.server.requests[-1][2])
+
+    def test_error_raises(self):
+        self.stub('GET', '/users', status=404,
+                  json={'error': {'message': 'not here'}})
+
+        self.assertRaises(exceptions.NotFound, self.wait,
+                          self.session.get(self.endpoint + '/users'))
+
+    def test_error_not_raised(self):
+        self.stub('GET', '/users', status=500)
+
+        resp = self.wait(self.session.get(self.endpoint + '/users',
+                                          raise_exc=False))
+
+        self.assertEqual(500, resp.status_code)
+
+    def test_redirect(self):
+        self.stub('GET', '/old', status=305,
+                  headers={'Location': self.endpoint + '/new'})
+        self.stub('GET', '/new', text='moved')
+
+        resp = self.wait(self.session.get(self.endpoint + '/old'))
+
+        self.assertEqual('moved', resp.text)
+        self.assertEqual([305], [r.status_code for r in resp.history])
+
+    def test_no_redirect(self):
+        self.stub('GET', '/old', status=305,
+                  headers={'Location': self.endpoint + '/new'})
+
+        resp = self.wait(self.session.get(self.endpoint + '/old',
+                                          redirect=False))
+
+        self.assertEqual(305, resp.status_code)
+
+    def test_reauthenticates_on_401(self):
+        tokens = [uuid.uuid4().hex, uuid.uuid4().hex]
+
+        class Plugin(token_endpoint.Token):
+
+            def get_token(self, session):
+                return tokens[0]
+
+            def invalidate(self):
+                tokens.pop(0)
+                return True
+
+        session = async_session.AsyncSession(
+            client_session.Session(auth=Plugin(self.endpoint, None)))
+        self.addCleanup(self.wait, session.close())
+        self.stub('GET', '/users', status=401)
+        first, second = tokens
+
+        self.assertRaises(exceptions.Unauthorized, self.wait,
+                          session.get(self.endpoint + '/users'))
+
+        self.assertEqual([first, second],
+                         [r[2]['X-Auth-Token'] for r in self.server.requests])
+
+    def test_connection_refused(self):
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+
+        self.assertRaises(exceptions.ConnectionRefused, self.wait,
+                          self.session.get('http://127.0.0.1:%d/' % port,
+                                           authenticated=False))
+
+    def test_truncated_response(self):
+        # the connection is closed before the promised body is sent
+        self.stub('GET', '/users', text='{"users"',
+                  headers={'Content-Length': '100'})
+
+        self.assertRaises(exceptions.ConnectionError, self.wait,
+                          self.session.get(self.endpoint + '/users',
+                                           authenticated=False))
+
+    def test_adapter_endpoint_filter(self):
+        self.stub('GET', '/users', json={'users': []})
+        adap = async_session.AsyncLegacyJsonAdapter(self.session,
+                                                    service_type='identity')
+
+        resp, body = self.wait(adap.get('/users'))
+
+        self.assertEqual({'users': []}, body)
+        self.assertEqual('application/json',
+                         self.server.requests[-1][2]['Accept'])
+
+    def test_adapter_endpoint_override(self):
+        self.stub('GET', '/users', text='response')
+        session = async_session.AsyncSession(client_session.Session())
+        self.addCleanup(self.wait, session.close())
+        adap = async_session.AsyncAdapter(session, service_type='identity',
+                                          endpoint_override=self.endpoint)
+
+        resp = self.wait(adap.get('/users'))
+
+        self.assertEqual('response', resp.text)
+        self.assertNotIn('X-Auth-Token', self.server.requests[-1][2])
+
+
+@testtools.skipUnless(aiohttp, 'aiohttp is not available')
+class AsyncManagerTests(_ServerTestCase):
+
+    def setUp(self):
+        super(AsyncManagerTests, self).setUp()
+        self.manager = users.UserManager(None)
+        self.users = async_session.AsyncManager(
+            self.manager,
+            async_session.AsyncLegacyJsonAdapter(self.session,
+                                                 service_type='identity'))
+
+    def test_list(self):
+        self.stub('GET', '/users?domain_id=default',
+                  json={'users': [{'id': 'a'}, {'id': 'b'}]})
+
+        objs = self.wait(self.users.list(domain='default'))
+
+        self.assertEqual(['a', 'b'], [u.id for u in objs])
+        self.assertIs(self.manager, objs[0].manager)
+        self.assertIsInstance(objs[0], users.User)
+
+    def test_list_group(self):
+        self.stub('GET', '/groups/g/users', json={'users': [{'id': 'a'}]})
+
+        objs = self.wait(self.users.list(group='g'))
+
+        self.assertEqual(['a'], [u.id for u in objs])
+        self.assertEqual(('GET', '/v3/groups/g/users'),
+                         self.server.requests[-1][:2])
+
+    def test_list_projects_of_user(self):
+        self.stub('GET', '/users/u/projects',
+                  json={'projects': [{'id': 'p'}]})
+        project_manager = async_session.AsyncManager(
+            projects.ProjectManager(None),
+            async_session.AsyncLegacyJsonAdapter(self.session,
+                                                 service_type='identity'))
+
+        objs = self.wait(project_manager.list(user='u'))
+
+        self.assertEqual(['p'], [p.id for p in objs])
+        self.assertEqual(('GET', '/v3/users/u/projects'),
+                         self.server.requests[-1][:2])
+
+    def test_list_unsupported_option(self):
+        self.assertRaises(TypeError, self.wait,
+                          self.users.list(paginate=True))
+
+    def test_get(self):
+        self.stub('GET', '/users/a', json={'user': {'id': 'a', 'name': 'n'}})
+
+        user = self.wait(self.users.get(user_id='a'))
+
+        self.assertEqual('n', user.name)
+
+    def test_get_unexpected_argument(self):
+        self.assertRaises(TypeError, self.wait,
+                          self.users.get(user_id='a', domain_id='d'))
+
+    def test_create(self):
+        self.stub('POST', '/users', status=201,
+                  json={'user': {'id': 'a', 'name': 'n'}})
+
+        user = self.wait(self.users.create(name='n'))
+
+        self.assertEqual('a', user.id)
+        self.assertEqual({'user': {'name': 'n'}},
+                         jsonutils.loads(self.server.requests[-1][3]))
+
+    def test_delete(self):
+        self.stub('DELETE', '/users/a', status=204)
+
+        resp, body = self.wait(self.users.delete(user_id='a'))
+
+        self.assertEqual(204, resp.status_code)
+        self.assertEqual(('DELETE', '/v3/users/a'),
+                         self.server.requests[-1][:2])
@@ -12,10 +12,13 @@
 #    under the License.
 
 import fixtures
+from keystoneauth1 import exceptions as ksa_exceptions
 from keystoneauth1.identity import v2
 from keystoneauth1 import session
+from oslo_utils import fixture as oslo_fixture
 
 from keystoneclient import base
+from keystoneclient import exceptions as ksc_exceptions
 from keystoneclient.tests.unit import utils
 from keystoneclient.v2_0 import client
 from keystoneclient.v2_0 import roles
@@ -107,6 +110,189 @@ class BaseTest(utils.TestCase):
         self.assertEqual(r.to_dict(), r_dict)
 
 
+class CompactResourceTest(utils.TestCase):
+
+    def setUp(self):
+        super(CompactResourceTest, self).setUp()
+        self.compact_role = base.compact_resource_class(roles.Role)
+
+    def test_class(self):
+        self.assertIs(self.compact_role,
+                      base.compact_resource_class(roles.Role))
+        self.assertEqual('Role', self.compact_role.__name__)
+        self.assertTrue(issubclass(self.compact_role, base.CompactResource))
+
+        human = base.compact_resource_class(HumanReadable)
+        r = human(None, {"name": "1 of !"})
+        self.assertEqual(r.human_id, "1-of")
+
+    def test_attributes(self):
+        info = {'id': 1, 'name': 'Member', u"тест": u"привет мир"}
+        r = self.compact_role(None, info)
+
+        self.assertEqual('Member', r.name)
+        self.assertEqual(u"привет мир", getattr(r, u"тест"))
+        self.assertRaises(AttributeError, getattr, r, 'blahblah')
+        self.assertRaises(AttributeError, setattr, r, 'name', 'other')
+        self.assertFalse(hasattr(r, '__dict__'))
+        self.assertEqual(1, base.getid(r))
+        self.assertTrue(r.is_loaded())
+        self.assertIn('name', dir(r))
+        self.assertEqual("<Role id=1, name=Member, %s=%s>" % (
+            u"тест", u"привет мир"), repr(r))
+
+    def test_to_dict_copies(self):
+        info = {'id': 1, 'options': {'tags': ['a']}}
+        r = self.compact_role(None, info)
+
+        d = r.to_dict()
+        self.assertEqual(info, d)
+        d['options']['tags'].append('b')
+        self.assertEqual(['a'], r.options['tags'])
+
+    def test_eq(self):
+        info = {'id': 1, 'name': 'hi'}
+        r = self.compact_role(None, info)
+
+        self.assertEqual(self.compact_role(None, dict(info)), r)
+        self.assertEqual(roles.Role(None, dict(info)), r)
+        self.assertEqual(r, roles.Role(None, dict(info)))
+        self.assertNotEqual(self.compact_role(None, {'id': 1}), r)
+        self.assertNotEqual(base.Resource(None, dict(info)), r)
+        self.assertNotEqual(info, r)
+
+
+class FindManager(base.ManagerWithFind):
+    resource_class = base.Resource
+    list_filters = {'domain_id': 'domain'}
+
+    def __init__(self, infos):
+        super(FindManager, self).__init__(None)
+        self.infos = infos
+        self.calls = []
+        self.listed = 0
+
+    def list(self, **kwargs):
+        self.calls.append(kwargs)
+        for info in self.infos:
+            if 'domain' in kwargs and info['domain_id'] != kwargs['domain']:
+                continue
+            self.listed += 1
+            yield base.Resource(self, info, loaded=True)
+
+
+class ManagerWithFindTest(utils.TestCase):
+
+    def setUp(self):
+        super(ManagerWithFindTest, self).setUp()
+        self.manager = FindManager([
+            {'id': 1, 'name': 'a', 'domain_id': 'x'},
+            {'id': 2, 'name': 'a', 'domain_id': 'y'},
+            {'id': 3, 'name': 'a', 'domain_id': 'x'},
+            {'id': 4, 'name': 'b', 'domain_id': 'x'}])
+
+    def test_filters_pushed_down(self):
+        found = self.manager.findall(name='a', domain_id='x')
+        self.assertEqual([1, 3], [r.id for r in found])
+        self.assertEqual([{'domain': 'x'}], self.manager.calls)
+
+    def test_local_filters(self):
+        found = self.manager.findall(name='a')
+        self.assertEqual([1, 2, 3], [r.id for r in found])
+        self.assertEqual([{}], self.manager.calls)
+
+    def test_find_stops_at_second_match(self):
+        self.assertRaises(ksc_exceptions.NoUniqueMatch,
+                          self.manager.find, name='a')
+        self.assertEqual(2, self.manager.listed)
+
+    def test_find(self):
+        self.assertEqual(2, self.manager.find(name='a', domain_id='y').id)
+        self.assertRaises(ksa_exceptions.NotFound,
+                          self.manager.find, name='c')
+
+
+class NameCacheTest(utils.TestCase):
+
+    def setUp(self):
+        super(NameCacheTest, self).setUp()
+        self.time_fixture = self.useFixture(oslo_fixture.TimeFixture())
+        self.cache = base.NameCache(ttl=60, max_size=3)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get(roles.Role, None, 'admin'))
+        self.cache.set(roles.Role, None, 'admin', 'id1')
+        self.assertEqual('id1', self.cache.get(roles.Role, None, 'admin'))
+        self.assertIsNone(self.cache.get(roles.Role, 'domain', 'admin'))
+        self.assertIsNone(self.cache.get(base.Resource, None, 'admin'))
+
+    def test_ttl(self):
+        self.cache.set(roles.Role, None, 'admin', 'id1')
+        self.time_fixture.advance_time_seconds(59)
+        self.assertEqual('id1', self.cache.get(roles.Role, None, 'admin'))
+        self.time_fixture.advance_time_seconds(2)
+        self.assertIsNone(self.cache.get(roles.Role, None, 'admin'))
+
+    def test_max_size(self):
+        for i in range(4):
+            self.cache.set(roles.Role, None, str(i), i)
+        self.assertEqual(3, len(self.cache))
+        self.assertIsNone(self.cache.get(roles.Role, None, '0'))
+        self.assertEqual(3, self.cache.get(roles.Role, None, '3'))
+
+    def test_add_resources(self):
+        self.cache.add_resources(roles.Role, [
+            roles.Role(None, {'id': '1', 'name': 'a'}),
+            roles.Role(None, {'id': '2', 'name': 'b', 'domain_id': 'd'}),
+            roles.Role(None, {'id': '3', 'name': 'b', 'domain_id': 'd'}),
+            roles.Role(None, {'id': '4'}),
+            {'id': '5', 'name': 'c'}])
+
+        self.assertEqual('1', self.cache.get(roles.Role, None, 'a'))
+        self.assertEqual('5', self.cache.get(roles.Role, None, 'c'))
+        # ambiguous names are not remembered
+        self.assertIsNone(self.cache.get(roles.Role, 'd', 'b'))
+        self.assertEqual(2, len(self.cache))
+
+    def test_add_resources_complete(self):
+        self.cache.max_size = 10
+        self.cache.add_resources(roles.Role, [
+            roles.Role(None, {'id': '1', 'name': 'a', 'domain_id': 'd'}),
+            roles.Role(None, {'id': '2', 'name': 'b', 'domain_id': 'd'}),
+            roles.Role(None, {'id': '3', 'name': 'b', 'domain_id': 'e'})],
+            complete=True)
+
+        self.assertEqual('1', self.cache.get(roles.Role, 'd', 'a'))
+        self.assertEqual('1', self.cache.get(roles.Role, None, 'a'))
+        self.assertEqual('3', self.cache.get(roles.Role, 'e', 'b'))
+        # names used in several domains need the domain to be resolved
+        self.assertIsNone(self.cache.get(roles.Role, None, 'b'))
+
+    def test_add_resources_forgets_unscoped_name(self):
+        self.cache.add_resources(roles.Role, [
+            {'id': '1', 'name': 'a', 'domain_id': 'd'}], complete=True)
+
+        self.cache.add_resources(roles.Role, [
+            {'id': '1', 'name': 'a', 'domain_id': 'd'}])
+        self.assertEqual('1', self.cache.get(roles.Role, None, 'a'))
+
+        self.cache.add_resources(roles.Role, [
+            {'id': '2', 'name': 'a', 'domain_id': 'e'}])
+        self.assertIsNone(self.cache.get(roles.Role, None, 'a'))
+        self.assertEqual('1', self.cache.get(roles.Role, 'd', 'a'))
+        self.assertEqual('2', self.cache.get(roles.Role, 'e', 'a'))
+
+    def test_invalidate(self):
+        self.cache.set(roles.Role, None, 'a', '1')
+        self.cache.set(roles.Role, 'd', 'a', '1')
+        self.cache.set(roles.Role, None, 'b', '2')
+
+        self.cache.invalidate(roles.Role, '1')
+        self.assertIsNone(self.cache.get(roles.Role, None, 'a'))
+        self.assertIsNone(self.cache.get(roles.Role, 'd', 'a'))
+        self.assertEqual('2', self.cache.get(roles.Role, None, 'b'))
+
+
 class ManagerTest(utils.TestCase):
     body = {"hello": {"hi": 1}}
     url = "/test-url"
@@ -0,0 +1,378 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import errno
+import os
+import stat
+import threading
+
+import fixtures
+from keystoneauth1 import fixture
+import mock
+from oslo_utils import fixture as oslo_fixture
+
+from keystoneclient import _fileutils
+from keystoneclient.auth.identity import v3
+from keystoneclient import discover
+from keystoneclient import discovery_cache
+from keystoneclient import exceptions
+from keystoneclient import metrics
+from keystoneclient import session
+from keystoneclient.tests.unit import utils
+
+
+class DiscoveryCacheTests(utils.TestCase):
+
+    URL = 'http://keystone.test:5000/'
+
+    def setUp(self):
+        super(DiscoveryCacheTests, self).setUp()
+        self.time = self.useFixture(oslo_fixture.TimeFixture())
+        self.cache = discovery_cache.DiscoveryCache(ttl=60, failure_ttl=10,
+                                                    max_size=2)
+        self.fetch = mock.Mock(return_value=[{'id': 'v3.0'}])
+        self.session = mock.Mock(metrics=None)
+
+    def get(self, url=URL, authenticated=False):
+        return self.cache.get_version_data(self.session, url, self.fetch,
+                                           authenticated=authenticated)
+
+    def test_hit(self):
+        self.assertEqual([{'id': 'v3.0'}], self.get())
+        self.assertEqual([{'id': 'v3.0'}], self.get())
+
+        self.fetch.assert_called_once_with(self.session, self.URL,
+                                           authenticated=False)
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1},
+                         self.cache.stats())
+
+    def test_returns_copies(self):
+        self.get()[0]['id'] = 'changed'
+        self.assertEqual([{'id': 'v3.0'}], self.get())
+
+    def test_expiry(self):
+        self.get()
+        self.time.advance_time_seconds(59)
+        self.get()
+        self.assertEqual(1, self.fetch.call_count)
+
+        self.time.advance_time_seconds(1)
+        self.get()
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_size_bound(self):
+        for url in ('http://a/', 'http://b/', 'http://a/', 'http://c/'):
+            self.get(url)
+
+        self.assertEqual(2, len(self.cache))
+        self.assertEqual((True, [{'id': 'v3.0'}]), self.cache.get('http://a/'))
+        self.assertEqual((False, None), self.cache.get('http://b/'))
+
+    def test_failure_cached(self):
+        self.fetch.side_effect = exceptions.DiscoveryFailure()
+
+        self.assertRaises(exceptions.DiscoveryFailure, self.get)
+        self.assertRaises(exceptions.DiscoveryFailure, self.get)
+        self.assertEqual(1, self.fetch.call_count)
+
+        self.time.advance_time_seconds(10)
+        self.assertRaises(exceptions.DiscoveryFailure, self.get)
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_cached_failure_raised_fresh(self):
+        error = exceptions.ConnectionRefused()
+        self.fetch.side_effect = error
+
+        self.assertRaises(exceptions.ConnectionRefused, self.get)
+        first = self.assertRaises(exceptions.DiscoveryFailure, self.get)
+        second = self.assertRaises(exceptions.DiscoveryFailure, self.get)
+
+        self.assertIsNot(first, second)
+        self.assertIs(error, first.__cause__)
+        self.assertIs(error, second.__cause__)
+        self.assertEqual(1, self.fetch.call_count)
+
+    def test_failure_cached_per_authenticated(self):
+        self.fetch.side_effect = exceptions.Unauthorized()
+
+        self.assertRaises(exceptions.Unauthorized, self.get,
+                          authenticated=False)
+        self.assertRaises(exceptions.DiscoveryFailure, self.get,
+                          authenticated=False)
+
+        self.fetch.side_effect = None
+        self.assertEqual([{'id': 'v3.0'}], self.get(authenticated=True))
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_failure_caching_disabled(self):
+        self.cache.failure_ttl = 0
+        self.fetch.side_effect = exceptions.ConnectionRefused()
+
+        self.assertRaises(exceptions.ConnectionRefused, self.get)
+        self.assertRaises(exceptions.ConnectionRefused, self.get)
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_other_errors_not_cached(self):
+        self.fetch.side_effect = ValueError()
+
+        self.assertRaises(ValueError, self.get)
+        self.assertEqual(0, len(self.cache))
+
+    def test_invalidate(self):
+        self.get('http://a/')
+        self.get('http://b/')
+
+        self.cache.invalidate('http://a/')
+        self.assertEqual((False, None), self.cache.get('http://a/'))
+        self.assertEqual(1, len(self.cache))
+
+        self.cache.invalidate()
+        self.assertEqual(0, len(self.cache))
+
+    def test_metrics(self):
+        self.session.metrics = metrics.ClientMetrics()
+        self.get()
+        self.get()
+
+        self.assertEqual(1, self.session.metrics.discovery_cache.get(
+            result='hit'))
+        self.assertEqual(1, self.session.metrics.discovery_cache.get(
+            result='miss'))
+
+
+class FileCacheTests(utils.TestCase):
+
+    URL = DiscoveryCacheTests.URL
+    DATA = [{'id': 'v3.0', 'status': 'stable'}]
+
+    def setUp(self):
+        super(FileCacheTests, self).setUp()
+        self.time = self.useFixture(oslo_fixture.TimeFixture())
+        self.directory = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                      'discovery')
+        self.cache = discovery_cache.FileCache(directory=self.directory,
+                                               ttl=60)
+        self.fetch = mock.Mock(return_value=self.DATA)
+
+    def get(self, cache=None, url=URL):
+        return (cache or self.cache).get_version_data(mock.sentinel.session,
+                                                      url, self.fetch)
+
+    def test_shared_between_instances(self):
+        self.assertEqual(self.DATA, self.get())
+
+        other = discovery_cache.FileCache(directory=self.directory, ttl=60)
+        self.assertEqual(self.DATA, self.get(other))
+
+        self.fetch.assert_called_once_with(mock.sentinel.session, self.URL)
+
+    def test_directory_private(self):
+        self.get()
+
+        mode = stat.S_IMODE(os.stat(self.directory).st_mode)
+        self.assertEqual(0o700, mode)
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            self.assertFalse(os.stat(path).st_mode & 0o077)
+
+    def test_no_temporary_files_left(self):
+        self.get()
+        self.get(url='http://other.test/')
+
+        names = os.listdir(self.directory)
+        self.assertEqual(2, len([n for n in names if n.endswith('.json')]))
+        self.assertFalse([n for n in names if n.startswith('.tmp-')])
+
+    def test_expiry(self):
+        self.get()
+        self.time.advance_time_seconds(60)
+        self.get()
+
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_corrupt_file_ignored(self):
+        self.get()
+        with open(self.cache._path(self.URL), 'w') as f:
+            f.write('{"url": ')
+
+        self.assertIsNone(self.cache.get(self.URL))
+        self.assertEqual(self.DATA, self.get())
+        self.assertEqual(self.DATA, self.cache.get(self.URL))
+
+    def test_failure_not_cached(self):
+        self.fetch.side_effect = exceptions.DiscoveryFailure()
+
+        self.assertRaises(exceptions.DiscoveryFailure, self.get)
+        self.assertIsNone(self.cache.get(self.URL))
+
+    def test_unwritable_directory(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'file')
+        open(path, 'w').close()
+        cache = discovery_cache.FileCache(directory=os.path.join(path, 'sub'))
+
+        self.assertEqual(self.DATA, self.get(cache))
+        self.assertEqual(self.DATA, self.get(cache))
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_invalidate(self):
+        self.get()
+        self.get(url='http://other.test/')
+
+        self.cache.invalidate(self.URL)
+        self.assertIsNone(self.cache.get(self.URL))
+        self.assertEqual(self.DATA, self.cache.get('http://other.test/'))
+
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get('http://other.test/'))
+
+    def test_default_directory(self):
+        self.useFixture(fixtures.EnvironmentVariable('XDG_CACHE_HOME',
+                                                     '/cache'))
+        cache = discovery_cache.FileCache()
+
+        self.assertEqual('/cache/keystoneclient/discovery', cache.directory)
+
+    def test_concurrent_fetch_once(self):
+        if _fileutils.fcntl is None:
+            self.skipTest('File locking is not supported')
+
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_fetch(session, url):
+            started.set()
+            release.wait(5)
+            return self.DATA
+
+        self.fetch.side_effect = slow_fetch
+        results = []
+
+        def worker():
+            cache = discovery_cache.FileCache(directory=self.directory,
+                                              ttl=60)
+            results.append(self.get(cache))
+
+        threads = [threading.Thread(target=worker) for _i in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for t in threads[1:]:
+            t.start()
+        release.set()
+        for t in threads:
+            t.join(5)
+
+        self.assertEqual([self.DATA] * 3, results)
+        self.assertEqual(1, self.fetch.call_count)
+
+    def test_lock_not_supported(self):
+        if _fileutils.fcntl is None:
+            self.skipTest('File locking is not supported')
+
+        self.useFixture(fixtures.MockPatch(
+            'keystoneclient._fileutils.fcntl.flock',
+            side_effect=OSError(errno.ENOLCK, 'No locks available')))
+
+        self.assertEqual(self.DATA, self.get())
+        self.assertEqual(self.DATA, self.get())
+        self.assertEqual(1, self.fetch.call_count)
+
+
+class ProcessCacheTests(utils.TestCase):
+
+    TEST_ROOT_URL = 'http://keystone.test:5000/'
+    TEST_COMPUTE_URL = 'http://nova.test:8774/'
+
+    def setUp(self):
+        super(ProcessCacheTests, self).setUp()
+        self.deprecations.expect_deprecations()
+        self.cache = discovery_cache.enable()
+        self.addCleanup(discovery_cache.disable)
+
+    def test_enable_disable(self):
+        self.assertIs(self.cache, discovery_cache.get_cache())
+
+        discovery_cache.disable()
+        self.assertIsNone(discovery_cache.get_cache())
+        discovery_cache.invalidate()
+
+    def test_discover_shared_by_sessions(self):
+        disc = self.requests_mock.get(
+            self.TEST_ROOT_URL, status_code=300,
+            json=fixture.DiscoveryList(href=self.TEST_ROOT_URL))
+
+        for _i in range(3):
+            d = discover.Discover(session.Session(),
+                                  auth_url=self.TEST_ROOT_URL)
+            self.assertEqual(2, len(d.version_data()))
+
+        self.assertEqual(1, disc.call_count)
+
+        discovery_cache.invalidate(self.TEST_ROOT_URL)
+        discover.Discover(session.Session(), auth_url=self.TEST_ROOT_URL)
+        self.assertEqual(2, disc.call_count)
+
+    def test_get_discovery_shared_by_plugins(self):
+        token = fixture.V3Token()
+        token.add_service('compute').add_standard_endpoints(
+            public=self.TEST_COMPUTE_URL)
+        self.stub_url('POST', ['v3', 'auth', 'tokens'],
+                      base_url=self.TEST_ROOT_URL,
+                      headers={'X-Subject-Token': self.TEST_TOKEN},
+                      json=token)
+        disc = self.requests_mock.get(
+            self.TEST_COMPUTE_URL, status_code=300,
+            json=fixture.DiscoveryList(href=self.TEST_COMPUTE_URL))
+
+        for _i in range(2):
+            auth = v3.Password(auth_url=self.TEST_ROOT_URL + 'v3',
+                               username='user', password='pass')
+            url = session.Session(auth=auth).get_endpoint(
+                service_type='compute', version=(3, 0))
+            self.assertEqual(self.TEST_COMPUTE_URL + 'v3', url)
+
+        self.assertEqual(1, disc.call_count)
+
+    def test_file_cache_used_by_discover(self):
+        discovery_cache.disable()
+        directory = self.useFixture(fixtures.TempDir()).path
+        discovery_cache.enable_file_cache(directory=directory)
+        self.addCleanup(discovery_cache.disable_file_cache)
+        disc = self.requests_mock.get(
+            self.TEST_ROOT_URL, status_code=300,
+            json=fixture.DiscoveryList(href=self.TEST_ROOT_URL))
+
+        d = discover.Discover(session.Session(), auth_url=self.TEST_ROOT_URL)
+        # as a new process would
+        discovery_cache.enable_file_cache(directory=directory)
+        d2 = discover.Discover(session.Session(), auth_url=self.TEST_ROOT_URL)
+
+        self.assertEqual(1, disc.call_count)
+        self.assertEqual(d.version_data(), d2.version_data())
+
+        discovery_cache.invalidate(self.TEST_ROOT_URL)
+        discover.Discover(session.Session(), auth_url=self.TEST_ROOT_URL)
+        self.assertEqual(2, disc.call_count)
+
+    def test_memory_cache_before_file_cache(self):
+        file_cache = discovery_cache.enable_file_cache(
+            directory=self.useFixture(fixtures.TempDir()).path)
+        self.addCleanup(discovery_cache.disable_file_cache)
+        self.requests_mock.get(
+            self.TEST_ROOT_URL, status_code=300,
+            json=fixture.DiscoveryList(href=self.TEST_ROOT_URL))
+
+        discover.Discover(session.Session(), auth_url=self.TEST_ROOT_URL)
+        file_cache.invalidate()
+        discover.Discover(session.Session(), auth_url=self.TEST_ROOT_URL)
+
+        self.assertEqual(1, self.requests_mock.call_count)
+        self.assertIsNone(file_cache.get(self.TEST_ROOT_URL))
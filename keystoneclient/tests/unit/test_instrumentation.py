@@ -0,0 +1,149 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import logging
+
+import fixtures
+import mock
+
+from keystoneclient import exceptions
+from keystoneclient import instrumentation
+from keystoneclient.tests.unit import utils
+
+
+class _ClockTestCase(utils.TestCase):
+
+    def setUp(self):
+        super(_ClockTestCase, self).setUp()
+        self.now = 1000.0
+        self.useFixture(fixtures.MockPatch('oslo_utils.timeutils.now',
+                                           lambda: self.now))
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class RequestTimingTests(_ClockTestCase):
+
+    URL = 'http://keystone.test/v3/users'
+
+    def make_timing(self, sinks=()):
+        timing = instrumentation.RequestTiming('GET', sinks)
+
+        with timing.phase('auth'):
+            self.advance(0.25)
+        with timing.phase('network'):
+            self.advance(1)
+        with timing.phase('network'):
+            self.advance(0.5)
+        timing.incr('retries')
+
+        return timing
+
+    def test_phases(self):
+        timing = self.make_timing()
+        timing.finish(self.URL, response=utils.test_response(status_code=204))
+
+        self.assertEqual({'auth': 0.25, 'network': 1.5}, timing.phases)
+        self.assertEqual({'retries': 1}, timing.counts)
+        self.assertEqual(1.75, timing.total)
+        self.assertEqual(self.URL, timing.url)
+        self.assertEqual(204, timing.status_code)
+
+    def test_phase_recorded_on_exception(self):
+        timing = instrumentation.RequestTiming('GET')
+
+        def fail():
+            with timing.phase('network'):
+                self.advance(2)
+                raise exceptions.ConnectionRefused()
+
+        self.assertRaises(exceptions.ConnectionRefused, fail)
+        self.assertEqual({'network': 2}, timing.phases)
+
+    def test_sinks_called(self):
+        sinks = [mock.Mock(), mock.Mock()]
+        timing = self.make_timing(sinks)
+        timing.finish(self.URL)
+
+        for sink in sinks:
+            sink.assert_called_once_with(timing)
+
+    def test_merge_child(self):
+        sink = mock.Mock()
+        timing = self.make_timing([sink])
+        child = timing.child()
+
+        with child.phase('network'):
+            self.advance(2)
+        child.incr('retries')
+        child.incr('redirects')
+        child.finish(self.URL)
+        self.assertFalse(sink.called)
+
+        timing.merge(child)
+        self.assertEqual({'auth': 0.25, 'network': 3.5}, timing.phases)
+        self.assertEqual({'retries': 2, 'redirects': 1}, timing.counts)
+
+    def test_null_timing(self):
+        timing = instrumentation.NULL_TIMING
+
+        with timing.phase('network'):
+            pass
+        timing.incr('retries')
+        self.assertIs(timing, timing.child())
+        timing.merge(timing)
+        timing.finish(self.URL)
+
+
+class SinkTests(_ClockTestCase):
+
+    URL = RequestTimingTests.URL
+
+    def setUp(self):
+        super(SinkTests, self).setUp()
+        self.timing = instrumentation.RequestTiming('GET')
+
+        with self.timing.phase('endpoint'):
+            self.advance(0.125)
+        with self.timing.phase('network'):
+            self.advance(0.375)
+        self.timing.incr('redirects')
+
+    def test_logging_sink(self):
+        logger = logging.getLogger(__name__)
+        self.timing.finish(self.URL,
+                           response=utils.test_response(status_code=200))
+
+        instrumentation.LoggingSink(logger=logger)(self.timing)
+
+        self.assertIn('GET %s 200 500.0ms endpoint=125.0ms network=375.0ms '
+                      'redirects=1' % self.URL, self.logger.output)
+
+    def test_logging_sink_exception(self):
+        self.timing.finish(self.URL, exception=exceptions.RequestTimeout())
+
+        instrumentation.LoggingSink()(self.timing)
+
+        self.assertIn('GET %s RequestTimeout' % self.URL, self.logger.output)
+
+    def test_statsd_sink(self):
+        client = mock.Mock()
+        self.timing.finish(self.URL)
+
+        instrumentation.StatsdSink(client, prefix='ks')(self.timing)
+
+        client.timing.assert_has_calls([mock.call('ks.total', 500.0),
+                                        mock.call('ks.endpoint', 125.0),
+                                        mock.call('ks.network', 375.0)],
+                                       any_order=True)
+        client.incr.assert_called_once_with('ks.redirects', 1)
@@ -0,0 +1,82 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import uuid
+
+from oslo_serialization import jsonutils
+
+from keystoneclient.common import jsonstream
+from keystoneclient.tests.unit import utils
+
+
+def _chunks(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+class IterItemsTests(utils.TestCase):
+
+    def setUp(self):
+        super(IterItemsTests, self).setUp()
+        self.items = [{'id': uuid.uuid4().hex,
+                       'name': u'élève %d' % i,
+                       'enabled': i % 2 == 0,
+                       'size': 12345 * i,
+                       'extra': None} for i in range(20)]
+        self.body = {'links': {'self': 'http://localhost/users'},
+                     'users': self.items,
+                     'truncated': False}
+
+    def test_chunk_sizes(self):
+        data = jsonutils.dump_as_bytes(self.body, indent=2,
+                                       ensure_ascii=False)
+
+        for size in (1, 2, 3, 7, 64, len(data)):
+            items = list(jsonstream.iter_items(_chunks(data, size), 'users'))
+            self.assertEqual(self.items, items)
+
+    def test_text_chunks(self):
+        data = jsonutils.dumps(self.body)
+        items = list(jsonstream.iter_items(_chunks(data, 5), 'users'))
+        self.assertEqual(self.items, items)
+
+    def test_lazy(self):
+        data = jsonutils.dump_as_bytes({'users': self.items})
+        consumed = []
+
+        def _read():
+            for chunk in _chunks(data, 16):
+                consumed.append(chunk)
+                yield chunk
+
+        items = jsonstream.iter_items(_read(), 'users')
+        self.assertEqual(self.items[0], next(items))
+        self.assertLess(len(consumed), len(_chunks(data, 16)))
+
+    def test_empty_collection(self):
+        data = b'{"users": [], "links": {}}'
+        self.assertEqual([], list(jsonstream.iter_items([data], 'users')))
+
+    def test_values_wrapping(self):
+        data = jsonutils.dump_as_bytes({'users': {'values': self.items}})
+        items = list(jsonstream.iter_items(_chunks(data, 10), 'users'))
+        self.assertEqual(self.items, items)
+
+    def test_missing_key(self):
+        for data in (b'{}', b'{"groups": []}'):
+            self.assertRaises(KeyError, list,
+                              jsonstream.iter_items([data], 'users'))
+
+    def test_invalid(self):
+        for data in (b'', b'[]', b'{"users": [1 2]}', b'{"users": [1,',
+                     b'{"users": [] "links": {}}', b'{1: []}'):
+            self.assertRaises(ValueError, list,
+                              jsonstream.iter_items([data], 'users'))
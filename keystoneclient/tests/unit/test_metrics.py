@@ -0,0 +1,166 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import requests
+
+from keystoneclient import exceptions
+from keystoneclient import instrumentation
+from keystoneclient import metrics
+from keystoneclient import session as client_session
+from keystoneclient.tests.unit import utils
+
+
+class RegistryTests(utils.TestCase):
+
+    def setUp(self):
+        super(RegistryTests, self).setUp()
+        self.registry = metrics.Registry()
+
+    def test_counter(self):
+        counter = self.registry.counter('requests_total', 'Requests.',
+                                        ('method',))
+        counter.inc(method='GET')
+        counter.inc(2, method='GET')
+        counter.inc(method='POST')
+
+        self.assertEqual(3, counter.get(method='GET'))
+        self.assertEqual(0, counter.get(method='PUT'))
+        self.assertEqual('# HELP requests_total Requests.\n'
+                         '# TYPE requests_total counter\n'
+                         'requests_total{method="GET"} 3.0\n'
+                         'requests_total{method="POST"} 1.0\n',
+                         self.registry.expose())
+
+    def test_counter_without_labels(self):
+        counter = self.registry.counter('events_total', 'Events.')
+        counter.inc()
+
+        self.assertIn('events_total 1.0\n', self.registry.expose())
+
+    def test_counter_only_increases(self):
+        counter = self.registry.counter('events_total', 'Events.')
+        self.assertRaises(ValueError, counter.inc, -1)
+
+    def test_wrong_labels(self):
+        counter = self.registry.counter('requests_total', 'Requests.',
+                                        ('method',))
+        self.assertRaises(ValueError, counter.inc, status=200)
+        self.assertRaises(ValueError, counter.inc)
+
+    def test_label_escaping(self):
+        counter = self.registry.counter('requests_total', 'Requests.',
+                                        ('url',))
+        counter.inc(url='a"b\\c\nd')
+
+        self.assertIn(r'requests_total{url="a\"b\\c\nd"} 1.0',
+                      self.registry.expose())
+
+    def test_histogram(self):
+        histogram = self.registry.histogram('duration_seconds', 'Duration.',
+                                            ('method',), buckets=(0.5, 1))
+        histogram.observe(0.25, method='GET')
+        histogram.observe(0.75, method='GET')
+        histogram.observe(2, method='GET')
+
+        self.assertEqual((3, 3.0), histogram.get(method='GET'))
+        self.assertEqual((0, 0.0), histogram.get(method='PUT'))
+        self.assertEqual(
+            '# HELP duration_seconds Duration.\n'
+            '# TYPE duration_seconds histogram\n'
+            'duration_seconds_bucket{method="GET",le="0.5"} 1.0\n'
+            'duration_seconds_bucket{method="GET",le="1.0"} 2.0\n'
+            'duration_seconds_bucket{method="GET",le="+Inf"} 3.0\n'
+            'duration_seconds_sum{method="GET"} 3.0\n'
+            'duration_seconds_count{method="GET"} 3.0\n',
+            self.registry.expose())
+
+    def test_register_returns_existing(self):
+        counter = self.registry.counter('events_total', 'Events.')
+        self.assertIs(counter, self.registry.counter('events_total',
+                                                     'Events.'))
+        self.assertIs(counter, self.registry.get('events_total'))
+        self.assertRaises(ValueError, self.registry.histogram,
+                          'events_total', 'Events.')
+
+    def test_shared_registry(self):
+        a = metrics.ClientMetrics(registry=self.registry)
+        b = metrics.ClientMetrics(registry=self.registry)
+
+        self.assertIs(a.requests, b.requests)
+
+
+class ClientMetricsTests(utils.TestCase):
+
+    TEST_URL = 'http://127.0.0.1:5000/'
+
+    def setUp(self):
+        super(ClientMetricsTests, self).setUp()
+        self.deprecations.expect_deprecations()
+        self.metrics = metrics.ClientMetrics()
+        self.session = client_session.Session(metrics=self.metrics)
+
+    def test_requests(self):
+        self.stub_url('GET', text='response')
+        self.stub_url('POST', status_code=404)
+
+        self.session.get(self.TEST_URL)
+        self.session.get(self.TEST_URL)
+        self.assertRaises(exceptions.NotFound, self.session.post,
+                          self.TEST_URL)
+
+        self.assertEqual(2, self.metrics.requests.get(service_type='unknown',
+                                                      method='GET',
+                                                      status=200))
+        self.assertEqual(1, self.metrics.requests.get(service_type='unknown',
+                                                      method='POST',
+                                                      status=404))
+        count, _total = self.metrics.request_duration.get(
+            service_type='unknown', method='GET')
+        self.assertEqual(2, count)
+
+    def test_connection_failure(self):
+        self.stub_url('GET', exc=requests.exceptions.ConnectionError())
+
+        self.assertRaises(exceptions.ConnectionRefused, self.session.get,
+                          self.TEST_URL)
+
+        status = exceptions.ConnectionRefused.__name__
+        self.assertEqual(1, self.metrics.requests.get(
+            service_type='unknown', method='GET', status=status))
+
+    def test_counts(self):
+        timing = instrumentation.RequestTiming('GET',
+                                               service_type='identity')
+        timing.incr('retries')
+        timing.incr('retries')
+        timing.incr('redirects')
+        timing.finish(self.TEST_URL,
+                      response=utils.test_response(status_code=200))
+
+        self.metrics.record_request(timing)
+
+        self.assertEqual(2, self.metrics.retries.get(service_type='identity'))
+        self.assertEqual(1,
+                         self.metrics.redirects.get(service_type='identity'))
+        self.assertEqual(0, self.metrics.reauths.get(service_type='identity'))
+
+    def test_expose(self):
+        self.stub_url('GET', text='response')
+        self.session.get(self.TEST_URL)
+
+        text = self.metrics.registry.expose()
+
+        self.assertIn('keystoneclient_http_requests_total{'
+                      'service_type="unknown",method="GET",status="200"} 1.0',
+                      text)
+        self.assertIn('# TYPE keystoneclient_http_request_duration_seconds '
+                      'histogram', text)
@@ -13,14 +13,18 @@
 # under the License.
 
 import argparse
+import gc
 import itertools
 import logging
+import threading
 import uuid
 
+import fixtures
 import mock
 from oslo_config import cfg
 from oslo_config import fixture as config
 from oslo_serialization import jsonutils
+from oslo_utils import fixture as oslo_fixture
 import requests
 import six
 from testtools import matchers
@@ -29,6 +33,8 @@ from keystoneclient import adapter
 from keystoneclient.auth import base
 from keystoneclient import exceptions
 from keystoneclient.i18n import _
+from keystoneclient import instrumentation
+from keystoneclient import metrics
 from keystoneclient import session as client_session
 from keystoneclient.tests.unit import utils
 
@@ -195,6 +201,19 @@ class SessionTests(utils.TestCase):
         self.assertIn(list(body.keys())[0], self.logger.output)
         self.assertIn(list(body.values())[0], self.logger.output)
 
+    def test_streamed_body_not_logged(self):
+        session = client_session.Session()
+        body = jsonutils.dumps({uuid.uuid4().hex: uuid.uuid4().hex})
+
+        self.stub_url('GET', text=body,
+                      headers={'Content-Type': 'application/json'})
+        resp = session.get(self.TEST_URL, stream=True)
+
+        self.assertNotIn(body, self.logger.output)
+        self.assertIn('Omitted, the response is streamed.',
+                      self.logger.output)
+        self.assertEqual(body, b''.join(resp.iter_content()).decode('utf-8'))
+
     def test_logging_body_only_for_specified_content_types(self):
         """Verify response body is only logged in specific content types.
 
@@ -311,6 +330,26 @@ class SessionTests(utils.TestCase):
         self.assertIsInstance(requests_session.adapters['https://'],
                               client_session.TCPKeepAliveAdapter)
 
+    def test_pool_sizes(self):
+        session = client_session.Session(pool_connections=2,
+                                         pool_maxsize=64,
+                                         pool_block=True)
+
+        for http_adapter in session.session.adapters.values():
+            self.assertEqual(2, http_adapter._pool_connections)
+            self.assertEqual(64, http_adapter._pool_maxsize)
+            self.assertTrue(http_adapter._pool_block)
+            self.assertEqual(64, http_adapter.poolmanager.connection_pool_kw[
+                'maxsize'])
+
+    def test_default_pool_sizes(self):
+        session = client_session.Session()
+
+        http_adapter = session.session.adapters['https://']
+        self.assertEqual(requests.adapters.DEFAULT_POOLSIZE,
+                         http_adapter._pool_maxsize)
+        self.assertFalse(http_adapter._pool_block)
+
     def test_does_not_set_tcp_keepalive_on_custom_sessions(self):
         mock_session = mock.Mock()
         client_session.Session(session=mock_session)
@@ -833,6 +872,929 @@ class SessionAuthTests(utils.TestCase):
         self.assertNotIn(list(response.values())[0], self.logger.output)
 
 
+class RetryPolicyTests(utils.TestCase):
+
+    def test_should_retry(self):
+        policy = client_session.RetryPolicy(retries=2)
+        resp = utils.test_response(status_code=503)
+
+        self.assertTrue(policy.should_retry('GET', resp, 0))
+        self.assertTrue(policy.should_retry('delete', resp, 1))
+        self.assertFalse(policy.should_retry('GET', resp, 2))
+        self.assertFalse(policy.should_retry('POST', resp, 0))
+        self.assertFalse(policy.should_retry(
+            'GET', utils.test_response(status_code=500), 0))
+
+    def test_methods(self):
+        policy = client_session.RetryPolicy(methods=['POST'])
+        resp = utils.test_response(status_code=429)
+
+        self.assertTrue(policy.should_retry('POST', resp, 0))
+        self.assertFalse(policy.should_retry('GET', resp, 0))
+
+    def test_backoff(self):
+        policy = client_session.RetryPolicy(backoff_factor=1, max_backoff=6)
+        resp = utils.test_response(status_code=503)
+
+        for attempt, delay in ((0, 1), (1, 2), (2, 4), (3, 6), (10, 6)):
+            self.assertThat(policy.get_delay(resp, attempt),
+                            matchers.GreaterThan(delay / 2.0 - 0.001))
+            self.assertThat(policy.get_delay(resp, attempt),
+                            matchers.LessThan(delay + 0.001))
+
+    def test_retry_after_seconds(self):
+        policy = client_session.RetryPolicy()
+        resp = utils.test_response(status_code=429,
+                                   headers={'Retry-After': '7'})
+
+        self.assertEqual(7, policy.get_delay(resp, 0))
+
+    def test_retry_after_capped(self):
+        policy = client_session.RetryPolicy(max_backoff=5)
+        resp = utils.test_response(status_code=429,
+                                   headers={'Retry-After': '7'})
+
+        self.assertEqual(5, policy.get_delay(resp, 0))
+
+    def test_retry_after_date(self):
+        policy = client_session.RetryPolicy()
+        resp = utils.test_response(
+            status_code=503,
+            headers={'Retry-After': 'Wed, 21 Oct 2015 07:28:10 GMT'})
+
+        with mock.patch('time.time', return_value=1445412480):
+            self.assertEqual(10, policy.get_delay(resp, 0))
+
+    def test_retry_after_ignored(self):
+        policy = client_session.RetryPolicy(backoff_factor=1,
+                                            respect_retry_after=False)
+        resp = utils.test_response(status_code=429,
+                                   headers={'Retry-After': '30'})
+
+        self.assertThat(policy.get_delay(resp, 0), matchers.LessThan(1.001))
+
+    def test_invalid_retry_after(self):
+        policy = client_session.RetryPolicy(backoff_factor=1)
+        resp = utils.test_response(status_code=429,
+                                   headers={'Retry-After': 'soon'})
+
+        self.assertThat(policy.get_delay(resp, 0), matchers.LessThan(1.001))
+
+
+class SessionRetryTests(utils.TestCase):
+
+    TEST_URL = 'http://127.0.0.1:5000/'
+
+    def setUp(self):
+        super(SessionRetryTests, self).setUp()
+        self.deprecations.expect_deprecations()
+        self.sleep = self.useFixture(fixtures.MockPatch('time.sleep')).mock
+
+    def test_retries_until_success(self):
+        policy = client_session.RetryPolicy(retries=3)
+        session = client_session.Session(retry_policy=policy)
+        self.requests_mock.get(self.TEST_URL,
+                               [{'status_code': 503},
+                                {'status_code': 429,
+                                 'headers': {'Retry-After': '2'}},
+                                {'text': 'response'}])
+
+        resp = session.get(self.TEST_URL)
+
+        self.assertEqual('response', resp.text)
+        self.assertEqual(3, self.requests_mock.call_count)
+        self.assertEqual(2, self.sleep.call_count)
+        self.sleep.assert_called_with(2)
+
+    def test_gives_up(self):
+        policy = client_session.RetryPolicy(retries=2)
+        session = client_session.Session(retry_policy=policy)
+        self.stub_url('GET', status_code=503)
+
+        self.assertRaises(exceptions.ServiceUnavailable, session.get,
+                          self.TEST_URL)
+        self.assertEqual(3, self.requests_mock.call_count)
+
+    def test_does_not_retry_post(self):
+        policy = client_session.RetryPolicy(retries=2)
+        session = client_session.Session(retry_policy=policy)
+        self.stub_url('POST', status_code=503)
+
+        self.assertRaises(exceptions.ServiceUnavailable, session.post,
+                          self.TEST_URL)
+        self.assertEqual(1, self.requests_mock.call_count)
+
+    def test_no_policy(self):
+        session = client_session.Session()
+        self.stub_url('GET', status_code=503)
+
+        self.assertRaises(exceptions.ServiceUnavailable, session.get,
+                          self.TEST_URL)
+        self.assertEqual(1, self.requests_mock.call_count)
+        self.assertFalse(self.sleep.called)
+
+    def test_per_request_policy(self):
+        policy = client_session.RetryPolicy(retries=2)
+        session = client_session.Session(retry_policy=policy)
+        self.stub_url('GET', status_code=503)
+
+        self.assertRaises(exceptions.ServiceUnavailable, session.get,
+                          self.TEST_URL, retry_policy=False)
+        self.assertEqual(1, self.requests_mock.call_count)
+
+    def test_adapter_policy(self):
+        policy = client_session.RetryPolicy(retries=1)
+        adpt = adapter.Adapter(client_session.Session(), retry_policy=policy)
+        self.stub_url('GET', status_code=503)
+
+        self.assertRaises(exceptions.ServiceUnavailable, adpt.get,
+                          self.TEST_URL)
+        self.assertEqual(2, self.requests_mock.call_count)
+
+    def test_retries_are_timed(self):
+        timings = []
+        policy = client_session.RetryPolicy(retries=1)
+        session = client_session.Session(retry_policy=policy,
+                                         timing_sinks=[timings.append])
+        self.requests_mock.get(self.TEST_URL,
+                               [{'status_code': 502}, {'text': 'response'}])
+
+        session.get(self.TEST_URL)
+
+        timing, = timings
+        self.assertEqual({'retries': 1}, timing.counts)
+        self.assertIn('retry_wait', timing.phases)
+
+
+class CircuitBreakerTests(utils.TestCase):
+
+    TEST_URL = 'http://127.0.0.1:5000/'
+    ENDPOINT = '127.0.0.1:5000'
+
+    def setUp(self):
+        super(CircuitBreakerTests, self).setUp()
+        self.deprecations.expect_deprecations()
+        self.time = self.useFixture(oslo_fixture.TimeFixture())
+        self.breaker = client_session.CircuitBreaker(failure_threshold=2,
+                                                     reset_timeout=10)
+        self.session = client_session.Session(circuit_breaker=self.breaker)
+
+    def assertGetRaises(self, exc=exceptions.ConnectionRefused):
+        self.assertRaises(exc, self.session.get, self.TEST_URL)
+
+    def open_circuit(self):
+        self.stub_url('GET', exc=requests.exceptions.ConnectionError())
+        self.assertGetRaises()
+        self.assertGetRaises()
+
+    def test_opens_after_threshold(self):
+        self.stub_url('GET', exc=requests.exceptions.ConnectionError())
+
+        self.assertGetRaises()
+        self.assertEqual(self.breaker.CLOSED,
+                         self.breaker.get_state(self.ENDPOINT))
+        self.assertGetRaises()
+        self.assertEqual(self.breaker.OPEN,
+                         self.breaker.get_state(self.ENDPOINT))
+
+    def test_fails_fast(self):
+        self.open_circuit()
+        self.time.advance_time_seconds(4)
+
+        e = self.assertRaises(exceptions.CircuitOpen, self.session.get,
+                              self.TEST_URL)
+
+        self.assertEqual(self.ENDPOINT, e.endpoint)
+        self.assertEqual(6, e.retry_after)
+        self.assertEqual(2, self.requests_mock.call_count)
+        self.assertEqual({self.ENDPOINT: {'state': self.breaker.OPEN,
+                                          'failures': 2,
+                                          'opened': 1,
+                                          'rejected': 1}},
+                         self.breaker.stats())
+
+    def test_timeouts_count(self):
+        self.stub_url('GET', exc=requests.exceptions.Timeout())
+
+        self.assertGetRaises(exceptions.RequestTimeout)
+        self.assertGetRaises(exceptions.RequestTimeout)
+
+        self.assertGetRaises(exceptions.CircuitOpen)
+
+    def test_connect_retries_stop_when_open(self):
+        self.stub_url('GET', exc=requests.exceptions.ConnectionError())
+        self.useFixture(fixtures.MockPatch('time.sleep'))
+
+        self.assertRaises(exceptions.CircuitOpen, self.session.get,
+                          self.TEST_URL, connect_retries=5)
+        self.assertEqual(2, self.requests_mock.call_count)
+
+    def test_success_resets_failures(self):
+        self.requests_mock.get(
+            self.TEST_URL,
+            [{'exc': requests.exceptions.ConnectionError()},
+             {'status_code': 404},
+             {'exc': requests.exceptions.ConnectionError()},
+             {'text': 'response'}])
+
+        self.assertGetRaises()
+        self.assertRaises(exceptions.NotFound, self.session.get,
+                          self.TEST_URL)
+        self.assertGetRaises()
+
+        self.assertEqual('response', self.session.get(self.TEST_URL).text)
+        self.assertEqual(self.breaker.CLOSED,
+                         self.breaker.get_state(self.ENDPOINT))
+
+    def test_server_errors_count(self):
+        self.stub_url('GET', status_code=503)
+
+        self.assertGetRaises(exceptions.ServiceUnavailable)
+        self.assertGetRaises(exceptions.ServiceUnavailable)
+        self.assertEqual(self.breaker.OPEN,
+                         self.breaker.get_state(self.ENDPOINT))
+
+    def test_half_open_probe_closes(self):
+        self.open_circuit()
+        self.time.advance_time_seconds(10)
+        self.stub_url('GET', text='response')
+
+        self.assertEqual('response', self.session.get(self.TEST_URL).text)
+        self.assertEqual(self.breaker.CLOSED,
+                         self.breaker.get_state(self.ENDPOINT))
+
+    def test_half_open_probe_reopens(self):
+        self.open_circuit()
+        self.time.advance_time_seconds(10)
+
+        self.assertGetRaises()
+        self.assertEqual(3, self.requests_mock.call_count)
+        self.assertEqual(self.breaker.OPEN,
+                         self.breaker.get_state(self.ENDPOINT))
+
+        self.assertGetRaises(exceptions.CircuitOpen)
+        self.time.advance_time_seconds(10)
+        self.assertGetRaises()
+        self.assertEqual(4, self.requests_mock.call_count)
+
+    def test_single_probe(self):
+        self.open_circuit()
+        self.time.advance_time_seconds(10)
+
+        self.breaker.before_request(self.ENDPOINT)
+        self.assertEqual(self.breaker.HALF_OPEN,
+                         self.breaker.get_state(self.ENDPOINT))
+        self.assertRaises(exceptions.CircuitOpen,
+                          self.breaker.before_request, self.ENDPOINT)
+
+    def test_endpoints_are_separate(self):
+        self.open_circuit()
+        other_url = 'http://127.0.0.2:5000/'
+        self.requests_mock.get(other_url, text='response')
+
+        self.assertEqual('response', self.session.get(other_url).text)
+        self.assertEqual(self.breaker.CLOSED,
+                         self.breaker.get_state('127.0.0.2:5000'))
+
+    def test_shared_by_adapters(self):
+        self.stub_url('GET', exc=requests.exceptions.ConnectionError())
+        identity = adapter.Adapter(self.session, service_type='identity',
+                                   endpoint_override=self.TEST_URL)
+        compute = adapter.Adapter(self.session, service_type='compute',
+                                  endpoint_override=self.TEST_URL)
+
+        self.assertRaises(exceptions.ConnectionRefused, identity.get, '/')
+        self.assertRaises(exceptions.ConnectionRefused, compute.get, '/')
+
+        self.assertRaises(exceptions.CircuitOpen, identity.get, '/')
+        self.assertEqual(2, self.requests_mock.call_count)
+
+    def test_metrics(self):
+        client_metrics = metrics.ClientMetrics()
+        self.session = client_session.Session(circuit_breaker=self.breaker,
+                                              metrics=client_metrics)
+        self.open_circuit()
+        self.assertGetRaises(exceptions.CircuitOpen)
+        self.assertGetRaises(exceptions.CircuitOpen)
+
+        self.assertEqual(1, client_metrics.circuit_opened.get(
+            endpoint=self.ENDPOINT))
+        self.assertEqual(2, client_metrics.circuit_rejected.get(
+            endpoint=self.ENDPOINT))
+        self.assertEqual(2, client_metrics.requests.get(
+            service_type='unknown', method='GET', status='CircuitOpen'))
+
+    def test_no_breaker(self):
+        session = client_session.Session()
+        self.stub_url('GET', exc=requests.exceptions.ConnectionError())
+
+        for _i in range(3):
+            self.assertRaises(exceptions.ConnectionRefused, session.get,
+                              self.TEST_URL)
+
+        self.assertEqual(3, self.requests_mock.call_count)
+
+
+class MultiEndpointAuthPlugin(AuthPlugin):
+
+    ENDPOINTS = ['http://compute-az1:2222/v1.0',
+                 'http://compute-az2:2222/v1.0',
+                 'http://compute-az3:2222/v1.0']
+
+    def get_endpoint(self, session, **kwargs):
+        return self.ENDPOINTS[0]
+
+    def get_endpoints(self, session, **kwargs):
+        return list(self.ENDPOINTS)
+
+
+class FailoverPolicyTests(utils.TestCase):
+
+    def test_applies_to(self):
+        policy = client_session.FailoverPolicy()
+
+        self.assertTrue(policy.applies_to('get'))
+        self.assertTrue(policy.applies_to('DELETE'))
+        self.assertFalse(policy.applies_to('POST'))
+
+    def test_should_fail_over(self):
+        policy = client_session.FailoverPolicy()
+
+        self.assertTrue(policy.should_fail_over(
+            utils.test_response(status_code=503)))
+        self.assertFalse(policy.should_fail_over(
+            utils.test_response(status_code=404)))
+
+    def test_no_hedging_by_default(self):
+        policy = client_session.FailoverPolicy()
+        for i in range(50):
+            policy.record_latency(0.1)
+
+        self.assertIsNone(policy.get_hedge_delay('GET'))
+
+    def test_hedge_delay_percentile(self):
+        policy = client_session.FailoverPolicy(hedge=True,
+                                               hedge_percentile=90,
+                                               hedge_min_samples=10)
+        for i in range(1, 10):
+            policy.record_latency(i / 10.0)
+
+        self.assertIsNone(policy.get_hedge_delay('GET'))
+
+        policy.record_latency(1.0)
+
+        self.assertEqual(0.9, policy.get_hedge_delay('GET'))
+        self.assertIsNone(policy.get_hedge_delay('PUT'))
+
+    def test_fixed_hedge_delay(self):
+        policy = client_session.FailoverPolicy(hedge=True, hedge_delay=0.25)
+
+        self.assertEqual(0.25, policy.get_hedge_delay('HEAD'))
+
+    def test_samples_are_bounded(self):
+        policy = client_session.FailoverPolicy(hedge=True,
+                                               hedge_percentile=100,
+                                               hedge_min_samples=2,
+                                               sample_size=2)
+        policy.record_latency(5)
+        policy.record_latency(1)
+        policy.record_latency(2)
+
+        self.assertEqual(2, policy.get_hedge_delay('GET'))
+
+
+class SessionFailoverTests(utils.TestCase):
+
+    ENDPOINTS = MultiEndpointAuthPlugin.ENDPOINTS
+    FILTER = {'service_type': 'compute', 'interface': 'public'}
+
+    def setUp(self):
+        super(SessionFailoverTests, self).setUp()
+        self.deprecations.expect_deprecations()
+        self.policy = client_session.FailoverPolicy()
+        self.session = client_session.Session(
+            auth=MultiEndpointAuthPlugin(), failover_policy=self.policy)
+
+    def stub_endpoint(self, index, **kwargs):
+        return self.requests_mock.get(self.ENDPOINTS[index] + '/servers',
+                                      **kwargs)
+
+    def get(self, **kwargs):
+        return self.session.get('/servers', endpoint_filter=self.FILTER,
+                                **kwargs)
+
+    def test_first_endpoint_used(self):
+        first = self.stub_endpoint(0, text='az1')
+        second = self.stub_endpoint(1, text='az2')
+
+        self.assertEqual('az1', self.get().text)
+        self.assertTrue(first.called)
+        self.assertFalse(second.called)
+
+    def test_connection_failure(self):
+        self.stub_endpoint(0, exc=requests.exceptions.ConnectionError())
+        self.stub_endpoint(1, exc=requests.exceptions.Timeout())
+        self.stub_endpoint(2, text='az3')
+
+        self.assertEqual('az3', self.get().text)
+
+    def test_server_error(self):
+        self.stub_endpoint(0, status_code=503)
+        self.stub_endpoint(1, text='az2')
+
+        self.assertEqual('az2', self.get().text)
+
+    def test_client_error_does_not_fail_over(self):
+        self.stub_endpoint(0, status_code=404)
+        second = self.stub_endpoint(1, text='az2')
+
+        self.assertRaises(exceptions.NotFound, self.get)
+        self.assertFalse(second.called)
+
+    def test_all_fail(self):
+        self.stub_endpoint(0, exc=requests.exceptions.ConnectionError())
+        self.stub_endpoint(1, status_code=500)
+        self.stub_endpoint(2, status_code=502)
+
+        e = self.assertRaises(exceptions.BadGateway, self.get)
+        self.assertEqual(self.ENDPOINTS[2] + '/servers', e.url)
+
+    def test_all_connection_failures(self):
+        for i in range(3):
+            self.stub_endpoint(i, exc=requests.exceptions.ConnectionError())
+
+        self.assertRaises(exceptions.ConnectionRefused, self.get)
+        self.assertEqual(3, self.requests_mock.call_count)
+
+    def test_post_does_not_fail_over(self):
+        self.requests_mock.post(self.ENDPOINTS[0] + '/servers',
+                                status_code=503)
+        second = self.requests_mock.post(self.ENDPOINTS[1] + '/servers')
+
+        self.assertRaises(exceptions.ServiceUnavailable, self.session.post,
+                          '/servers', endpoint_filter=self.FILTER)
+        self.assertFalse(second.called)
+
+    def test_per_request_policy(self):
+        self.stub_endpoint(0, status_code=503)
+        second = self.stub_endpoint(1, text='az2')
+
+        self.assertRaises(exceptions.ServiceUnavailable, self.get,
+                          failover_policy=False)
+        self.assertFalse(second.called)
+
+    def test_no_policy(self):
+        session = client_session.Session(auth=MultiEndpointAuthPlugin())
+        self.stub_endpoint(0, status_code=503)
+
+        self.assertRaises(exceptions.ServiceUnavailable, session.get,
+                          '/servers', endpoint_filter=self.FILTER)
+
+    def test_open_circuit_fails_over(self):
+        self.session.circuit_breaker = client_session.CircuitBreaker(
+            failure_threshold=1)
+        first = self.stub_endpoint(0,
+                                   exc=requests.exceptions.ConnectionError())
+        self.stub_endpoint(1, text='az2')
+
+        self.assertEqual('az2', self.get().text)
+        self.assertEqual('az2', self.get().text)
+        self.assertEqual(1, first.call_count)
+
+    def test_failovers_are_counted(self):
+        timings = []
+        self.session.timing_sinks.append(timings.append)
+        self.stub_endpoint(0, status_code=503)
+        self.stub_endpoint(1, status_code=503)
+        self.stub_endpoint(2, text='az3')
+
+        self.get()
+
+        timing, = timings
+        self.assertEqual({'failovers': 2}, timing.counts)
+        self.assertEqual(self.ENDPOINTS[2] + '/servers', timing.url)
+
+    def test_hedged(self):
+        self.policy.hedge = True
+        self.policy.hedge_delay = 0.01
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        # requests_mock serializes requests so stand in for the transport
+        def send(url, **kwargs):
+            if url.startswith(self.ENDPOINTS[0]):
+                release.wait(5)
+                return utils.test_response(text='az1')
+            return utils.test_response(text='az2')
+
+        self.useFixture(fixtures.MockPatchObject(self.session,
+                                                 '_send_request',
+                                                 side_effect=send))
+        timings = []
+        self.session.timing_sinks.append(timings.append)
+
+        self.assertEqual('az2', self.get().text)
+
+        timing, = timings
+        self.assertEqual({'hedges': 1}, timing.counts)
+
+    def test_hedged_attempts_isolated(self):
+        self.policy.hedge = True
+        self.policy.hedge_delay = 0.01
+        release = threading.Event()
+        loser_done = threading.Event()
+        self.addCleanup(release.set)
+        headers = {}
+
+        def send(url, timing, **kwargs):
+            headers[url[:len(self.ENDPOINTS[0])]] = kwargs['headers']
+            if url.startswith(self.ENDPOINTS[0]):
+                release.wait(5)
+                timing.incr('retries')
+                kwargs['headers']['X-Attempt'] = 'az1'
+                loser_done.set()
+                return utils.test_response(text='az1')
+            timing.incr('redirects')
+            return utils.test_response(text='az2')
+
+        self.useFixture(fixtures.MockPatchObject(self.session,
+                                                 '_send_request',
+                                                 side_effect=send))
+        timings = []
+        self.session.timing_sinks.append(timings.append)
+
+        self.assertEqual('az2', self.get().text)
+        release.set()
+        self.assertTrue(loser_done.wait(5))
+
+        # only the winning attempt is counted
+        timing, = timings
+        self.assertEqual({'hedges': 1, 'redirects': 1}, timing.counts)
+        self.assertNotIn('X-Attempt', headers[self.ENDPOINTS[1]])
+        self.assertIsNot(headers[self.ENDPOINTS[0]],
+                         headers[self.ENDPOINTS[1]])
+
+    def test_hedged_fast_response(self):
+        self.policy.hedge = True
+        self.policy.hedge_delay = 5
+        self.stub_endpoint(0, text='az1')
+        second = self.stub_endpoint(1, text='az2')
+
+        self.assertEqual('az1', self.get().text)
+        self.assertFalse(second.called)
+
+    def test_hedged_failure_fails_over(self):
+        self.policy.hedge = True
+        self.policy.hedge_delay = 5
+        self.stub_endpoint(0, exc=requests.exceptions.ConnectionError())
+        self.stub_endpoint(1, status_code=503)
+        self.stub_endpoint(2, text='az3')
+
+        self.assertEqual('az3', self.get().text)
+
+    def test_hedged_all_fail(self):
+        self.policy.hedge = True
+        self.policy.hedge_delay = 5
+        self.stub_endpoint(0, status_code=503)
+        self.stub_endpoint(1, exc=requests.exceptions.ConnectionError())
+        self.stub_endpoint(2, exc=requests.exceptions.ConnectionError())
+
+        self.assertRaises(exceptions.ServiceUnavailable, self.get)
+
+    def test_hedged_error_raised(self):
+        self.policy.hedge = True
+        self.policy.hedge_delay = 5
+        self.stub_endpoint(0, exc=requests.exceptions.SSLError())
+
+        self.assertRaises(exceptions.SSLError, self.get)
+
+    def test_latency_recorded(self):
+        self.stub_endpoint(0, text='az1')
+
+        self.get()
+        self.get()
+
+        self.assertEqual(2, len(self.policy._latencies))
+
+    def test_get_endpoints_cached(self):
+        auth = MultiEndpointAuthPlugin()
+        auth.auth_ref = object()
+        session = client_session.Session(auth=auth)
+
+        self.assertEqual(self.ENDPOINTS, session.get_endpoints(**self.FILTER))
+        self.assertEqual(self.ENDPOINTS, session.get_endpoints(**self.FILTER))
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1},
+                         session.get_endpoint_cache_stats())
+
+    def test_endpoint_cache_does_not_keep_plugins(self):
+        session = client_session.Session()
+
+        for _i in range(3):
+            auth = MultiEndpointAuthPlugin()
+            auth.auth_ref = object()
+            session.get_endpoints(auth=auth, **self.FILTER)
+            del auth
+            gc.collect()
+
+        self.assertEqual(0, session.get_endpoint_cache_stats()['size'])
+
+    def test_endpoint_cache_bounded(self):
+        auth = MultiEndpointAuthPlugin()
+        auth.auth_ref = object()
+        session = client_session.Session(auth=auth)
+        session._endpoint_cache.max_size = 2
+
+        for interface in ('public', 'internal', 'admin', 'public'):
+            session.get_endpoints(service_type='compute',
+                                  interface=interface)
+
+        self.assertEqual({'hits': 0, 'misses': 4, 'size': 2},
+                         session.get_endpoint_cache_stats())
+
+    def test_plugin_without_get_endpoints(self):
+        auth = mock.Mock(spec=['get_endpoint'])
+        auth.get_endpoint.return_value = self.ENDPOINTS[0]
+        session = client_session.Session(auth=auth)
+
+        self.assertEqual([self.ENDPOINTS[0]],
+                         session.get_endpoints(**self.FILTER))
+
+
+class EndpointSelectorTests(utils.TestCase):
+
+    URLS = ['http://az1:5000/v3', 'http://az2:5000/v3', 'http://az3:5000/v3']
+
+    def setUp(self):
+        super(EndpointSelectorTests, self).setUp()
+        self.now = 1000.0
+        self.useFixture(fixtures.MockPatch('oslo_utils.timeutils.now',
+                                           lambda: self.now))
+        self.selector = client_session.EndpointSelector(decay=0.5,
+                                                        probe_interval=60)
+
+    def test_average(self):
+        self.selector.record_latency('az1:5000', 1.0)
+        self.assertEqual(1.0, self.selector.get_latency('az1:5000'))
+
+        self.selector.record_latency('az1:5000', 0.5)
+        self.assertEqual(0.75, self.selector.get_latency('az1:5000'))
+        self.assertIsNone(self.selector.get_latency('az2:5000'))
+
+    def test_order(self):
+        self.selector.record_latency('az1:5000', 0.3)
+        self.selector.record_latency('az2:5000', 0.1)
+        self.selector.record_failure('az3:5000')
+
+        self.assertEqual([self.URLS[1], self.URLS[0], self.URLS[2]],
+                         self.selector.order(self.URLS))
+        self.assertEqual({'az1:5000': {'latency': 0.3, 'failed': False},
+                          'az2:5000': {'latency': 0.1, 'failed': False},
+                          'az3:5000': {'latency': None, 'failed': True}},
+                         self.selector.stats())
+
+    def test_probes_one_at_a_time(self):
+        self.assertEqual(self.URLS, self.selector.order(self.URLS))
+        # the first is being probed, the second is probed next
+        self.assertEqual([self.URLS[1], self.URLS[0], self.URLS[2]],
+                         self.selector.order(self.URLS))
+
+    def test_reprobe(self):
+        for endpoint, latency in (('az1:5000', 0.3), ('az2:5000', 0.1),
+                                  ('az3:5000', 0.2)):
+            self.selector.record_latency(endpoint, latency)
+
+        self.now += 30
+        self.selector.record_latency('az2:5000', 0.1)
+        self.assertEqual(self.URLS[1], self.selector.order(self.URLS)[0])
+
+        self.now += 30
+        self.assertEqual(self.URLS[0], self.selector.order(self.URLS)[0])
+        self.assertEqual(self.URLS[2], self.selector.order(self.URLS)[0])
+        self.assertEqual(self.URLS[1], self.selector.order(self.URLS)[0])
+
+    def test_failed_probed_only_with_failover(self):
+        self.selector.record_failure('az1:5000')
+        self.selector.record_latency('az2:5000', 0.1)
+        self.selector.record_latency('az3:5000', 0.2)
+        self.now += 60
+
+        self.assertEqual([self.URLS[1], self.URLS[2], self.URLS[0]],
+                         self.selector.order(self.URLS, probe_failed=False))
+        self.assertEqual(self.URLS[0], self.selector.order(self.URLS)[0])
+
+
+class SessionEndpointSelectionTests(utils.TestCase):
+    """Sessions selecting between stand-in endpoints with injected delays.
+
+    Each endpoint is a requests_mock stand-in that advances the clock by its
+    delay, so latencies are deterministic.
+    """
+
+    ENDPOINTS = MultiEndpointAuthPlugin.ENDPOINTS
+    FILTER = SessionFailoverTests.FILTER
+
+    def setUp(self):
+        super(SessionEndpointSelectionTests, self).setUp()
+        self.deprecations.expect_deprecations()
+        self.now = 1000.0
+        self.useFixture(fixtures.MockPatch('oslo_utils.timeutils.now',
+                                           lambda: self.now))
+        self.delays = {}
+        self.selector = client_session.EndpointSelector(decay=0.5,
+                                                        probe_interval=60)
+        self.session = client_session.Session(
+            auth=MultiEndpointAuthPlugin(), endpoint_selector=self.selector)
+
+        for i, endpoint in enumerate(self.ENDPOINTS):
+            self.requests_mock.get(endpoint + '/servers',
+                                   text=self.stand_in('az%d' % (i + 1)))
+
+    def stand_in(self, name):
+        def respond(request, context):
+            delay = self.delays[name]
+            if delay is None:
+                raise requests.exceptions.ConnectionError()
+            self.now += delay
+            return name
+
+        return respond
+
+    def get(self, **kwargs):
+        return self.session.get('/servers', endpoint_filter=self.FILTER,
+                                **kwargs).text
+
+    def warm_up(self, **delays):
+        self.delays.update(delays)
+        return [self.get() for _endpoint in self.ENDPOINTS]
+
+    def test_prefers_fastest(self):
+        self.assertEqual(['az1', 'az2', 'az3'],
+                         self.warm_up(az1=0.3, az2=0.1, az3=0.2))
+
+        self.assertEqual(['az2'] * 5, [self.get() for _i in range(5)])
+
+    def test_adapts_to_slowdown(self):
+        self.warm_up(az1=0.3, az2=0.1, az3=0.2)
+        self.delays['az2'] = 1.0
+
+        self.assertEqual(['az2', 'az3', 'az3'],
+                         [self.get() for _i in range(3)])
+
+    def test_reprobes_recovered_endpoint(self):
+        self.warm_up(az1=0.3, az2=0.1, az3=0.2)
+        self.delays['az1'] = 0.01
+
+        for _i in range(2):
+            self.assertEqual('az2', self.get())
+            self.now += 60
+            self.assertEqual(['az1', 'az2', 'az3'], self.warm_up())
+
+        self.assertEqual('az1', self.get())
+
+    def test_failed_endpoint_avoided(self):
+        self.warm_up(az1=0.3, az2=0.1, az3=0.2)
+        self.delays['az2'] = None
+
+        self.assertRaises(exceptions.ConnectionRefused, self.get)
+        self.assertEqual('az3', self.get())
+        self.assertTrue(self.selector.stats()['compute-az2:2222']['failed'])
+
+    def test_server_error_avoided(self):
+        self.warm_up(az1=0.3, az2=0.1, az3=0.2)
+        self.requests_mock.get(self.ENDPOINTS[1] + '/servers',
+                               status_code=500)
+
+        self.assertRaises(exceptions.InternalServerError, self.get)
+        self.assertEqual('az3', self.get())
+        self.assertTrue(self.selector.stats()['compute-az2:2222']['failed'])
+
+    def test_failed_endpoint_not_probed_without_failover(self):
+        self.warm_up(az1=0.3, az2=0.1, az3=0.2)
+        self.delays['az2'] = None
+        self.assertRaises(exceptions.ConnectionRefused, self.get)
+
+        self.now += 60
+        # az1 and az3 are probed but the request doesn't go to az2
+        self.assertEqual(['az1', 'az3', 'az3'],
+                         [self.get() for _i in range(3)])
+
+    def test_with_failover(self):
+        self.session.failover_policy = client_session.FailoverPolicy()
+        self.warm_up(az1=0.3, az2=0.1, az3=0.2)
+        self.delays['az2'] = None
+
+        self.assertEqual('az3', self.get())
+
+    def test_fully_qualified_url(self):
+        self.delays['az1'] = 0.5
+
+        self.session.get(self.ENDPOINTS[0] + '/servers')
+
+        self.assertEqual(0.5, self.selector.get_latency('compute-az1:2222'))
+
+
+class TimingTests(utils.TestCase):
+
+    TEST_URL = 'http://127.0.0.1:5000/'
+
+    def setUp(self):
+        super(TimingTests, self).setUp()
+        self.deprecations.expect_deprecations()
+        self.timings = []
+
+    def session(self, **kwargs):
+        return client_session.Session(timing_sinks=[self.timings.append],
+                                      **kwargs)
+
+    def test_no_sinks(self):
+        self.requests_mock.get(self.TEST_URL, text='response')
+
+        with mock.patch.object(instrumentation, 'RequestTiming') as m:
+            client_session.Session().get(self.TEST_URL)
+
+        self.assertFalse(m.called)
+
+    def test_phases(self):
+        sess = self.session(auth=CalledAuthPlugin())
+        self.requests_mock.post(CalledAuthPlugin.ENDPOINT + 'path',
+                                status_code=201)
+
+        sess.post('path', json={'hello': 'world'},
+                  endpoint_filter={'service_type': 'identity'})
+
+        timing, = self.timings
+        self.assertEqual('POST', timing.method)
+        self.assertEqual(CalledAuthPlugin.ENDPOINT + 'path', timing.url)
+        self.assertEqual(201, timing.status_code)
+        self.assertIsNone(timing.exception)
+        self.assertEqual({'auth', 'endpoint', 'serialize', 'network'},
+                         set(timing.phases))
+        self.assertEqual({}, timing.counts)
+        self.assertGreaterEqual(timing.total, sum(timing.phases.values()))
+
+    def test_reauth(self):
+        sess = self.session(auth=CalledAuthPlugin(invalidate=True))
+        self.requests_mock.get(self.TEST_URL,
+                               [{'text': 'Failed', 'status_code': 401},
+                                {'text': 'Hello', 'status_code': 200}])
+
+        sess.get(self.TEST_URL)
+
+        timing, = self.timings
+        self.assertEqual(200, timing.status_code)
+        self.assertIn('reauth', timing.phases)
+        self.assertEqual({'reauths': 1}, timing.counts)
+
+    def test_redirect(self):
+        sess = self.session()
+        redirect_url = 'http://other:5000/'
+        self.requests_mock.get(self.TEST_URL, status_code=305,
+                               headers={'Location': redirect_url})
+        self.requests_mock.get(redirect_url, text='response')
+
+        sess.get(self.TEST_URL)
+
+        timing, = self.timings
+        self.assertEqual(self.TEST_URL, timing.url)
+        self.assertEqual({'auth', 'network', 'redirect'}, set(timing.phases))
+        self.assertEqual({'redirects': 1}, timing.counts)
+
+    def test_connect_retries(self):
+        sess = self.session()
+        self.stub_url('GET', exc=requests.exceptions.Timeout())
+
+        with mock.patch('time.sleep'):
+            self.assertRaises(exceptions.RequestTimeout, sess.get,
+                              self.TEST_URL, connect_retries=2)
+
+        timing, = self.timings
+        self.assertIsNone(timing.status_code)
+        self.assertIsInstance(timing.exception, exceptions.RequestTimeout)
+        self.assertEqual({'auth', 'network', 'retry_wait'},
+                         set(timing.phases))
+        self.assertEqual({'retries': 2}, timing.counts)
+
+    def test_error_status(self):
+        sess = self.session()
+        self.stub_url('GET', status_code=404)
+
+        self.assertRaises(exceptions.NotFound, sess.get, self.TEST_URL)
+
+        timing, = self.timings
+        self.assertEqual(404, timing.status_code)
+        self.assertIsNone(timing.exception)
+
+    def test_failing_sink_is_ignored(self):
+        sink = mock.Mock(side_effect=ValueError)
+        sess = client_session.Session(timing_sinks=[sink])
+        self.stub_url('GET', text='response')
+
+        resp = sess.get(self.TEST_URL)
+
+        self.assertEqual('response', resp.text)
+        self.assertTrue(sink.called)
+
+
 class AdapterTest(utils.TestCase):
 
     SERVICE_TYPE = uuid.uuid4().hex
@@ -1078,11 +2040,35 @@ class ConfLoadingTests(utils.TestCase):
 
         self.assertEqual(cafile, s.verify)
 
+    def test_retry_policy(self):
+        self.config(status_code_retries=2, retriable_status_codes=[503],
+                    status_code_retry_delay=2)
+        s = self.get_session()
+
+        self.assertEqual(2, s.retry_policy.retries)
+        self.assertEqual({503}, s.retry_policy.status_codes)
+        self.assertEqual(2, s.retry_policy.backoff_factor)
+
+    def test_no_retry_policy(self):
+        self.assertIsNone(self.get_session().retry_policy)
+
+    def test_pool_sizes(self):
+        self.config(pool_connections=4, pool_maxsize=32, pool_block=True)
+        s = self.get_session()
+
+        http_adapter = s.session.adapters['https://']
+        self.assertEqual(4, http_adapter._pool_connections)
+        self.assertEqual(32, http_adapter._pool_maxsize)
+        self.assertTrue(http_adapter._pool_block)
+
     def test_deprecated(self):
         def new_deprecated():
             return cfg.DeprecatedOpt(uuid.uuid4().hex, group=uuid.uuid4().hex)
 
-        opt_names = ['cafile', 'certfile', 'keyfile', 'insecure', 'timeout']
+        opt_names = ['cafile', 'certfile', 'keyfile', 'insecure', 'timeout',
+                     'pool_connections', 'pool_maxsize', 'pool_block',
+                     'status_code_retries', 'retriable_status_codes',
+                     'status_code_retry_delay', 'status_code_max_retry_delay']
         depr = dict([(n, [new_deprecated()]) for n in opt_names])
         opts = client_session.Session.get_conf_options(deprecated_opts=depr)
 
@@ -1125,3 +2111,36 @@ class CliLoadingTests(utils.TestCase):
         s = self.get_session('--os-cacert %s' % cacert)
 
         self.assertEqual(cacert, s.verify)
+
+    def test_pool_sizes(self):
+        s = self.get_session('--pool-connections 4 --pool-maxsize 32 '
+                             '--pool-block')
+
+        http_adapter = s.session.adapters['https://']
+        self.assertEqual(4, http_adapter._pool_connections)
+        self.assertEqual(32, http_adapter._pool_maxsize)
+        self.assertTrue(http_adapter._pool_block)
+
+    def test_invalid_pool_size(self):
+        self.assertRaises(SystemExit, self.get_session, '--pool-maxsize 0')
+
+    def test_retry_policy(self):
+        s = self.get_session('--status-code-retries 3 '
+                             '--retriable-status-codes 429,503 '
+                             '--status-code-retry-delay 1 '
+                             '--status-code-max-retry-delay 10')
+
+        self.assertEqual(3, s.retry_policy.retries)
+        self.assertEqual({429, 503}, s.retry_policy.status_codes)
+        self.assertEqual(1, s.retry_policy.backoff_factor)
+        self.assertEqual(10, s.retry_policy.max_backoff)
+
+    def test_invalid_retries(self):
+        self.assertRaises(SystemExit, self.get_session,
+                          '--status-code-retries -1')
+        self.assertRaises(SystemExit, self.get_session,
+                          '--status-code-max-retry-delay -1')
+
+    def test_invalid_status_codes(self):
+        self.assertRaises(SystemExit, self.get_session,
+                          '--retriable-status-codes a,b')
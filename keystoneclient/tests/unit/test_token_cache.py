@@ -0,0 +1,308 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import datetime
+import os
+import stat
+import uuid
+
+import fixtures
+from keystoneauth1 import fixture
+import mock
+from oslo_utils import fixture as oslo_fixture
+from oslo_utils import timeutils
+
+from keystoneclient import access
+from keystoneclient.auth.identity import generic
+from keystoneclient.auth.identity import v2
+from keystoneclient.auth.identity import v3
+from keystoneclient.contrib.auth.v3 import saml2
+from keystoneclient import httpclient
+from keystoneclient import session
+from keystoneclient.tests.unit import utils
+from keystoneclient.tests.unit.v2_0 import client_fixtures
+from keystoneclient import token_cache
+
+
+class SerializationTests(utils.TestCase):
+
+    def test_v3(self):
+        token = fixture.V3Token()
+        token.set_project_scope()
+        token.add_service('identity').add_standard_endpoints(
+            public=self.TEST_ROOT_URL)
+        auth_ref = access.AccessInfo.factory(body=token,
+                                             auth_token=self.TEST_TOKEN)
+
+        data = token_cache.dumps(auth_ref)
+        loaded = token_cache.loads(data)
+
+        self.assertNotIn(' ', data)
+        self.assertIsInstance(loaded, access.AccessInfoV3)
+        self.assertEqual(self.TEST_TOKEN, loaded.auth_token)
+        self.assertEqual(auth_ref.project_id, loaded.project_id)
+        self.assertEqual(auth_ref.expires, loaded.expires)
+        self.assertEqual(self.TEST_ROOT_URL, loaded.service_catalog.url_for(
+            service_type='identity', endpoint_type='public'))
+
+    def test_v2(self):
+        token = fixture.V2Token(token_id=self.TEST_TOKEN)
+        token.set_scope()
+        auth_ref = access.AccessInfo.factory(body=token)
+
+        loaded = token_cache.loads(token_cache.dumps(auth_ref))
+
+        self.assertIsInstance(loaded, access.AccessInfoV2)
+        self.assertEqual(self.TEST_TOKEN, loaded.auth_token)
+        self.assertEqual(auth_ref.tenant_id, loaded.tenant_id)
+
+    def test_unknown_format(self):
+        self.assertRaises(ValueError, token_cache.loads, '{"format":0}')
+
+
+class FileTokenCacheTests(utils.TestCase):
+
+    KEY = 'http://keystone.test:5000/v3/user/project'
+
+    def setUp(self):
+        super(FileTokenCacheTests, self).setUp()
+        self.time = self.useFixture(oslo_fixture.TimeFixture())
+        self.directory = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                      'tokens')
+        self.cache = token_cache.FileTokenCache(directory=self.directory)
+
+        token = fixture.V3Token(expires='2030-01-01T00:00:00Z')
+        self.auth_ref = access.AccessInfo.factory(body=token,
+                                                  auth_token=self.TEST_TOKEN)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get(self.KEY))
+
+        self.cache.set(self.KEY, self.auth_ref)
+
+        other = token_cache.FileTokenCache(directory=self.directory)
+        self.assertEqual(self.TEST_TOKEN, other.get(self.KEY).auth_token)
+        self.assertIsNone(other.get('other key'))
+
+    def test_private(self):
+        self.cache.set(self.KEY, self.auth_ref)
+
+        mode = stat.S_IMODE(os.stat(self.directory).st_mode)
+        self.assertEqual(0o700, mode)
+        for name in os.listdir(self.directory):
+            self.assertNotIn(self.TEST_TOKEN, name)
+            path = os.path.join(self.directory, name)
+            self.assertFalse(os.stat(path).st_mode & 0o077)
+
+    def test_stale(self):
+        expires = timeutils.utcnow() + datetime.timedelta(seconds=90)
+        token = fixture.V3Token(expires=expires)
+        self.cache.set(self.KEY, access.AccessInfo.factory(body=token,
+                                                           auth_token='a'))
+
+        self.assertIsNotNone(self.cache.get(self.KEY, stale_duration=30))
+        self.assertIsNone(self.cache.get(self.KEY, stale_duration=120))
+
+    def test_replace(self):
+        self.cache.set(self.KEY, self.auth_ref)
+        self.auth_ref.auth_token = 'new'
+        self.cache.set(self.KEY, self.auth_ref)
+
+        self.assertEqual('new', self.cache.get(self.KEY).auth_token)
+        self.assertFalse([n for n in os.listdir(self.directory)
+                          if n.startswith('.tmp-')])
+
+    def test_corrupt_file_ignored(self):
+        self.cache.set(self.KEY, self.auth_ref)
+        with open(self.cache._path(self.KEY), 'w') as f:
+            f.write('{"format": ')
+
+        self.assertIsNone(self.cache.get(self.KEY))
+
+    def test_delete(self):
+        self.cache.set(self.KEY, self.auth_ref)
+        self.cache.delete(self.KEY)
+        self.cache.delete(self.KEY)
+
+        self.assertIsNone(self.cache.get(self.KEY))
+
+    def test_unwritable_directory(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path, 'file')
+        open(path, 'w').close()
+        cache = token_cache.FileTokenCache(directory=os.path.join(path, 'sub'))
+
+        cache.set(self.KEY, self.auth_ref)
+        self.assertIsNone(cache.get(self.KEY))
+
+    def test_default_directory(self):
+        self.useFixture(fixtures.EnvironmentVariable('XDG_CACHE_HOME',
+                                                     '/cache'))
+        cache = token_cache.FileTokenCache()
+
+        self.assertEqual('/cache/keystoneclient/tokens', cache.directory)
+
+
+class PluginTokenCacheTests(utils.TestCase):
+
+    TEST_URL = 'http://keystone.test:5000/'
+
+    def setUp(self):
+        super(PluginTokenCacheTests, self).setUp()
+        self.deprecations.expect_deprecations()
+        self.cache = token_cache.FileTokenCache(
+            directory=self.useFixture(fixtures.TempDir()).path)
+
+        token = fixture.V3Token()
+        token.set_project_scope()
+        self.auth = self.requests_mock.post(
+            self.TEST_URL + 'v3/auth/tokens', json=token,
+            headers={'X-Subject-Token': self.TEST_TOKEN})
+
+    def get_token(self, plugin):
+        plugin.token_cache = self.cache
+        return plugin.get_token(session.Session())
+
+    def password(self, **kwargs):
+        kwargs.setdefault('username', self.TEST_USER)
+        kwargs.setdefault('password', 'pass')
+        kwargs.setdefault('project_id', self.TEST_TENANT_ID)
+        return v3.Password(self.TEST_URL + 'v3', **kwargs)
+
+    def test_shared_between_plugins(self):
+        self.assertEqual(self.TEST_TOKEN, self.get_token(self.password()))
+        self.assertEqual(self.TEST_TOKEN, self.get_token(self.password()))
+
+        self.assertEqual(1, self.auth.call_count)
+
+    def test_different_credentials(self):
+        self.get_token(self.password())
+        self.get_token(self.password(password='other'))
+        self.get_token(self.password(project_id=uuid.uuid4().hex))
+        self.get_token(v3.Token(self.TEST_URL + 'v3', token='pass',
+                                project_id=self.TEST_TENANT_ID))
+
+        self.assertEqual(4, self.auth.call_count)
+
+    def test_cache_id_hides_credentials(self):
+        cache_id = self.password(password='secret').get_cache_id()
+
+        self.assertNotIn('secret', cache_id)
+        self.assertEqual(cache_id,
+                         self.password(password='secret').get_cache_id())
+
+    def test_cache_id_differs_by_user(self):
+        alice = self.password(username='alice', password='a')
+        bob = self.password(username='bob', password='b')
+
+        self.assertNotEqual(alice.get_cache_id(), bob.get_cache_id())
+
+    def test_saml_plugins_not_cached(self):
+        url = self.TEST_URL + 'v3'
+        plugins = [
+            saml2.Saml2UnscopedToken(url, 'idp1', 'http://idp1/', 'alice',
+                                     'a'),
+            saml2.Saml2UnscopedToken(url, 'idp2', 'http://idp2/', 'bob', 'b'),
+            saml2.ADFSUnscopedToken(url, 'idp1', 'http://idp1/',
+                                    'http://sp/', 'alice', 'a'),
+        ]
+
+        for plugin in plugins:
+            self.assertIsNone(plugin.get_cache_id())
+
+    def test_invalidate_removes_token(self):
+        plugin = self.password()
+        self.get_token(plugin)
+
+        plugin.invalidate()
+        self.assertIsNone(self.cache.get(plugin.get_cache_id()))
+
+        self.get_token(self.password())
+        self.assertEqual(2, self.auth.call_count)
+
+    def test_generic_plugin(self):
+        self.stub_url('GET', base_url=self.TEST_URL, status_code=300,
+                      json=fixture.DiscoveryList(href=self.TEST_URL))
+
+        def plugin():
+            return generic.Password(self.TEST_URL, username=self.TEST_USER,
+                                    password='pass', user_domain_id='default',
+                                    project_id=self.TEST_TENANT_ID)
+
+        self.assertEqual(self.TEST_TOKEN, self.get_token(plugin()))
+        self.assertEqual(self.TEST_TOKEN, self.get_token(plugin()))
+
+        self.assertEqual(1, self.auth.call_count)
+
+    def test_v2_plugin(self):
+        token = fixture.V2Token(token_id=self.TEST_TOKEN)
+        auth = self.requests_mock.post(self.TEST_URL + 'v2.0/tokens',
+                                       json=token)
+
+        for _i in range(2):
+            plugin = v2.Password(self.TEST_URL + 'v2.0',
+                                 username=self.TEST_USER, password='pass')
+            self.assertEqual(self.TEST_TOKEN, self.get_token(plugin))
+
+        self.assertEqual(1, auth.call_count)
+
+    def test_not_cacheable(self):
+        plugin = self.password()
+        plugin.get_cache_id_elements = mock.Mock(return_value=None)
+
+        self.get_token(plugin)
+
+        self.assertEqual([], os.listdir(self.cache.directory))
+
+
+class HTTPClientTokenCacheTests(utils.TestCase):
+
+    AUTH_URL = 'http://public.com:5000/v2.0'
+
+    def setUp(self):
+        super(HTTPClientTokenCacheTests, self).setUp()
+        self.cache = token_cache.FileTokenCache(
+            directory=self.useFixture(fixtures.TempDir()).path)
+
+    def client(self):
+        # Creating a HTTPClient not using session is deprecated.
+        with self.deprecations.expect_deprecations_here():
+            return httpclient.HTTPClient(username='exampleuser',
+                                         password='password',
+                                         project_id='tenant_id',
+                                         auth_url=self.AUTH_URL,
+                                         token_cache=self.cache)
+
+    def authenticate(self, token):
+        cl = self.client()
+        method = 'get_raw_token_from_identity_service'
+        with mock.patch.object(cl, method) as meth:
+            meth.return_value = (True, token)
+            self.assertTrue(cl.authenticate())
+        return cl, meth.call_count
+
+    def test_token_reused(self):
+        token = client_fixtures.project_scoped_token()
+        token['access']['token']['expires'] = '2999-01-01T00:00:00Z'
+
+        cl, calls = self.authenticate(token)
+        self.assertEqual(1, calls)
+
+        cl, calls = self.authenticate(token)
+        self.assertEqual(0, calls)
+        self.assertEqual(token['access']['token']['id'], cl.auth_token)
+
+    def test_expired_token_replaced(self):
+        token = client_fixtures.project_scoped_token()
+        token['access']['token']['expires'] = '2000-01-01T00:00:00Z'
+
+        self.assertEqual(1, self.authenticate(token)[1])
+        self.assertEqual(1, self.authenticate(token)[1])
@@ -10,6 +10,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+
 from keystoneauth1 import exceptions as ksa_exceptions
 import six
 import testresources
@@ -130,5 +133,40 @@ class HashSignedTokenTestCase(test_utils.TestCase,
         self.assertThat(token_id, matchers.HasLength(64))
 
 
+class MapConcurrentlyTestCase(test_utils.TestCase):
+
+    def test_results_in_order(self):
+        def func(i):
+            if i == 3:
+                raise ValueError(i)
+            return i * 2
+
+        results = utils.map_concurrently(func, range(6), concurrency=3)
+
+        self.assertEqual([0, 2, 4], results[:3])
+        self.assertIsInstance(results[3], ValueError)
+        self.assertEqual([8, 10], results[4:])
+
+    def test_concurrency_bounded(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def func(i):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+
+        utils.map_concurrently(func, range(10), concurrency=3)
+        self.assertLessEqual(peak[0], 3)
+
+    def test_no_items(self):
+        self.assertEqual([], utils.map_concurrently(str, [], concurrency=2))
+        self.assertRaises(ValueError, utils.map_concurrently, str, [1], 0)
+
+
 def load_tests(loader, tests, pattern):
     return testresources.OptimisingTestSuite(tests)
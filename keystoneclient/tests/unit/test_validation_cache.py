@@ -0,0 +1,103 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import uuid
+
+from oslo_utils import fixture
+from oslo_utils import timeutils
+
+from keystoneclient.tests.unit import utils
+from keystoneclient import validation_cache
+
+
+class MemoryBackendTests(utils.TestCase):
+
+    def test_expiry(self):
+        time_fixture = self.useFixture(fixture.TimeFixture())
+        backend = validation_cache.MemoryBackend()
+
+        backend.set('key', 'value', 10)
+        self.assertEqual('value', backend.get('key'))
+
+        time_fixture.advance_time_seconds(11)
+        self.assertIsNone(backend.get('key'))
+        self.assertEqual(0, len(backend))
+
+    def test_least_recently_used_removed(self):
+        backend = validation_cache.MemoryBackend(max_size=2)
+
+        backend.set('a', 'a', 60)
+        backend.set('b', 'b', 60)
+        backend.get('a')
+        backend.set('c', 'c', 60)
+
+        self.assertEqual('a', backend.get('a'))
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual('c', backend.get('c'))
+
+    def test_delete(self):
+        backend = validation_cache.MemoryBackend()
+        backend.set('a', 'a', 60)
+        backend.delete('a')
+        backend.delete('b')
+        self.assertIsNone(backend.get('a'))
+
+
+class ValidationCacheTests(utils.TestCase):
+
+    def setUp(self):
+        super(ValidationCacheTests, self).setUp()
+        self.backend = validation_cache.MemoryBackend()
+        self.cache = validation_cache.ValidationCache(backend=self.backend,
+                                                      ttl=60)
+        self.token_id = uuid.uuid4().hex
+        self.body = {'token': {'id': uuid.uuid4().hex}}
+        self.expires = timeutils.utcnow_ts() + 3600
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get(self.token_id))
+        self.cache.set(self.token_id, self.body, self.expires)
+
+        self.assertEqual(self.body, self.cache.get(self.token_id))
+        self.assertIsNone(self.cache.get(self.token_id,
+                                         include_catalog=False))
+        self.assertIsNone(self.cache.get(self.token_id, allow_expired=True))
+
+    def test_token_id_not_stored(self):
+        self.cache.set(self.token_id, self.body, self.expires)
+
+        for key in self.backend._entries:
+            self.assertNotIn(self.token_id, key)
+
+    def test_results_are_copies(self):
+        self.cache.set(self.token_id, self.body, self.expires)
+        self.cache.get(self.token_id)['token']['id'] = 'modified'
+
+        self.assertEqual(self.body, self.cache.get(self.token_id))
+
+    def test_expiring_token_not_cached(self):
+        expires = timeutils.utcnow_ts(microsecond=True) + 0.5
+
+        self.cache.set(self.token_id, self.body, expires)
+        self.assertIsNone(self.cache.get(self.token_id))
+
+    def test_invalidate(self):
+        self.cache.set(self.token_id, self.body, self.expires)
+        self.cache.set(self.token_id, self.body, self.expires,
+                       include_catalog=False, allow_expired=True)
+
+        self.cache.invalidate(self.token_id)
+
+        self.assertIsNone(self.cache.get(self.token_id))
+        self.assertIsNone(self.cache.get(self.token_id,
+                                         include_catalog=False,
+                                         allow_expired=True))
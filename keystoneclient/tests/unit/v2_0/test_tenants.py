@@ -161,6 +161,38 @@ class TenantTests(utils.ClientTestCase):
         self.assertQueryStringIs('marker=1&limit=1')
         [self.assertIsInstance(t, tenants.Tenant) for t in tenant_list]
 
+    def test_find_by_name(self):
+        resp = {'tenant': self.TEST_TENANTS['tenants']['values'][2]}
+        self.stub_url('GET', ['tenants'], json=resp)
+
+        t = self.client.tenants.find(name='admin')
+        self.assertIsInstance(t, tenants.Tenant)
+        self.assertEqual(self.ADMIN_ID, t.id)
+        self.assertQueryStringIs('name=admin')
+
+    def test_find_by_name_not_found(self):
+        self.stub_url('GET', ['tenants'], status_code=404)
+
+        self.assertRaises(exceptions.NotFound,
+                          self.client.tenants.find, name='admin')
+        self.assertEqual([], self.client.tenants.findall(name='admin'))
+
+    def test_find_by_name_filter_ignored(self):
+        # servers that don't support the name query return all the tenants
+        self.stub_url('GET', ['tenants'], json=self.TEST_TENANTS)
+
+        t = self.client.tenants.find(name='demo', enabled=True)
+        self.assertEqual(self.DEMO_ID, t.id)
+        self.assertQueryStringIs('name=demo')
+
+    def test_findall_local_filter(self):
+        self.stub_url('GET', ['tenants'], json=self.TEST_TENANTS)
+
+        found = self.client.tenants.findall(description='None')
+        self.assertEqual(set([self.DEMO_ID, self.ADMIN_ID]),
+                         set(t.id for t in found))
+        self.assertQueryStringIs('')
+
     def test_update(self):
         req_body = {
             "tenant": {
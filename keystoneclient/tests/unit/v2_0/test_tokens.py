@@ -209,6 +209,26 @@ class TokenTests(utils.ClientTestCase):
         self.assertIsInstance(access_info, access.AccessInfoV2)
         self.assertEqual(token_id, access_info.auth_token)
 
+    def test_validate_many(self):
+        ids = [uuid.uuid4().hex for _ in range(3)]
+        for id_ in ids[:2]:
+            self.stub_url('GET', ['tokens', id_],
+                          json=fixture.V2Token(token_id=id_))
+        self.stub_url('GET', ['tokens', ids[2]], status_code=404)
+
+        results = self.client.tokens.validate_many(
+            [ids[0], ids[1], ids[2], ids[0]], concurrency=2)
+
+        self.assertEqual(4, len(results))
+        self.assertEqual(ids[0], results[0].id)
+        self.assertEqual(ids[1], results[1].id)
+        self.assertIsInstance(results[2], exceptions.NotFound)
+        self.assertIs(results[0], results[3])
+
+        validated = [r.path for r in self.requests_mock.request_history
+                     if r.path.endswith(ids[0])]
+        self.assertEqual(1, len(validated))
+
     def test_get_revoked(self):
         sample_revoked_response = {'signed': '-----BEGIN CMS-----\nMIIB...'}
         self.stub_url('GET', ['tokens', 'revoked'],
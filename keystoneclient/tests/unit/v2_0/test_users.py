@@ -160,6 +160,15 @@ class UserTests(utils.ClientTestCase):
         self.assertEqual(u.id, self.ADMIN_USER_ID)
         self.assertEqual(u.name, 'admin')
 
+    def test_find_by_name(self):
+        self.stub_url('GET', ['users'],
+                      json={'user': self.TEST_USERS['users']['values'][1]})
+
+        u = self.client.users.find(name='demo')
+        self.assertIsInstance(u, users.User)
+        self.assertEqual(self.DEMO_USER_ID, u.id)
+        self.assertQueryStringIs('name=demo')
+
     def test_list(self):
         self.stub_url('GET', ['users'], json=self.TEST_USERS)
 
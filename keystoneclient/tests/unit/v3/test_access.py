@@ -14,9 +14,11 @@ import datetime
 import uuid
 
 from keystoneauth1 import fixture
+import mock
 from oslo_utils import timeutils
 
 from keystoneclient import access
+from keystoneclient import service_catalog
 from keystoneclient.tests.unit import utils as test_utils
 from keystoneclient.tests.unit.v3 import client_fixtures
 from keystoneclient.tests.unit.v3 import utils
@@ -87,6 +89,37 @@ class AccessInfoTest(utils.TestCase):
         self.assertTrue(auth_ref.will_expire_soon(stale_duration=301))
         self.assertFalse(auth_ref.will_expire_soon())
 
+    def test_expires_timestamp(self):
+        token = fixture.V3Token()
+        auth_ref = access.AccessInfo.factory(body=token)
+
+        epoch = datetime.datetime(1970, 1, 1)
+        expires = timeutils.normalize_time(auth_ref.expires)
+        self.assertAlmostEqual(timeutils.delta_seconds(epoch, expires),
+                               auth_ref.expires_timestamp, places=5)
+
+        # changing the token data is reflected despite the parse cache
+        expires = timeutils.utcnow() + datetime.timedelta(seconds=10)
+        auth_ref['expires_at'] = expires.isoformat()
+        self.assertEqual(expires, timeutils.normalize_time(auth_ref.expires))
+        self.assertTrue(auth_ref.will_expire_soon())
+
+    def test_service_catalog_created_lazily(self):
+        with mock.patch.object(service_catalog.ServiceCatalog, 'factory',
+                               wraps=service_catalog.ServiceCatalog.factory
+                               ) as factory:
+            auth_ref = access.AccessInfo.factory(resp=TOKEN_RESPONSE,
+                                                 body=PROJECT_SCOPED_TOKEN)
+            self.assertEqual(PROJECT_SCOPED_TOKEN['token']['user']['id'],
+                             auth_ref.user_id)
+            self.assertFalse(factory.called)
+
+            sc = auth_ref.service_catalog
+            self.assertIs(sc, auth_ref.service_catalog)
+            self.assertEqual(1, factory.call_count)
+
+        self.assertEqual(auth_ref.auth_token, sc.get_token()['id'])
+
     def test_building_domain_scoped_accessinfo(self):
         auth_ref = access.AccessInfo.factory(resp=TOKEN_RESPONSE,
                                              body=DOMAIN_SCOPED_TOKEN)
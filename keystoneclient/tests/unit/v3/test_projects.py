@@ -14,8 +14,10 @@ import uuid
 
 from keystoneauth1 import exceptions as ksa_exceptions
 
+from keystoneclient import base
 from keystoneclient import exceptions as ksc_exceptions
 from keystoneclient.tests.unit.v3 import utils
+from keystoneclient import utils as utils_
 from keystoneclient.v3 import projects
 
 
@@ -312,3 +314,88 @@ class ProjectTests(utils.ClientTestCase, utils.CrudTests):
         # server, a different implementation might not fail this request.
         self.assertRaises(ksa_exceptions.Forbidden, self.manager.update,
                           ref['id'], **utils.parameterize(req_ref))
+
+    def _project_requests(self):
+        return [(r.method, r.path) for r in self.requests_mock.request_history
+                if '/projects' in r.path]
+
+    def test_find_resource_name_cache(self):
+        self.manager.name_cache = base.NameCache()
+        ref = self.new_ref()
+
+        self.stub_entity('GET', id=ref['name'], status_code=404)
+        self.stub_entity('GET', entity=[ref])
+
+        project = utils_.find_resource(self.manager, ref['name'])
+        self.assertEqual(ref['id'], project.id)
+        self.assertEqual(2, len(self._project_requests()))
+
+        project = utils_.find_resource(self.manager, ref['name'])
+        self.assertIsInstance(project, self.model)
+        self.assertEqual(ref['id'], project.id)
+        self.assertEqual(2, len(self._project_requests()))
+
+        # updating the project through the manager forgets its name
+        self.stub_entity('PATCH', id=ref['id'], entity=ref)
+        self.manager.update(ref['id'], description=uuid.uuid4().hex)
+        utils_.find_resource(self.manager, ref['name'])
+        self.assertEqual(5, len(self._project_requests()))
+
+    def test_name_cache_populated_by_list(self):
+        self.manager.name_cache = base.NameCache()
+        ref = self.new_ref()
+
+        self.stub_entity('GET', entity=[ref])
+        self.manager.list()
+
+        project = utils_.find_resource(self.manager, ref['name'],
+                                       domain=ref['domain_id'])
+        self.assertEqual(ref['id'], project.id)
+        self.assertEqual(1, len(self._project_requests()))
+
+        self.stub_entity('DELETE', id=ref['id'], status_code=204)
+        self.manager.delete(ref['id'])
+        self.assertIsNone(self.manager.name_cache.get(
+            self.model, ref['domain_id'], ref['name']))
+
+    def test_name_cache_without_domain(self):
+        self.manager.name_cache = base.NameCache()
+        ref = self.new_ref()
+        other = self.new_ref(name=ref['name'])
+        unique = self.new_ref()
+
+        self.stub_entity('GET', entity=[ref, other, unique])
+        self.manager.list()
+
+        project = utils_.find_resource(self.manager, unique['name'])
+        self.assertEqual(unique['id'], project.id)
+        self.assertEqual(1, len(self._project_requests()))
+
+        # the name is used in two domains so it must be resolved by the server
+        self.assertIsNone(self.manager.name_cache.get(
+            self.model, None, ref['name']))
+
+    def test_name_cache_forgets_name_used_in_another_domain(self):
+        self.manager.name_cache = base.NameCache()
+        ref = self.new_ref()
+        other = self.new_ref(name=ref['name'])
+
+        self.stub_entity('GET', entity=[ref])
+        self.manager.list()
+
+        self.stub_entity('POST', entity=other, status_code=201)
+        self.manager.create(name=other['name'], domain=other['domain_id'])
+
+        self.stub_entity('GET', id=ref['name'], status_code=404)
+        self.stub_entity('GET', entity=[ref, other])
+        self.assertRaises(ksc_exceptions.CommandError,
+                          utils_.find_resource, self.manager, ref['name'])
+
+    def test_name_cache_not_populated_by_filtered_list(self):
+        self.manager.name_cache = base.NameCache()
+
+        self.stub_entity('GET', entity=[self.new_ref()])
+        self.manager.list(parent=uuid.uuid4().hex)
+        self.manager.list(enabled=True)
+
+        self.assertEqual(0, len(self.manager.name_cache))
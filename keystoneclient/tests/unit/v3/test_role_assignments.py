@@ -108,6 +108,53 @@ class RoleAssignmentsTests(utils.ClientTestCase, utils.CrudTests):
         kwargs = {}
         self.assertQueryStringContains(**kwargs)
 
+    def test_all_assignments_stream(self):
+        ref_list = self.TEST_ALL_RESPONSE_LIST
+        self.stub_entity('GET',
+                         [self.collection_key,
+                          '?user.id=%s' % self.TEST_USER_ID],
+                         entity=ref_list)
+
+        returned = self.manager.list(user=self.TEST_USER_ID, stream=True)
+        self.assertNotIsInstance(returned, list)
+
+        returned_list = list(returned)
+        self._assert_returned_list(ref_list, returned_list)
+        self.assertEqual(ref_list, [r.to_dict() for r in returned_list])
+        self.assertQueryStringContains(**{'user.id': self.TEST_USER_ID})
+
+    def test_stream_body_not_logged(self):
+        ref_list = self.TEST_ALL_RESPONSE_LIST
+        self.stub_entity('GET',
+                         [self.collection_key,
+                          '?user.id=%s' % self.TEST_USER_ID],
+                         entity=ref_list)
+
+        returned = self.manager.list(user=self.TEST_USER_ID, stream=True)
+        self._assert_returned_list(ref_list, list(returned))
+
+        self.assertNotIn(ref_list[0]['role']['id'], self.logger.output)
+
+    def test_all_assignments_as_tuples(self):
+        ref_list = self.TEST_ALL_RESPONSE_LIST
+        self.stub_entity('GET',
+                         [self.collection_key],
+                         entity=ref_list)
+
+        returned_list = self.manager.list(
+            as_tuples=['role.id', 'user.id', 'scope.project.id'])
+
+        self.assertEqual(len(ref_list), len(returned_list))
+        for ref, row in zip(ref_list, returned_list):
+            self.assertEqual(ref['role']['id'], row.role_id)
+            self.assertEqual(ref.get('user', {}).get('id'), row.user_id)
+            self.assertEqual(ref['scope'].get('project', {}).get('id'),
+                             row.scope_project_id)
+
+    def test_stream_and_paginate(self):
+        self.assertRaises(ValueError, self.manager.list,
+                          stream=True, paginate=True)
+
     def test_project_assignments_list(self):
         ref_list = self.TEST_GROUP_PROJECT_LIST + self.TEST_USER_PROJECT_LIST
         self.stub_entity('GET',
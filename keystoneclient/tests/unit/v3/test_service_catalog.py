@@ -11,6 +11,7 @@
 # under the License.
 
 from keystoneauth1 import fixture
+import mock
 
 from keystoneclient import access
 from keystoneclient import exceptions
@@ -226,6 +227,51 @@ class ServiceCatalogTest(utils.TestCase):
                           service_type='compute', service_name='NotExist',
                           endpoint_type='public')
 
+    def test_service_catalog_index_reused(self):
+        auth_ref = access.AccessInfo.factory(None, self.AUTH_RESPONSE_BODY)
+        sc = auth_ref.service_catalog
+
+        with mock.patch.object(sc, '_filter_endpoints',
+                               wraps=sc._filter_endpoints) as m:
+            for _ in range(3):
+                url = sc.url_for(service_type='image', region_name='North')
+                self.assertEqual(self.north_endpoints['public'], url)
+
+            # publicURL normalizes to the same lookup as public
+            sc.url_for(service_type='image', region_name='North',
+                       endpoint_type='publicURL')
+
+        self.assertEqual(1, m.call_count)
+
+    def test_service_catalog_index_result_copied(self):
+        auth_ref = access.AccessInfo.factory(None, self.AUTH_RESPONSE_BODY)
+        sc = auth_ref.service_catalog
+
+        endpoints = sc.get_endpoints(service_type='image')
+        endpoints['image'].pop()
+        del endpoints['image']
+
+        endpoints = sc.get_endpoints(service_type='image')
+        self.assertEqual(6, len(endpoints['image']))
+
+    def test_service_catalog_index_invalidated(self):
+        auth_ref = access.AccessInfo.factory(None, self.AUTH_RESPONSE_BODY)
+        sc = auth_ref.service_catalog
+        catalog_key = 'catalog' if 'catalog' in auth_ref else 'serviceCatalog'
+
+        self.assertIsNotNone(sc.get_urls(service_type='image'))
+
+        images = [s for s in auth_ref[catalog_key] if s['type'] == 'image']
+        auth_ref[catalog_key] = [s for s in auth_ref[catalog_key]
+                                 if s['type'] != 'image']
+        self.assertIsNone(sc.get_urls(service_type='image'))
+
+        # modifying the catalog in place is picked up on explicit request
+        auth_ref[catalog_key].insert(0, images[0])
+        auth_ref[catalog_key].pop()
+        sc.invalidate_index()
+        self.assertIsNotNone(sc.get_urls(service_type='image'))
+
 
 class ServiceCatalogV3Test(ServiceCatalogTest):
 
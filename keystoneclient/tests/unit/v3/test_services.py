@@ -12,6 +12,7 @@
 
 import uuid
 
+from keystoneclient import base
 from keystoneclient.tests.unit.v3 import utils
 from keystoneclient.v3 import services
 
@@ -31,6 +32,15 @@ class ServiceTests(utils.ClientTestCase, utils.CrudTests):
         kwargs.setdefault('enabled', True)
         return kwargs
 
+    def test_name_cache_not_populated(self):
+        # service names aren't unique so they are never cached
+        self.manager.name_cache = base.NameCache()
+
+        self.stub_entity('GET', entity=[self.new_ref()])
+        self.manager.list()
+
+        self.assertEqual(0, len(self.manager.name_cache))
+
     def test_list_filter_name(self):
         filter_name = uuid.uuid4().hex
         expected_query = {'name': filter_name}
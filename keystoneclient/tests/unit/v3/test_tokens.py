@@ -10,14 +10,19 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
 import uuid
 
 from keystoneauth1 import exceptions
+from keystoneauth1 import fixture
+import mock
+from oslo_utils import timeutils
 import testresources
 
 from keystoneclient import access
 from keystoneclient.tests.unit import client_fixtures
 from keystoneclient.tests.unit.v3 import utils
+from keystoneclient import validation_cache
 
 
 class TokenTests(utils.ClientTestCase, testresources.ResourcedTestCase):
@@ -153,6 +158,89 @@ class TokenTests(utils.ClientTestCase, testresources.ResourcedTestCase):
         self.client.tokens.validate(token_id, allow_expired=True)
         self.assertQueryStringIs('allow_expired=1')
 
+    def _stub_validation(self, token_id, expires=None):
+        token_ref = fixture.V3Token(expires=expires)
+        token_ref.set_project_scope()
+        self.stub_url('GET', ['auth', 'tokens'],
+                      headers={'X-Subject-Token': token_id, }, json=token_ref)
+        return token_ref
+
+    def _token_requests(self):
+        return [r.method for r in self.requests_mock.request_history
+                if 'X-Subject-Token' in r.headers]
+
+    def test_validate_token_cached(self):
+        token_id = uuid.uuid4().hex
+        token_ref = self._stub_validation(token_id)
+        self.client.tokens.cache = validation_cache.ValidationCache()
+
+        for _ in range(3):
+            access_info = self.client.tokens.validate(token_id)
+            self.assertEqual(token_id, access_info.auth_token)
+            self.assertEqual(token_ref.project_id, access_info.project_id)
+
+        self.assertEqual(['GET'], self._token_requests())
+
+        # the flags are part of the cache key
+        self.client.tokens.validate(token_id, include_catalog=False)
+        self.assertQueryStringIs('nocatalog')
+        self.assertEqual(['GET', 'GET'], self._token_requests())
+
+    def test_validate_token_cache_limited_by_expiry(self):
+        token_id = uuid.uuid4().hex
+        expires = timeutils.utcnow() + datetime.timedelta(seconds=30)
+        self._stub_validation(token_id, expires=expires)
+
+        backend = mock.Mock(wraps=validation_cache.MemoryBackend())
+        self.client.tokens.cache = validation_cache.ValidationCache(
+            backend=backend, ttl=300)
+        self.client.tokens.validate(token_id)
+
+        ttl = backend.set.call_args[0][2]
+        self.assertLessEqual(ttl, 30)
+        self.assertGreater(ttl, 25)
+
+    def test_revoke_token_invalidates_cache(self):
+        token_id = uuid.uuid4().hex
+        self._stub_validation(token_id)
+        self.stub_url('DELETE', ['/auth/tokens'], status_code=204)
+        self.client.tokens.cache = validation_cache.ValidationCache()
+
+        self.client.tokens.validate(token_id)
+        self.client.tokens.revoke_token(token_id)
+        self.client.tokens.validate(token_id)
+
+        self.assertEqual(['GET', 'DELETE', 'GET'], self._token_requests())
+
+    def test_validate_many(self):
+        token_ids = [uuid.uuid4().hex for _ in range(3)]
+        token_refs = {}
+
+        def _validate(request, context):
+            token_id = request.headers['X-Subject-Token']
+            if token_id not in token_refs:
+                context.status_code = 404
+                return {}
+            return token_refs[token_id]
+
+        for token_id in token_ids[:2]:
+            token_refs[token_id] = fixture.V3Token()
+        self.requests_mock.get(self.TEST_URL + '/auth/tokens', json=_validate)
+
+        token = access.AccessInfoV3(token_ids[1],
+                                    token_refs[token_ids[1]]['token'])
+        results = self.client.tokens.validate_many(
+            [token_ids[0], token, token_ids[2], token_ids[1]],
+            concurrency=2)
+
+        self.assertEqual(4, len(results))
+        self.assertEqual(token_ids[0], results[0].auth_token)
+        self.assertEqual(token_refs[token_ids[0]].user_id, results[0].user_id)
+        self.assertEqual(token_ids[1], results[1].auth_token)
+        self.assertIsInstance(results[2], exceptions.NotFound)
+        self.assertIs(results[1], results[3])
+        self.assertEqual(['GET'] * 3, self._token_requests())
+
 
 def load_tests(loader, tests, pattern):
     return testresources.OptimisingTestSuite(tests)
@@ -15,6 +15,7 @@
 import mock
 import uuid
 
+from keystoneclient import base
 from keystoneclient import exceptions
 from keystoneclient.tests.unit.v3 import utils
 from keystoneclient.v3 import users
@@ -62,6 +63,126 @@ class UserTests(utils.ClientTestCase, utils.CrudTests):
         self.assertEqual(len(ref_list), len(returned_list))
         [self.assertIsInstance(r, self.model) for r in returned_list]
 
+    def test_iter_list_follows_next_links(self):
+        first_page = [self.new_ref(), self.new_ref()]
+        second_page = [self.new_ref()]
+        next_url = '%s/users?page=2' % self.TEST_URL
+
+        body = self.encode(first_page)
+        body['links'] = {'next': next_url}
+        self.stub_url('GET', [self.collection_key], json=body)
+        body = self.encode(second_page)
+        body['links'] = {'next': None}
+        self.requests_mock.get(next_url, json=body)
+
+        def _user_requests():
+            return [r.url for r in self.requests_mock.request_history
+                    if '/users' in r.path]
+
+        users_iter = self.manager.iter_list()
+        self.assertEqual([], _user_requests())
+
+        self.assertEqual(first_page[0]['id'], next(users_iter).id)
+        self.assertEqual(1, len(_user_requests()))
+
+        returned = [first_page[0]['id']] + [u.id for u in users_iter]
+        self.assertEqual([r['id'] for r in first_page + second_page],
+                         returned)
+        self.assertEqual(2, len(_user_requests()))
+        self.assertQueryStringIs('page=2')
+
+    def test_iter_list_uses_marker(self):
+        first_page = [self.new_ref(), self.new_ref()]
+        second_page = [self.new_ref()]
+
+        self.stub_entity('GET', [self.collection_key], entity=first_page)
+        self.requests_mock.get(
+            '%s/users?limit=2&marker=%s' % (self.TEST_URL,
+                                            first_page[-1]['id']),
+            json=self.encode(second_page))
+
+        returned = list(self.manager.iter_list(limit=2))
+        self.assertEqual([r['id'] for r in first_page + second_page],
+                         [u.id for u in returned])
+        self.assertQueryStringContains(limit='2',
+                                       marker=first_page[-1]['id'])
+
+    def test_iter_list_marker_ignored(self):
+        ref_list = [self.new_ref(), self.new_ref()]
+        self.stub_entity('GET', [self.collection_key], entity=ref_list)
+
+        returned = list(self.manager.iter_list(limit=2))
+
+        self.assertEqual([r['id'] for r in ref_list],
+                         [u.id for u in returned])
+        self.assertQueryStringContains(marker=ref_list[-1]['id'])
+
+    def test_iter_list_limit_ignored(self):
+        ref_list = [self.new_ref(), self.new_ref(), self.new_ref()]
+        self.stub_entity('GET', [self.collection_key], entity=ref_list)
+
+        returned = list(self.manager.iter_list(limit=2))
+
+        self.assertEqual([r['id'] for r in ref_list],
+                         [u.id for u in returned])
+        self.assertEqual(1, len([r for r in self.requests_mock.request_history
+                                 if '/users' in r.path]))
+
+    def test_list_paginate_users_in_group(self):
+        group_id = uuid.uuid4().hex
+        ref_list = [self.new_ref(), self.new_ref()]
+
+        self.stub_entity('GET',
+                         ['groups', group_id, self.collection_key],
+                         entity=ref_list)
+
+        returned = self.manager.list(group=group_id, paginate=True)
+        self.assertNotIsInstance(returned, list)
+        self.assertEqual([r['id'] for r in ref_list],
+                         [u.id for u in returned])
+
+    def test_list_compact(self):
+        ref_list = [self.new_ref(), self.new_ref()]
+        self.stub_entity('GET', entity=ref_list)
+
+        returned_list = self.manager.list(compact=True)
+
+        self.assertEqual(ref_list, [u.to_dict() for u in returned_list])
+        for ref, user in zip(ref_list, returned_list):
+            self.assertIsInstance(user, base.CompactResource)
+            self.assertEqual('User', type(user).__name__)
+            self.assertEqual(ref['name'], user.name)
+
+        self.stub_url('DELETE', [self.collection_key, ref_list[0]['id']],
+                      status_code=204)
+        returned_list[0].delete()
+
+    def test_list_raw(self):
+        ref_list = [self.new_ref(), self.new_ref()]
+        self.stub_entity('GET', entity=ref_list)
+
+        self.assertEqual(ref_list, self.manager.list(raw=True))
+
+    def test_list_as_tuples(self):
+        ref_list = [self.new_ref(), self.new_ref()]
+        self.stub_entity('GET', entity=ref_list)
+
+        returned_list = self.manager.list(as_tuples=['id', 'name', 'email'])
+
+        self.assertEqual([(r['id'], r['name'], None) for r in ref_list],
+                         returned_list)
+        self.assertEqual(ref_list[0]['name'], returned_list[0].name)
+        self.assertIsNone(returned_list[0].email)
+
+    def test_list_as_tuples_string(self):
+        self.assertRaises(ValueError, self.manager.list, as_tuples='id')
+
+    def test_list_modes_exclusive(self):
+        self.assertRaises(ValueError, self.manager.list,
+                          raw=True, as_tuples=['id'])
+        self.assertRaises(ValueError, self.manager.list,
+                          raw=True, compact=True)
+
     def test_check_user_in_group(self):
         group_id = uuid.uuid4().hex
         ref = self.new_ref()
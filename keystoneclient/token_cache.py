@@ -0,0 +1,156 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""A cache of tokens kept in files so that they outlive the process.
+
+Command line tools authenticate on every run. Keeping the token in a file
+lets the following runs reuse it until it is about to expire::
+
+    from keystoneclient import token_cache
+
+    cache = token_cache.FileTokenCache()
+
+    # with an identity auth plugin
+    auth = v3.Password(auth_url=..., username=..., password=...)
+    auth.token_cache = cache
+
+    # or with the legacy clients
+    client = v3_client.Client(..., token_cache=cache)
+
+Tokens are stored as JSON, unlike the ``use_keyring`` option of the legacy
+clients that pickles them into the system keyring. Each entry is kept in its
+own file, readable only by the user, named by a hash of the key so that no
+credentials appear in file names.
+"""
+
+import logging
+import os
+
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
+
+from keystoneclient import _fileutils
+from keystoneclient import access
+from keystoneclient.i18n import _
+
+
+_logger = logging.getLogger(__name__)
+
+_FORMAT_VERSION = 1
+
+
+def dumps(auth_ref):
+    """Serialize an AccessInfo to a compact JSON string.
+
+    :param auth_ref: The token to serialize.
+    :type auth_ref: :py:class:`keystoneclient.access.AccessInfo`
+
+    :rtype: str
+    """
+    return jsonutils.dumps({'format': _FORMAT_VERSION,
+                            'expires': auth_ref.expires_timestamp,
+                            'access': dict(auth_ref)},
+                           separators=(',', ':'))
+
+
+def _load_entry(data):
+    entry = jsonutils.loads(data)
+    if entry.get('format') != _FORMAT_VERSION:
+        raise ValueError(_('Unknown token cache format %r') %
+                         entry.get('format'))
+    return entry
+
+
+def _create_access(body):
+    if body.get('version') == 'v3':
+        # the token is kept in the body as auth_token.
+        return access.AccessInfoV3(None, **body)
+    return access.AccessInfoV2(**body)
+
+
+def loads(data):
+    """Create an AccessInfo from a string created by :py:func:`dumps`.
+
+    :raises ValueError: if data isn't a serialized token.
+    :rtype: :py:class:`keystoneclient.access.AccessInfo`
+    """
+    return _create_access(_load_entry(data)['access'])
+
+
+class FileTokenCache(object):
+    """Tokens kept in files, shared between processes.
+
+    Readers take a shared lock and writers an exclusive one on the lock file
+    of a key, and files are replaced atomically. Where the platform doesn't
+    support flock only the atomic replacement is relied on. Errors reading or
+    writing the files are logged and otherwise ignored, the cache never
+    causes authentication to fail.
+
+    :param str directory: The directory to keep the files in. It is created,
+                          readable only by the user, if it doesn't exist.
+                          (optional, defaults to ``keystoneclient/tokens``
+                          in the user's cache directory)
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or _fileutils.default_directory('tokens')
+
+    def _path(self, key, suffix='.json'):
+        return _fileutils.key_path(self.directory, key, suffix)
+
+    def get(self, key, stale_duration=access.STALE_TOKEN_DURATION):
+        """Return the token cached for key or None.
+
+        :param str key: The key the token was stored with.
+        :param int stale_duration: Tokens that expire within this many
+                                   seconds are not returned.
+                                   (optional, defaults to 30)
+
+        :rtype: :py:class:`keystoneclient.access.AccessInfo`
+        """
+        try:
+            with _fileutils.locked(self._path(key, '.lock'), shared=True):
+                with open(self._path(key)) as f:
+                    data = f.read()
+        except (IOError, OSError):
+            return None
+
+        try:
+            entry = _load_entry(data)
+            # NOTE: check the expiry before creating the AccessInfo so that
+            # a stale token costs no more than reading the file.
+            if (entry['expires'] - stale_duration <=
+                    timeutils.utcnow_ts(microsecond=True)):
+                return None
+            return _create_access(entry['access'])
+        except Exception as e:
+            _logger.debug('Ignoring unreadable cached token %s: %s',
+                          self._path(key), e)
+            return None
+
+    def set(self, key, auth_ref):
+        """Store a token under key, replacing any token already stored."""
+        path = self._path(key)
+
+        try:
+            with _fileutils.locked(self._path(key, '.lock')):
+                _fileutils.write_atomic(path, dumps(auth_ref))
+        except (IOError, OSError) as e:
+            _logger.warning('Failed to store token in %s: %s', path, e)
+
+    def delete(self, key):
+        """Remove the token stored under key, if any."""
+        try:
+            with _fileutils.locked(self._path(key, '.lock')):
+                os.unlink(self._path(key))
+        except OSError:  # nosec: there is no token to remove
+            pass
@@ -13,16 +13,44 @@
 import getpass
 import hashlib
 import sys
+import threading
 
 from keystoneauth1 import exceptions as ksa_exceptions
 from oslo_utils import timeutils
 import six
 
+from keystoneclient import base
 from keystoneclient import exceptions as ksc_exceptions
 
 
-def find_resource(manager, name_or_id):
-    """Helper for the _find_* methods."""
+def find_resource(manager, name_or_id, domain=None):
+    """Helper for the _find_* methods.
+
+    If the manager has a ``name_cache`` and its resources have names that are
+    unique within a domain, a name that has been resolved before is returned
+    without contacting the server, as a resource that will load its
+    remaining attributes when they are first accessed.
+
+    :param domain: Only find resources with this name in the given domain.
+                   (optional)
+    """
+    name_cache = None
+    if getattr(manager, 'unique_names', False):
+        name_cache = getattr(manager, 'name_cache', None)
+    domain_id = base.getid(domain)
+    if isinstance(name_or_id, six.binary_type):
+        name = name_or_id.decode('utf-8', 'strict')
+    else:
+        name = name_or_id
+
+    if name_cache is not None:
+        resource_id = name_cache.get(manager.resource_class, domain_id, name)
+        if resource_id is not None:
+            info = {'id': resource_id, 'name': name}
+            if domain_id is not None:
+                info['domain_id'] = domain_id
+            return manager.resource_class(manager, info, loaded=False)
+
     # first try the entity as a string
     try:
         return manager.get(name_or_id)
@@ -31,20 +59,74 @@ def find_resource(manager, name_or_id):
         pass
 
     # finally try to find entity by name
+    find_args = {'name': name}
+    if domain_id is not None:
+        find_args['domain_id'] = domain_id
+
     try:
-        if isinstance(name_or_id, six.binary_type):
-            name_or_id = name_or_id.decode('utf-8', 'strict')
-        return manager.find(name=name_or_id)
+        obj = manager.find(**find_args)
     except ksa_exceptions.NotFound:
         msg = ("No %s with a name or ID of '%s' exists." %
-               (manager.resource_class.__name__.lower(), name_or_id))
+               (manager.resource_class.__name__.lower(), name))
         raise ksc_exceptions.CommandError(msg)
     except ksc_exceptions.NoUniqueMatch:
         msg = ("Multiple %s matches found for '%s', use an ID to be more"
                " specific." % (manager.resource_class.__name__.lower(),
-                               name_or_id))
+                               name))
         raise ksc_exceptions.CommandError(msg)
 
+    if name_cache is not None:
+        # find() guarantees the name was unique within the given domain.
+        name_cache.set(manager.resource_class, domain_id, name, obj.id)
+
+    return obj
+
+
+def map_concurrently(func, items, concurrency=1):
+    """Call func with each of items using a bounded pool of threads.
+
+    :param func: The function to call with each item.
+    :param list items: The arguments to call func with.
+    :param int concurrency: The maximum number of calls to make at once.
+
+    :returns: A list with the return value of func for each item, in the order
+              of items. If a call raised an exception the exception is
+              returned in its place instead.
+    :rtype: list
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1')
+
+    items = list(items)
+    results = [None] * len(items)
+    indexes = iter(range(len(items)))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                try:
+                    i = next(indexes)
+                except StopIteration:
+                    return
+
+            try:
+                results[i] = func(items[i])
+            except Exception as e:
+                results[i] = e
+
+    threads = [threading.Thread(target=worker)
+               for _ in range(min(concurrency, len(items)))]
+
+    for t in threads:
+        t.daemon = True
+        t.start()
+
+    for t in threads:
+        t.join()
+
+    return results
+
 
 def hash_signed_token(signed_text, mode='md5'):
     hash_ = hashlib.new(mode)
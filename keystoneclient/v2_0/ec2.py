@@ -27,6 +27,7 @@ class EC2(base.Resource):
 
 class CredentialsManager(base.ManagerWithFind):
     resource_class = EC2
+    list_filters = {'user_id': 'user_id'}
 
     def create(self, user_id, tenant_id):
         """Create a new access/secret pair for the user/tenant pair.
@@ -15,6 +15,7 @@
 #    under the License.
 
 from keystoneauth1 import plugin
+from oslo_utils import encodeutils
 from six.moves import urllib
 
 from keystoneclient import base
@@ -75,6 +76,7 @@ class TenantManager(base.ManagerWithFind):
     """Manager class for manipulating Keystone tenants."""
 
     resource_class = Tenant
+    list_filters = {'name': 'name'}
 
     def __init__(self, client, role_manager, user_manager):
         super(TenantManager, self).__init__(client)
@@ -129,6 +131,22 @@ class TenantManager(base.ManagerWithFind):
 
         return tenant_list
 
+    def _list_candidates(self, name=None, **filters):
+        if name is None:
+            return super(TenantManager, self)._list_candidates(**filters)
+
+        # NOTE: the admin API returns the tenant with this name, the public
+        # API ignores the name and lists all the tenants of the token.
+        query = urllib.parse.urlencode(
+            {'name': encodeutils.safe_encode(name)})
+        url = '/tenants?%s' % query
+        try:
+            return self._query_candidates(url, 'tenant', 'tenants')
+        except exceptions.EndpointNotFound:
+            endpoint_filter = {'interface': plugin.AUTH_INTERFACE}
+            return self._query_candidates(url, 'tenant', 'tenants',
+                                          endpoint_filter=endpoint_filter)
+
     def update(self, tenant_id, tenant_name=None, description=None,
                enabled=None, **kwargs):
         """Update a tenant with a new name and description."""
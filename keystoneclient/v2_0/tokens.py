@@ -10,12 +10,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 from keystoneauth1 import exceptions
 from keystoneauth1 import plugin
 
 from keystoneclient import access
 from keystoneclient import base
 from keystoneclient.i18n import _
+from keystoneclient import utils
+
+
+def _calc_id(token):
+    if isinstance(token, access.AccessInfo):
+        return token.auth_token
+
+    return base.getid(token)
 
 
 class Token(base.Resource):
@@ -84,6 +94,30 @@ class TokenManager(base.Manager):
         """
         return self._get('/tokens/%s' % base.getid(token), 'access')
 
+    def validate_many(self, tokens, concurrency=4):
+        """Validate a batch of tokens concurrently.
+
+        Each distinct token is validated once, using up to ``concurrency``
+        requests at a time over the manager's session.
+
+        :param tokens: The tokens to be validated. These can be instances of
+                       :py:class:`keystoneclient.access.AccessInfo`,
+                       :py:class:`.Token` or string token IDs.
+        :param int concurrency: The maximum number of validations to run at
+                                once. (optional, defaults to 4)
+
+        :returns: A list with an entry for each of tokens in the same order.
+                  Each entry is either the :py:class:`.Token` or the
+                  exception raised while validating it.
+        :rtype: list
+        """
+        token_ids = [_calc_id(token) for token in tokens]
+        unique_ids = list(collections.OrderedDict.fromkeys(token_ids))
+
+        results = dict(zip(unique_ids, utils.map_concurrently(
+            self.validate, unique_ids, concurrency=concurrency)))
+        return [results[token_id] for token_id in token_ids]
+
     def get_token_data(self, token):
         """Fetch the data about a token from the identity server.
 
@@ -105,12 +139,7 @@ class TokenManager(base.Manager):
         :rtype: :py:class:`keystoneclient.access.AccessInfoV2`
 
         """
-        def calc_id(token):
-            if isinstance(token, access.AccessInfo):
-                return token.auth_token
-            return base.getid(token)
-
-        token_id = calc_id(token)
+        token_id = _calc_id(token)
         body = self.get_token_data(token_id)
         return access.AccessInfo.factory(auth_token=token_id, body=body)
 
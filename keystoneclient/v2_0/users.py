@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_utils import encodeutils
 from six.moves import urllib
 
 from keystoneclient import base
@@ -37,6 +38,7 @@ class UserManager(base.ManagerWithFind):
     """Manager class for manipulating Keystone users."""
 
     resource_class = User
+    list_filters = {'name': 'name'}
 
     def __init__(self, client, role_manager):
         super(UserManager, self).__init__(client)
@@ -126,6 +128,14 @@ class UserManager(base.ManagerWithFind):
             return self._list("/tenants/%s/users%s" % (tenant_id, query),
                               "users")
 
+    def _list_candidates(self, name=None, **filters):
+        if name is None:
+            return super(UserManager, self)._list_candidates(**filters)
+
+        query = urllib.parse.urlencode(
+            {'name': encodeutils.safe_encode(name)})
+        return self._query_candidates('/users?%s' % query, 'user', 'users')
+
     def list_roles(self, user, tenant=None):
         return self.role_manager.roles_for_user(base.getid(user),
                                                 base.getid(tenant))
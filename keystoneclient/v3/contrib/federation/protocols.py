@@ -103,7 +103,11 @@ class ProtocolManager(base.CrudManager):
 
         """
         return super(ProtocolManager, self).list(
-            identity_provider_id=base.getid(identity_provider), **kwargs)
+            **self._list_kwargs(identity_provider, **kwargs))
+
+    def _list_kwargs(self, identity_provider, **kwargs):
+        return dict(identity_provider_id=base.getid(identity_provider),
+                    **kwargs)
 
     def update(self, identity_provider, protocol, mapping, **kwargs):
         """Update Protocol object tied to the Identity Provider.
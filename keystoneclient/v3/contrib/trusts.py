@@ -87,11 +87,14 @@ class TrustManager(base.CrudManager):
 
     def list(self, trustee_user=None, trustor_user=None, **kwargs):
         """List Trusts."""
-        trustee_user_id = base.getid(trustee_user)
-        trustor_user_id = base.getid(trustor_user)
-        return super(TrustManager, self).list(trustee_user_id=trustee_user_id,
-                                              trustor_user_id=trustor_user_id,
-                                              **kwargs)
+        return super(TrustManager, self).list(
+            **self._list_kwargs(trustee_user=trustee_user,
+                                trustor_user=trustor_user, **kwargs))
+
+    def _list_kwargs(self, trustee_user=None, trustor_user=None, **kwargs):
+        return dict(trustee_user_id=base.getid(trustee_user),
+                    trustor_user_id=base.getid(trustor_user),
+                    **kwargs)
 
     def get(self, trust):
         """Get a specific trust."""
@@ -36,6 +36,7 @@ class DomainManager(base.CrudManager):
 
     resource_class = Domain
     collection_key = 'domains'
+    unique_names = True
     key = 'domain'
 
     def create(self, name, description=None, enabled=True, **kwargs):
@@ -113,16 +113,21 @@ class EndpointManager(base.CrudManager):
         :rtype: list of :class:`keystoneclient.v3.endpoints.Endpoint`
 
         """
+        return super(EndpointManager, self).list(**self._list_kwargs(
+            service=service, interface=interface, region=region,
+            enabled=enabled, region_id=region_id, **kwargs))
+
+    def _list_kwargs(self, service=None, interface=None, region=None,
+                     enabled=None, region_id=None, **kwargs):
         # NOTE(lhcheng): region filter is not supported by keystone,
         # region_id should be used instead. Consider removing the
         # region argument in the next release.
         self._validate_interface(interface)
-        return super(EndpointManager, self).list(
-            service_id=base.getid(service),
-            interface=interface,
-            region_id=region_id or base.getid(region),
-            enabled=enabled,
-            **kwargs)
+        return dict(service_id=base.getid(service),
+                    interface=interface,
+                    region_id=region_id or base.getid(region),
+                    enabled=enabled,
+                    **kwargs)
 
     def update(self, endpoint, service=None, url=None, interface=None,
                region=None, enabled=None, **kwargs):
@@ -49,6 +49,7 @@ class GroupManager(base.CrudManager):
 
     resource_class = Group
     collection_key = 'groups'
+    unique_names = True
     key = 'group'
 
     def create(self, name, domain=None, description=None, **kwargs):
@@ -84,14 +85,17 @@ class GroupManager(base.CrudManager):
         :rtype: list of :class:`keystoneclient.v3.groups.Group`.
 
         """
+        return super(GroupManager, self).list(
+            **self._list_kwargs(user=user, domain=domain, **kwargs))
+
+    def _list_kwargs(self, user=None, domain=None, **kwargs):
         if user:
             base_url = '/users/%s' % base.getid(user)
         else:
             base_url = None
-        return super(GroupManager, self).list(
-            base_url=base_url,
-            domain_id=base.getid(domain),
-            **kwargs)
+        return dict(base_url=base_url,
+                    domain_id=base.getid(domain),
+                    **kwargs)
 
     def get(self, group):
         """Retrieve a group.
@@ -58,6 +58,7 @@ class ProjectManager(base.CrudManager):
 
     resource_class = Project
     collection_key = 'projects'
+    unique_names = True
     key = 'project'
 
     def create(self, name, domain, description=None,
@@ -106,12 +107,15 @@ class ProjectManager(base.CrudManager):
         :rtype: list of :class:`keystoneclient.v3.projects.Project`
 
         """
-        base_url = '/users/%s' % base.getid(user) if user else None
         return super(ProjectManager, self).list(
-            base_url=base_url,
-            domain_id=base.getid(domain),
-            fallback_to_auth=True,
-            **kwargs)
+            **self._list_kwargs(domain=domain, user=user, **kwargs))
+
+    def _list_kwargs(self, domain=None, user=None, **kwargs):
+        base_url = '/users/%s' % base.getid(user) if user else None
+        return dict(base_url=base_url,
+                    domain_id=base.getid(domain),
+                    fallback_to_auth=True,
+                    **kwargs)
 
     def _check_not_parents_as_ids_and_parents_as_list(self, parents_as_ids,
                                                       parents_as_list):
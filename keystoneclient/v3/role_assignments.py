@@ -48,7 +48,8 @@ class RoleAssignmentManager(base.CrudManager):
 
     def list(self, user=None, group=None, project=None, domain=None, role=None,
              effective=False, os_inherit_extension_inherited_to=None,
-             include_subtree=False, include_names=False):
+             include_subtree=False, include_names=False, paginate=False,
+             stream=False, compact=False, raw=False, as_tuples=None):
         """List role assignments.
 
         If no arguments are provided, all role assignments in the
@@ -73,7 +74,34 @@ class RoleAssignmentManager(base.CrudManager):
         :param boolean include_subtree: Include subtree (optional)
         :param boolean include_names: Display names instead
                                       of IDs. (optional)
+        :param boolean paginate: Return a generator that retrieves the
+                                 assignments a page at a time. (optional)
+        :param boolean stream: Return a generator that decodes the
+                               assignments as they are received. (optional)
+        :param boolean compact: Return read only compact resources.
+                                (optional)
+        :param boolean raw: Return the assignments as dicts. (optional)
+        :param list as_tuples: Return a named tuple of these fields for each
+                               assignment. (optional)
+
+        The last five are the options of
+        :py:meth:`keystoneclient.base.CrudManager.list`.
         """
+        query_params = self._list_kwargs(
+            user=user, group=group, project=project, domain=domain, role=role,
+            effective=effective,
+            os_inherit_extension_inherited_to=(
+                os_inherit_extension_inherited_to),
+            include_subtree=include_subtree, include_names=include_names)
+
+        return super(RoleAssignmentManager, self).list(
+            paginate=paginate, stream=stream, compact=compact, raw=raw,
+            as_tuples=as_tuples, **query_params)
+
+    def _list_kwargs(self, user=None, group=None, project=None, domain=None,
+                     role=None, effective=False,
+                     os_inherit_extension_inherited_to=None,
+                     include_subtree=False, include_names=False):
         self._check_not_user_and_group(user, group)
         self._check_not_domain_and_project(domain, project)
 
@@ -98,7 +126,7 @@ class RoleAssignmentManager(base.CrudManager):
         if include_subtree:
             query_params['include_subtree'] = include_subtree
 
-        return super(RoleAssignmentManager, self).list(**query_params)
+        return query_params
 
     def create(self, **kwargs):
         raise exceptions.MethodNotImplemented(
@@ -51,6 +51,7 @@ class RoleManager(base.CrudManager):
 
     resource_class = Role
     collection_key = 'roles'
+    unique_names = True
     key = 'role'
     deprecation_msg = 'keystoneclient.v3.roles.InferenceRuleManager'
 
@@ -162,18 +163,23 @@ class RoleManager(base.CrudManager):
         :rtype: list of :class:`keystoneclient.v3.roles.Role`
 
         """
+        return super(RoleManager, self).list(**self._list_kwargs(
+            user=user, group=group, domain=domain, project=project,
+            os_inherit_extension_inherited=os_inherit_extension_inherited,
+            **kwargs))
+
+    def _list_kwargs(self, user=None, group=None, domain=None, project=None,
+                     os_inherit_extension_inherited=False, **kwargs):
         if os_inherit_extension_inherited:
             kwargs['tail'] = '/inherited_to_projects'
         if user or group:
             self._require_user_xor_group(user, group)
             self._require_domain_xor_project(domain, project)
 
-            base_url = self._role_grants_base_url(
+            kwargs['base_url'] = self._role_grants_base_url(
                 user, group, domain, project, os_inherit_extension_inherited)
-            return super(RoleManager, self).list(base_url=base_url,
-                                                 **kwargs)
 
-        return super(RoleManager, self).list(**kwargs)
+        return kwargs
 
     def update(self, role, name=None, **kwargs):
         """Update a role.
@@ -86,11 +86,12 @@ class ServiceManager(base.CrudManager):
         :rtype: list of :class:`keystoneclient.v3.services.Service`
 
         """
-        type_arg = type or kwargs.pop('service_type', None)
         return super(ServiceManager, self).list(
-            name=name,
-            type=type_arg,
-            **kwargs)
+            **self._list_kwargs(name=name, type=type, **kwargs))
+
+    def _list_kwargs(self, name=None, type=None, **kwargs):
+        type_arg = type or kwargs.pop('service_type', None)
+        return dict(name=name, type=type_arg, **kwargs)
 
     def update(self, service, name=None, type=None, enabled=None,
                description=None, **kwargs):
@@ -10,8 +10,11 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import collections
+
 from keystoneclient import access
 from keystoneclient import base
+from keystoneclient import utils
 
 
 def _calc_id(token):
@@ -22,10 +25,18 @@ def _calc_id(token):
 
 
 class TokenManager(object):
-    """Manager class for manipulating Identity tokens."""
+    """Manager class for manipulating Identity tokens.
+
+    :param client: The adapter or client to make requests with.
+    :param cache: A cache for the results of :py:meth:`validate`. Revoking a
+                  token through this manager removes it from the cache.
+                  (optional, defaults to no caching)
+    :type cache: :py:class:`keystoneclient.validation_cache.ValidationCache`
+    """
 
-    def __init__(self, client):
+    def __init__(self, client, cache=None):
         self._client = client
+        self.cache = cache
 
     def revoke_token(self, token):
         """Revoke a token.
@@ -35,6 +46,10 @@ class TokenManager(object):
 
         """
         token_id = _calc_id(token)
+
+        if self.cache is not None:
+            self.cache.invalidate(token_id)
+
         headers = {'X-Subject-Token': token_id}
         return self._client.delete('/auth/tokens', headers=headers)
 
@@ -96,11 +111,67 @@ class TokenManager(object):
                               if it has already expired.
         :type allow_expired: bool
 
+        If a cache is configured on the manager a previous result for the
+        same token and arguments may be returned without contacting the
+        server.
+
         :rtype: :class:`keystoneclient.access.AccessInfoV3`
 
         """
         token_id = _calc_id(token)
+        body = None
+
+        if self.cache is not None:
+            body = self.cache.get(token_id,
+                                  include_catalog=include_catalog,
+                                  allow_expired=allow_expired)
+
+        if body is not None:
+            return access.AccessInfo.factory(auth_token=token_id, body=body)
+
         body = self.get_token_data(token_id,
                                    include_catalog=include_catalog,
                                    allow_expired=allow_expired)
-        return access.AccessInfo.factory(auth_token=token_id, body=body)
+        auth_ref = access.AccessInfo.factory(auth_token=token_id, body=body)
+
+        if self.cache is not None:
+            self.cache.set(token_id, body, auth_ref.expires_timestamp,
+                           include_catalog=include_catalog,
+                           allow_expired=allow_expired)
+
+        return auth_ref
+
+    def validate_many(self, tokens, include_catalog=True, allow_expired=False,
+                      concurrency=4):
+        """Validate a batch of tokens concurrently.
+
+        Each distinct token is validated once, using up to ``concurrency``
+        requests at a time over the manager's session.
+
+        :param tokens: The tokens to be validated.
+        :type tokens: list of str or :class:`keystoneclient.access.AccessInfo`
+        :param include_catalog: If False, the responses are requested to not
+                                include the catalog.
+        :param allow_expired: If True tokens will be validated and returned
+                              if they have already expired.
+        :type allow_expired: bool
+        :param int concurrency: The maximum number of validations to run at
+                                once. (optional, defaults to 4)
+
+        :returns: A list with an entry for each of tokens in the same order.
+                  Each entry is either the
+                  :class:`keystoneclient.access.AccessInfoV3` for the token
+                  or the exception raised while validating it.
+        :rtype: list
+        """
+        token_ids = [_calc_id(token) for token in tokens]
+        unique_ids = list(collections.OrderedDict.fromkeys(token_ids))
+
+        def _validate(token_id):
+            return self.validate(token_id,
+                                 include_catalog=include_catalog,
+                                 allow_expired=allow_expired)
+
+        results = dict(zip(unique_ids, utils.map_concurrently(
+            _validate, unique_ids, concurrency=concurrency)))
+        return [results[token_id] for token_id in token_ids]
@@ -37,6 +37,7 @@ class UserManager(base.CrudManager):
 
     resource_class = User
     collection_key = 'users'
+    unique_names = True
     key = 'user'
 
     def _require_user_and_group(self, user, group):
@@ -123,17 +124,22 @@ class UserManager(base.CrudManager):
           will be used.
 
         """
+        return super(UserManager, self).list(
+            **self._list_kwargs(project=project, domain=domain, group=group,
+                                default_project=default_project, **kwargs))
+
+    def _list_kwargs(self, project=None, domain=None, group=None,
+                     default_project=None, **kwargs):
         default_project_id = base.getid(default_project) or base.getid(project)
         if group:
             base_url = '/groups/%s' % base.getid(group)
         else:
             base_url = None
 
-        return super(UserManager, self).list(
-            base_url=base_url,
-            domain_id=base.getid(domain),
-            default_project_id=default_project_id,
-            **kwargs)
+        return dict(base_url=base_url,
+                    domain_id=base.getid(domain),
+                    default_project_id=default_project_id,
+                    **kwargs)
 
     def get(self, user):
         """Retrieve a user.
@@ -0,0 +1,149 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Client side caching of token validation results.
+
+A :py:class:`ValidationCache` can be attached to a token manager so that
+validating the same token repeatedly doesn't need to contact the identity
+server each time::
+
+    from keystoneclient import validation_cache
+
+    keystone.tokens.cache = validation_cache.ValidationCache(ttl=60)
+
+Validation results are stored in a backend. By default this is a bounded
+in-process :py:class:`MemoryBackend` but any object that provides the
+``get(key)``, ``set(key, value, time)`` and ``delete(key)`` methods of a
+memcache client can be used, allowing the cache to be shared between
+processes.
+"""
+
+import collections
+import hashlib
+import math
+import threading
+
+from oslo_serialization import jsonutils
+from oslo_utils import timeutils
+
+
+class MemoryBackend(object):
+    """A bounded in-process LRU cache with per entry expiry.
+
+    :param int max_size: The maximum number of entries to keep. The least
+                         recently used entries are removed to make room for new
+                         ones. (optional, defaults to 1000)
+    """
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        now = timeutils.utcnow_ts(microsecond=True)
+
+        with self._lock:
+            try:
+                expires, value = self._entries.pop(key)
+            except KeyError:
+                return None
+
+            if expires <= now:
+                return None
+
+            # re-insert to mark it as the most recently used
+            self._entries[key] = (expires, value)
+            return value
+
+    def set(self, key, value, time=0):
+        expires = timeutils.utcnow_ts(microsecond=True) + time
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires, value)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ValidationCache(object):
+    """Cache the token data returned when validating tokens.
+
+    Entries are kept for at most ``ttl`` seconds and never beyond the expiry
+    of the token itself. Tokens are identified by a hash of their ID so that
+    token IDs are not exposed to the cache backend.
+
+    :param backend: The storage to use. Any object with memcache style
+                    ``get``, ``set`` and ``delete`` methods. (optional,
+                    defaults to a :py:class:`MemoryBackend`)
+    :param int ttl: The maximum number of seconds to cache a validation
+                    result for. (optional, defaults to 300)
+    :param str prefix: A prefix for all keys stored in the backend. (optional)
+    """
+
+    # the combinations of (include_catalog, allow_expired) to clear on revoke
+    _FLAGS = ((True, False), (False, False), (True, True), (False, True))
+
+    def __init__(self, backend=None, ttl=300,
+                 prefix='keystoneclient.validation'):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _make_key(self, token_id, include_catalog, allow_expired):
+        token_hash = hashlib.sha256(token_id.encode('utf-8')).hexdigest()
+        return '%s:%s:%d:%d' % (self.prefix, token_hash,
+                                bool(include_catalog), bool(allow_expired))
+
+    def get(self, token_id, include_catalog=True, allow_expired=False):
+        """Return the cached token data for a token or None."""
+        value = self.backend.get(
+            self._make_key(token_id, include_catalog, allow_expired))
+
+        if value is None:
+            return None
+
+        return jsonutils.loads(value)
+
+    def set(self, token_id, body, expires, include_catalog=True,
+            allow_expired=False):
+        """Store the token data for a token.
+
+        :param str token_id: The token the data belongs to.
+        :param dict body: The validation response body.
+        :param float expires: The expiry of the token as a UNIX timestamp.
+        """
+        ttl = min(self.ttl, expires - timeutils.utcnow_ts(microsecond=True))
+
+        if ttl < 1:
+            # memcache can't express sub second expiry and the token is about
+            # to expire anyway.
+            return
+
+        self.backend.set(
+            self._make_key(token_id, include_catalog, allow_expired),
+            jsonutils.dumps(body),
+            int(math.floor(ttl)))
+
+    def invalidate(self, token_id):
+        """Remove all cached data for a token."""
+        for include_catalog, allow_expired in self._FLAGS:
+            self.backend.delete(
+                self._make_key(token_id, include_catalog, allow_expired))
@@ -0,0 +1,122 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Measure connection reuse of a Session shared between threads.
+
+    python tools/benchmarks/connection_pool.py --threads 64 --pool-maxsize 64
+
+A local keep-alive HTTP server, responding after a fixed latency, counts the
+TCP connections it accepts. Each run shares one Session between the worker
+threads and reports how many of the requests were served over an existing
+connection.
+"""
+
+import argparse
+import threading
+import time
+import warnings
+
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+from keystoneclient import session as client_session
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def _run(url, threads, requests, **pool_kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        session = client_session.Session(**pool_kwargs)
+
+    def worker():
+        for _i in range(requests):
+            session.get(url, authenticated=False, log=False)
+
+    workers = [threading.Thread(target=worker) for _i in range(threads)]
+    start = time.time()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.time() - start
+
+    session.session.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=50,
+                        help='requests per thread')
+    parser.add_argument('--pool-maxsize', type=int, default=None,
+                        help='the pool size to compare with the default')
+    parser.add_argument('--pool-block', action='store_true')
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help='seconds the server takes to respond')
+    args = parser.parse_args()
+
+    server = _Server(('127.0.0.1', 0), _Handler)
+    server.lock = threading.Lock()
+    server.latency = args.latency
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = 'http://127.0.0.1:%d/' % server.server_port
+
+    runs = [('default', {}),
+            ('pool_maxsize=%d' % (args.pool_maxsize or args.threads),
+             {'pool_maxsize': args.pool_maxsize or args.threads,
+              'pool_block': args.pool_block})]
+
+    total = args.threads * args.requests
+    print('%d threads, %d requests' % (args.threads, total))
+
+    for name, pool_kwargs in runs:
+        server.connections = 0
+        elapsed = _run(url, args.threads, args.requests, **pool_kwargs)
+        reused = total - server.connections
+        print('%-18s %6d connections  %5.1f%% reused  %8.0f req/s' %
+              (name, server.connections, 100.0 * reused / total,
+               total / elapsed))
+
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
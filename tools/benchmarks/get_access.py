@@ -0,0 +1,103 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Measure BaseIdentityPlugin.get_access throughput across thread counts.
+
+Compares the lock-free fast path against always taking the plugin lock, as
+get_access did before. No network access is required; the plugin returns a
+canned token that is valid for an hour.
+
+    python tools/benchmarks/get_access.py --threads 1 2 4 8 16 64 200
+"""
+
+import argparse
+import threading
+import time
+import warnings
+
+from keystoneauth1 import fixture
+
+from keystoneclient import access
+from keystoneclient.auth.identity import base
+
+
+class _StaticPlugin(base.BaseIdentityPlugin):
+
+    def __init__(self):
+        super(_StaticPlugin, self).__init__(auth_url='http://localhost')
+        token = fixture.V3Token()
+        token.set_project_scope()
+        self._body = token
+
+    def get_auth_ref(self, session, **kwargs):
+        return access.AccessInfo.factory(body=self._body,
+                                         auth_token='token')
+
+
+class _LockedPlugin(_StaticPlugin):
+
+    def get_access(self, session, **kwargs):
+        with self._lock:
+            if self._needs_reauthenticate():
+                self.auth_ref = self.get_auth_ref(session)
+
+        return self.auth_ref
+
+
+def _run(plugin, threads, duration):
+    plugin.get_access(None)
+    counts = [0] * threads
+    go = threading.Event()
+    stop = threading.Event()
+
+    def worker(i):
+        go.wait()
+        n = 0
+        while not stop.is_set():
+            plugin.get_access(None)
+            n += 1
+        counts[i] = n
+
+    workers = [threading.Thread(target=worker, args=(i,))
+               for i in range(threads)]
+    for w in workers:
+        w.start()
+    go.set()
+    time.sleep(duration)
+    stop.set()
+    for w in workers:
+        w.join()
+
+    return sum(counts) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+',
+                        default=[1, 2, 4, 8, 16, 64, 200])
+    parser.add_argument('--duration', type=float, default=2.0,
+                        help='Seconds to run each measurement for.')
+    args = parser.parse_args()
+
+    warnings.simplefilter('ignore', DeprecationWarning)
+
+    print('%8s %18s %18s %8s' % ('threads', 'locked (ops/s)',
+                                 'fast path (ops/s)', 'ratio'))
+    for threads in args.threads:
+        locked = _run(_LockedPlugin(), threads, args.duration)
+        fast = _run(_StaticPlugin(), threads, args.duration)
+        print('%8d %18.0f %18.0f %8.2f' % (threads, locked, fast,
+                                           fast / locked))
+
+
+if __name__ == '__main__':
+    main()
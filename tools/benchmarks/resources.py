@@ -0,0 +1,85 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Compare the cost of Resource and CompactResource for large collections.
+
+    python tools/benchmarks/resources.py --count 300000
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+
+from keystoneclient import base
+from keystoneclient.v3 import users
+
+
+def _make_data(count):
+    return [{'id': uuid.uuid4().hex,
+             'name': 'user-%d' % i,
+             'domain_id': 'default',
+             'enabled': True,
+             'password_expires_at': None,
+             'links': {'self': 'http://localhost/v3/users/%d' % i}}
+            for i in range(count)]
+
+
+def _measure(obj_class, data):
+    gc.collect()
+    start = time.time()
+    objs = [obj_class(None, res, loaded=True) for res in data]
+    elapsed = time.time() - start
+    del objs
+
+    gc.collect()
+    tracemalloc.start()
+    objs = [obj_class(None, res, loaded=True) for res in data]
+    size, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.time()
+    for obj in objs:
+        obj.name
+    access = time.time() - start
+
+    start = time.time()
+    for obj in objs[:10000]:
+        obj.to_dict()
+    to_dict = time.time() - start
+
+    return elapsed, size, access, to_dict
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=300000)
+    args = parser.parse_args()
+
+    data = _make_data(args.count)
+
+    for label, obj_class in (
+            ('Resource', users.User),
+            ('CompactResource', base.compact_resource_class(users.User))):
+        elapsed, size, access, to_dict = _measure(obj_class, data)
+        print('%s x %d' % (label, args.count))
+        print('  create:  %.3fs (%.2f us/object)'
+              % (elapsed, elapsed * 1e6 / args.count))
+        print('  memory:  %.1f MiB (%d bytes/object, excluding the data)'
+              % (size / 1048576.0, size / args.count))
+        print('  getattr: %.3fs' % access)
+        print('  to_dict: %.3fs for 10000 objects' % to_dict)
+
+
+if __name__ == '__main__':
+    main()
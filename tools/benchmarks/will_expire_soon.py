@@ -0,0 +1,65 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Time AccessInfo.will_expire_soon against re-parsing the expiry each call.
+
+    python tools/benchmarks/will_expire_soon.py --calls 1000000
+"""
+
+import argparse
+import datetime
+import time
+
+from keystoneauth1 import fixture
+from oslo_utils import timeutils
+
+from keystoneclient import access
+
+
+def _reparsing_will_expire_soon(auth_ref, stale_duration):
+    # The previous implementation: parse the ISO 8601 string on every call
+    # and compare datetimes.
+    expires = timeutils.parse_isotime(auth_ref['expires_at'])
+    norm_expires = timeutils.normalize_time(expires)
+    soon = (timeutils.utcnow() + datetime.timedelta(seconds=stale_duration))
+    return norm_expires < soon
+
+
+def _time(func, calls):
+    start = time.time()
+    for _ in range(calls):
+        func()
+    return time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=1000000)
+    args = parser.parse_args()
+
+    token = fixture.V3Token()
+    auth_ref = access.AccessInfo.factory(body=token, auth_token='token')
+
+    reparse = _time(lambda: _reparsing_will_expire_soon(auth_ref, 120),
+                    args.calls)
+    cached = _time(lambda: auth_ref.will_expire_soon(120), args.calls)
+
+    print('%d calls' % args.calls)
+    print('  re-parsing expiry: %.3fs (%.2f us/call)'
+          % (reparse, reparse * 1e6 / args.calls))
+    print('  cached timestamp:  %.3fs (%.2f us/call)'
+          % (cached, cached * 1e6 / args.calls))
+    print('  speedup:           %.1fx' % (reparse / cached))
+
+
+if __name__ == '__main__':
+    main()